@@ -0,0 +1,429 @@
+"""Модуль нагрузочных тестов калькулятора."""
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from calculator import Calculator
+from evaluator import Evaluator
+from numeric import NATIVE
+from program import ProgramCache, SubexpressionMemo
+from tokenizer import Tokenizer
+from constants import *
+
+
+def flat_chain(count: int, rng: random.Random) -> list[str]:
+    """
+    Генерирует длинные плоские цепочки сложений и умножений.
+
+    Args:
+        count: Число выражений.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Список выражений.
+    """
+    expressions = []
+    for _ in range(count):
+        parts = [str(rng.randint(1, 999))]
+        for _ in range(BENCHMARK_CHAIN_LENGTH):
+            parts.append(str(rng.randint(1, 999)))
+            parts.append(rng.choice('+-*'))
+        expressions.append(' '.join(parts))
+    return expressions
+
+
+def nested_brackets(count: int, rng: random.Random) -> list[str]:
+    """
+    Генерирует выражения с глубоко вложенными скобками.
+
+    Args:
+        count: Число выражений.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Список выражений.
+    """
+    depth = BENCHMARK_NESTING_DEPTH
+    expressions = []
+    for _ in range(count):
+        inner = f'{rng.randint(1, 9)} {rng.randint(1, 9)} +'
+        expressions.append('( ' * depth + inner + ' )' * depth)
+    return expressions
+
+
+def unary_heavy(count: int, rng: random.Random) -> list[str]:
+    """
+    Генерирует выражения с длинными цепочками унарных операторов.
+
+    Args:
+        count: Число выражений.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Список выражений.
+    """
+    expressions = []
+    for _ in range(count):
+        unary = ' '.join(rng.choice('~$') for _ in range(BENCHMARK_CHAIN_LENGTH))
+        expressions.append(f'{rng.randint(1, 999)} {unary} {rng.randint(1, 999)} +')
+    return expressions
+
+
+def big_power(count: int, rng: random.Random) -> list[str]:
+    """
+    Генерирует возведение в степень с большими целыми результатами.
+
+    Args:
+        count: Число выражений.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Список выражений.
+    """
+    return [f'{rng.randint(2, 99)} {rng.randint(500, 2000)} ** {rng.randint(2, 9)} %'
+            for _ in range(count)]
+
+
+def float_division(count: int, rng: random.Random) -> list[str]:
+    """
+    Генерирует цепочки деления дробных чисел.
+
+    Args:
+        count: Число выражений.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Список выражений.
+    """
+    expressions = []
+    for _ in range(count):
+        parts = [f'{rng.uniform(1, 1000):.3f}']
+        for _ in range(BENCHMARK_CHAIN_LENGTH):
+            parts.append(f'{rng.uniform(0.5, 2):.3f}')
+            parts.append('/')
+        expressions.append(' '.join(parts))
+    return expressions
+
+
+def mixed_errors(count: int, rng: random.Random) -> list[str]:
+    """
+    Генерирует смесь корректных и ошибочных выражений.
+
+    Args:
+        count: Число выражений.
+        rng: Генератор случайных чисел.
+
+    Returns:
+        Список выражений.
+    """
+    templates = (
+        '{a} {b} +', '{a} 0 /', '( {a} {b} +', '{a} {b}', '{a} +',
+        '{a}.5 {b} //', '{a} {b} @', '{a} {b} ) +',
+    )
+    return [rng.choice(templates).format(a=rng.randint(1, 99), b=rng.randint(1, 99))
+            for _ in range(count)]
+
+
+# Нагрузки: имя и генератор выражений
+WORKLOADS = {
+    'flat_chain': flat_chain,
+    'nested_brackets': nested_brackets,
+    'unary_heavy': unary_heavy,
+    'big_power': big_power,
+    'float_division': float_division,
+    'mixed_errors': mixed_errors,
+}
+
+
+def _tokenize_phase(expressions: list[str]) -> Callable[[], int]:
+    """
+    Готовит замер токенизации.
+
+    Args:
+        expressions: Выражения нагрузки.
+
+    Returns:
+        Функция, выполняющая фазу и возвращающая число ошибок.
+    """
+    def run() -> int:
+        errors = 0
+        for expression in expressions:
+            try:
+                Tokenizer(expression).tokenize()
+            except ValueError:
+                errors += 1
+        return errors
+    return run
+
+
+def _evaluate_phase(expressions: list[str]) -> Callable[[], int]:
+    """
+    Готовит замер вычисления заранее токенизированных выражений.
+
+    Args:
+        expressions: Выражения нагрузки.
+
+    Returns:
+        Функция, выполняющая фазу и возвращающая число ошибок.
+    """
+    token_lists = []
+    for expression in expressions:
+        try:
+            token_lists.append(Tokenizer(expression).tokenize())
+        except ValueError:
+            pass
+
+    def run() -> int:
+        errors = 0
+        for tokens in token_lists:
+            try:
+                Evaluator(tokens).evaluate()
+            except (ValueError, ZeroDivisionError, TypeError):
+                errors += 1
+        return errors
+    return run
+
+
+def _calculator_phase(expressions: list[str]) -> Callable[[], int]:
+    """
+    Готовит замер полного вычисления через Calculator.eval.
+
+    Args:
+        expressions: Выражения нагрузки.
+
+    Returns:
+        Функция, выполняющая фазу и возвращающая число ошибок.
+    """
+    def run() -> int:
+        Calculator.get_backend().cache.clear()
+        Calculator.get_memo().clear()
+        errors = 0
+        for expression in expressions:
+            try:
+                Calculator(expression).eval()
+            except (ValueError, ZeroDivisionError, TypeError):
+                errors += 1
+        return errors
+    return run
+
+
+@contextmanager
+def _default_calculator() -> Iterator[None]:
+    """
+    Переводит калькулятор в настройки по умолчанию на время замеров.
+
+    Замеры не зависят от настроек вызывающего кода и не меняют их:
+    числовой режим, бюджет и режимы пакетов восстанавливаются,
+    а кэш программ и таблица подвыражений на время замеров
+    подменяются пустыми и возвращаются с прежним содержимым.
+    """
+    backend, budget = Calculator.get_backend(), Calculator.get_budget()
+    float_stack, validation = Calculator.get_float_stack(), Calculator.get_validation()
+    memo, cache = Calculator.get_memo(), NATIVE.cache
+    Calculator.configure_backend(NATIVE)
+    Calculator.configure_budget(None)
+    Calculator.configure_float_stack(False)
+    Calculator.configure_validation(False)
+    Calculator.configure_memo(SubexpressionMemo(DEFAULT_MEMO_SIZE))
+    NATIVE.cache = ProgramCache(DEFAULT_CACHE_SIZE)
+    try:
+        yield
+    finally:
+        NATIVE.cache = cache
+        Calculator.configure_memo(memo)
+        Calculator.configure_validation(validation)
+        Calculator.configure_float_stack(float_stack)
+        Calculator.configure_budget(budget)
+        Calculator.configure_backend(backend)
+
+
+# Замеряемые фазы: имя и функция подготовки замера
+PHASES = {
+    'tokenize': _tokenize_phase,
+    'evaluate': _evaluate_phase,
+    'calculator': _calculator_phase,
+}
+
+
+def run_benchmarks(size: int = BENCHMARK_DEFAULT_SIZE, repeat: int = BENCHMARK_REPEAT,
+                   workloads: list[str] | None = None, seed: int = BENCHMARK_SEED) -> dict:
+    """
+    Выполняет замеры для выбранных нагрузок.
+
+    Выражения генерируются с фиксированным зерном, поэтому входные
+    данные воспроизводимы. Для каждой фазы берётся лучшее время из
+    repeat повторов, а пиковая память измеряется отдельным прогоном
+    под tracemalloc, чтобы не искажать время. Замеры выполняются
+    с настройками калькулятора по умолчанию, которые после них
+    восстанавливаются (см. _default_calculator).
+
+    Args:
+        size: Число выражений в каждой нагрузке.
+        repeat: Число повторов замера времени.
+        workloads: Имена нагрузок, по умолчанию все.
+        seed: Зерно генератора выражений.
+
+    Returns:
+        Словарь с описанием окружения и результатами по нагрузкам и фазам.
+    """
+    results = {}
+    with _default_calculator():
+        for name in workloads or WORKLOADS:
+            expressions = WORKLOADS[name](size, random.Random(seed))
+            results[name] = {phase: _measure(prepare(expressions), len(expressions), repeat)
+                             for phase, prepare in PHASES.items()}
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'size': size,
+        'repeat': repeat,
+        'seed': seed,
+        'results': results,
+    }
+
+
+def _measure(run: Callable[[], int], count: int, repeat: int) -> dict:
+    """
+    Замеряет время и память одной фазы.
+
+    Args:
+        run: Функция, выполняющая фазу и возвращающая число ошибок.
+        count: Число выражений.
+        repeat: Число повторов.
+
+    Returns:
+        Время, операций в секунду, пиковая память и число ошибок.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        errors = run()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'seconds': best,
+        'ops_per_sec': count / best if best else float('inf'),
+        'peak_memory': peak,
+        'errors': errors,
+    }
+
+
+def compare(current: dict, baseline: dict,
+            threshold: float = BENCHMARK_THRESHOLD) -> list[tuple[str, str, float, float]]:
+    """
+    Сравнивает результаты с сохранённым эталоном.
+
+    Регрессией считается падение числа операций в секунду больше,
+    чем на долю threshold. Нагрузки и фазы, отсутствующие в одном
+    из результатов, не сравниваются.
+
+    Args:
+        current: Результаты текущего запуска.
+        baseline: Эталонные результаты.
+        threshold: Допустимая доля замедления.
+
+    Returns:
+        Список регрессий: (нагрузка, фаза, эталон, текущее значение ops/sec).
+    """
+    regressions = []
+    for workload, phases in current['results'].items():
+        for phase, stats in phases.items():
+            base = baseline['results'].get(workload, {}).get(phase)
+            if base is None:
+                continue
+            if stats['ops_per_sec'] < base['ops_per_sec'] * (1 - threshold):
+                regressions.append((workload, phase, base['ops_per_sec'], stats['ops_per_sec']))
+    return regressions
+
+
+def format_report(report: dict) -> str:
+    """
+    Форматирует результаты в текстовую таблицу.
+
+    Args:
+        report: Результаты run_benchmarks.
+
+    Returns:
+        Текст отчёта.
+    """
+    lines = [BENCHMARK_HEADER_FORMAT.format('нагрузка', 'фаза', 'ops/sec', 'память, КБ', 'ошибок')]
+    for workload, phases in report['results'].items():
+        for phase, stats in phases.items():
+            lines.append(BENCHMARK_ROW_FORMAT.format(
+                workload, phase, stats['ops_per_sec'], stats['peak_memory'] / 1024, stats['errors']))
+    return '\n'.join(lines)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv: Список аргументов, по умолчанию sys.argv[1:].
+
+    Returns:
+        Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description='Нагрузочные тесты RPN калькулятора')
+    parser.add_argument('-n', '--size', type=int, default=BENCHMARK_DEFAULT_SIZE,
+                        help='число выражений в каждой нагрузке')
+    parser.add_argument('-r', '--repeat', type=int, default=BENCHMARK_REPEAT,
+                        help='число повторов замера')
+    parser.add_argument('-w', '--workload', action='append', choices=list(WORKLOADS),
+                        help='нагрузка для замера, по умолчанию все')
+    parser.add_argument('--seed', type=int, default=BENCHMARK_SEED,
+                        help='зерно генератора выражений')
+    parser.add_argument('-o', '--output', help='файл для сохранения результатов в JSON')
+    parser.add_argument('--baseline', help='JSON файл с эталонными результатами')
+    parser.add_argument('--threshold', type=float, default=BENCHMARK_THRESHOLD,
+                        help='допустимая доля замедления относительно эталона')
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Запускает замеры, сохраняет и сравнивает результаты.
+
+    Args:
+        argv: Список аргументов командной строки.
+
+    Returns:
+        Код завершения: 1 если найдены регрессии, иначе 0.
+    """
+    args = parse_args(argv)
+    report = run_benchmarks(args.size, args.repeat, args.workload, args.seed)
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for workload, phase, base, current in regressions:
+            print(BENCHMARK_REGRESSION_FORMAT.format(workload, phase, base, current,
+                                                     (1 - current / base) * 100))
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
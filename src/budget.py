@@ -0,0 +1,112 @@
+"""Модуль бюджета вычислений."""
+import math
+from time import monotonic
+
+from operators import Operator
+from constants import *
+
+
+def estimate(symbol: str, a, b) -> tuple[int, int]:
+    """
+    Оценивает размер результата и стоимость операции над целыми.
+
+    Размер — число бит результата, стоимость — произведение длин
+    аргументов в битах (оценка сверху для умножения и деления).
+    Для нецелых аргументов и прочих операторов оценка нулевая:
+    операции над float не могут занять много памяти.
+
+    Args:
+        symbol: Символ оператора.
+        a: Левый аргумент.
+        b: Правый аргумент.
+
+    Returns:
+        Пара (бит в результате, стоимость).
+    """
+    if a.__class__ is not int or b.__class__ is not int:
+        if symbol == OP_POWER and b.__class__ is int:
+            # Импорт здесь, чтобы однократный режим не загружал fractions
+            from fractions import Fraction
+
+            if a.__class__ is Fraction:
+                # Степень дроби растёт в числителе и знаменателе
+                return abs(b) * (a.numerator.bit_length() + a.denominator.bit_length()), 0
+        return 0, 0
+    if symbol == OP_POWER:
+        if b <= 1 or -1 <= a <= 1:
+            # Отрицательная степень целого даёт дробное число
+            return 0, 0
+        return int(b * math.log2(abs(a))) + 1, 0
+    if symbol == OP_MULTIPLY:
+        a_bits, b_bits = a.bit_length(), b.bit_length()
+        return a_bits + b_bits, a_bits * b_bits
+    if symbol in (OP_FLOOR_DIV, OP_MOD):
+        a_bits, b_bits = a.bit_length(), b.bit_length()
+        return a_bits, a_bits * b_bits
+    return 0, 0
+
+
+class Budget:
+    """
+    Бюджет вычисления одного выражения.
+
+    Вычислитель вызывает charge перед каждой операцией. Перед **, *,
+    // и % над целыми оценивается размер результата и стоимость,
+    и операция, выходящая за пределы, не выполняется. Дополнительно
+    можно ограничить число операций и время вычисления.
+    """
+
+    def __init__(self, max_result_bits: int | None = BUDGET_MAX_RESULT_BITS,
+                 max_cost: int | None = BUDGET_MAX_COST,
+                 max_operations: int | None = None,
+                 timeout: float | None = None):
+        """
+        Инициализирует бюджет.
+
+        Args:
+            max_result_bits: Предельный размер целого результата в битах.
+            max_cost: Предельная стоимость одной операции над целыми
+                (произведение длин аргументов в битах).
+            max_operations: Предельное число операций в выражении.
+            timeout: Предельное время вычисления выражения в секундах.
+        """
+        self.max_result_bits = max_result_bits
+        self.max_cost = max_cost
+        self.max_operations = max_operations
+        self.timeout = timeout
+        self.operations = 0
+        self.deadline: float | None = None
+
+    def start(self) -> None:
+        """Начинает отсчёт операций и времени для нового выражения."""
+        self.operations = 0
+        if self.timeout is not None:
+            self.deadline = monotonic() + self.timeout
+
+    def charge(self, op: Operator, a, b=None) -> None:
+        """
+        Учитывает операцию перед её выполнением.
+
+        Args:
+            op: Выполняемый оператор.
+            a: Первый аргумент.
+            b: Второй аргумент бинарного оператора.
+
+        Raises:
+            OverflowError: Если результат или стоимость превышают пределы.
+            ValueError: Если превышено число операций.
+            TimeoutError: Если истекло время вычисления.
+        """
+        self.operations += 1
+        if self.max_operations is not None and self.operations > self.max_operations:
+            raise ValueError(ERROR_BUDGET_OPERATIONS.format(self.max_operations))
+        if self.deadline is not None and monotonic() > self.deadline:
+            raise TimeoutError(ERROR_BUDGET_TIMEOUT.format(self.timeout))
+
+        if b is None:
+            return
+        bits, cost = estimate(op.symbol, a, b)
+        if self.max_result_bits is not None and bits > self.max_result_bits:
+            raise OverflowError(ERROR_BUDGET_RESULT_BITS.format(op.symbol, bits, self.max_result_bits))
+        if self.max_cost is not None and cost > self.max_cost:
+            raise OverflowError(ERROR_BUDGET_COST.format(op.symbol, cost, self.max_cost))
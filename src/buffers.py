@@ -0,0 +1,210 @@
+"""Модуль вычисления выражений из байтовых буферов и отображённых файлов."""
+import mmap
+import os
+import re
+from collections.abc import Iterator
+
+from calculator import Calculator
+from metrics import METRICS
+from operators import OPERATORS, Operator
+from constants import *
+
+# Число без знака или со знаком в байтовом виде (только ASCII цифры)
+_NUMBER_BYTES_RE = re.compile(rb'[-+]?(?:\d+\.?\d*|\.\d+)')
+
+_SIGNS = frozenset(PLUS_MINUS.encode())
+_NEWLINE = b'\n'
+
+
+def evaluate_buffer(buffer, return_exceptions: bool = False,
+                    block_size: int = BATCH_READ_SIZE) -> Iterator[float | Exception | None]:
+    """
+    Вычисляет выражения из байтового буфера, по одному на строку.
+
+    Буфер (bytes, bytearray, memoryview или mmap) читается блоками
+    по block_size байт, поэтому в памяти одновременно находится
+    только один блок. Строки разбираются без декодирования:
+    фрагменты между пробелами сопоставляются с операторами по
+    байтовым ключам, а числа преобразуются прямо из байтовых срезов
+    вызовами int() и float(). Строки, которые так разобрать нельзя
+    (имена, токены без пробелов, не-ASCII символы, ошибки),
+    декодируются и вычисляются обычным путём через кэш программ,
+    поэтому результаты и тексты ошибок совпадают с Calculator.eval.
+
+    Args:
+        buffer: Объект с буферным протоколом.
+        return_exceptions: Если True, ошибка выдаётся вместо результата,
+            и обработка продолжается.
+        block_size: Размер блока чтения в байтах.
+
+    Yields:
+        Результат для каждой строки: число, исключение при ошибке
+        или None для пустой строки.
+
+    Raises:
+        ValueError: При некорректном выражении, если return_exceptions=False.
+    """
+    table: dict[bytes, Operator | str] = {op.symbol.encode(): op for op in OPERATORS}
+    table[OPENING_BRACKET.encode()] = OPENING_BRACKET
+    table[CLOSING_BRACKET.encode()] = CLOSING_BRACKET
+
+    get_program = Calculator.compile
+    evaluator = Calculator.evaluator()
+    # Байтовый разбор даёт int и float, поэтому в точных режимах
+    # все строки вычисляются через кэш программ режима
+    native = Calculator.get_backend().to_number is None
+    for line in _iter_lines(buffer, block_size):
+        result: float | Exception
+        try:
+            # При включённых метриках строки вычисляются обычным путём,
+            # чтобы фазы замерялись так же, как в Calculator.eval
+            decoded = _decode_line(line, table) if native and not METRICS.enabled else None
+            if decoded is None:
+                if not line.strip():
+                    yield None
+                    continue
+                expression = line.decode('utf-8')
+                if METRICS.enabled:
+                    result = METRICS.evaluate(get_program, expression, evaluator)
+                else:
+                    result = get_program(expression).eval(evaluator)
+            else:
+                evaluator.reset(*decoded)
+                result = evaluator.evaluate()
+        except Exception as e:
+            if not return_exceptions:
+                raise
+            result = e
+        yield result
+
+
+def evaluate_file_mapped(path: str, return_exceptions: bool = False) -> Iterator[float | Exception | None]:
+    """
+    Вычисляет файл с выражениями через отображение в память.
+
+    Файл не читается целиком: страницы подгружаются системой
+    по мере обработки блоков (см. evaluate_buffer).
+
+    Args:
+        path: Путь к файлу, по одному выражению на строку.
+        return_exceptions: Если True, ошибка выдаётся вместо результата.
+
+    Yields:
+        Результат для каждой строки в исходном порядке.
+
+    Raises:
+        ValueError: При некорректном выражении, если return_exceptions=False.
+    """
+    if os.path.getsize(path) == 0:
+        # Пустой файл нельзя отобразить в память
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from evaluate_buffer(mapped, return_exceptions)
+
+
+def iter_file_lines(path: str, block_size: int = BATCH_READ_SIZE) -> Iterator[bytes]:
+    """
+    Читает строки файла через отображение в память.
+
+    Строки делятся так же, как в evaluate_file_mapped, поэтому
+    их можно сопоставить с результатами вычисления по порядку.
+
+    Args:
+        path: Путь к файлу.
+        block_size: Размер блока в байтах.
+
+    Yields:
+        Строки без символа перевода строки.
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield from _iter_lines(mapped, block_size)
+
+
+def _iter_lines(buffer, block_size: int) -> Iterator[bytes]:
+    """
+    Делит буфер на строки, копируя его по одному блоку.
+
+    Args:
+        buffer: Объект с буферным протоколом.
+        block_size: Размер блока в байтах.
+
+    Yields:
+        Строки без символа перевода строки.
+    """
+    with memoryview(buffer) as view:
+        carry = b''
+        for start in range(0, view.nbytes, block_size):
+            lines = (carry + view[start:start + block_size]).split(_NEWLINE)
+            carry = lines.pop()
+            yield from lines
+        if carry:
+            yield carry
+
+
+def _decode_line(line: bytes, table: dict[bytes, Operator | str]) -> tuple[list, int] | None:
+    """
+    Разбирает строку в типизированные токены без декодирования.
+
+    Знак перед числом после значения (числа или закрывающей скобки)
+    является бинарным оператором, как и в Tokenizer. Попутно
+    проверяется структура строки, как в validator.validate: строка
+    с ошибкой структуры разбирается обычным путём, где ошибка
+    выдаётся в порядке вычисления или, в режиме проверки структуры
+    (см. Calculator.configure_validation), до вычисления операций.
+
+    Args:
+        line: Строка выражения в байтах.
+        table: Операторы и скобки по байтовым ключам.
+
+    Returns:
+        Список токенов и наибольшая высота стека или None, если строку
+        нужно разобрать обычным токенизатором.
+    """
+    tokens: list[Operator | str | int | float] = []
+    height = 0
+    depth = 0
+    base = 0
+    frames = []
+    after_value = False
+    append = tokens.append
+    for chunk in line.split():
+        token = table.get(chunk)
+        if token is None:
+            if not _NUMBER_BYTES_RE.fullmatch(chunk):
+                return None
+            if after_value and chunk[0] in _SIGNS:
+                # Бинарный знак снимает два значения, а число добавляет одно
+                if height - base < 2:
+                    return None
+                append(table[chunk[:1]])
+                chunk = chunk[1:]
+            else:
+                height += 1
+                if height > depth:
+                    depth = height
+            append(float(chunk) if b'.' in chunk else int(chunk))
+            after_value = True
+            continue
+
+        if isinstance(token, str):
+            if token == OPENING_BRACKET:
+                frames.append(base)
+                base = height
+                after_value = False
+            else:
+                if not frames or height - base != 1:
+                    return None
+                base = frames.pop()
+                after_value = True
+        else:
+            if height - base < token.arity:
+                return None
+            height -= token.arity - 1
+            after_value = False
+        append(token)
+
+    if frames or height != 1:
+        return None
+    return tokens, depth
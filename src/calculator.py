@@ -1,6 +1,17 @@
 """Главный модуль калькулятора."""
-from tokenizer import Tokenizer
+from collections.abc import Callable, Iterable, Iterator
+from typing import TextIO
+
+from budget import Budget
+from engine import Engine
 from evaluator import Evaluator
+from operators import OPERATORS, Operator
+from metrics import METRICS
+from numeric import BACKENDS, NATIVE, NumericBackend, backend_by_name
+from program import Program, CacheInfo, SubexpressionMemo
+from tokenizer import iter_tokens
+from validator import validate
+from constants import *
 
 
 class Calculator:
@@ -9,16 +20,29 @@ class Calculator:
 
     Координирует работу токенизатора и вычислителя.
     Принимает строковые выражения в RPN формате и вычисляет их значения.
+    Скомпилированные выражения хранятся в LRU кэше числового режима,
+    поэтому повторные выражения не токенизируются заново. Значения
+    дорогих подвыражений хранятся в общей таблице, поэтому одинаковые
+    подвыражения вычисляются один раз.
     """
 
-    def __init__(self, expression: str):
+    _backend = NATIVE
+    _budget = None
+    _float_stack = False
+    _validate = False
+    _memo = SubexpressionMemo(DEFAULT_MEMO_SIZE)
+
+    def __init__(self, expression: str, backend: NumericBackend | str | None = None):
         """
         Инициализирует калькулятор.
 
         Args:
             expression: Выражение в RPN формате.
+            backend: Числовой режим или его имя (native, fraction, decimal),
+                по умолчанию режим, заданный configure_backend.
         """
         self.expression = expression
+        self.backend = backend_by_name(backend) if isinstance(backend, str) else backend
 
     def eval(self) -> float:
         """
@@ -30,10 +54,352 @@ class Calculator:
         Raises:
             ValueError: При некорректном выражении.
         """
-        tokenizer = Tokenizer(self.expression)
-        tokens = tokenizer.tokenize()
+        get_program = (self.backend or self._backend).programs(self._budget).get
+        if METRICS.enabled:
+            # Вычислитель как у Program.eval: режимы пакетов на eval не влияют
+            evaluator = Evaluator((), budget=self._budget, memo=self._memo)
+            return METRICS.evaluate(get_program, self.expression, evaluator)
+        return get_program(self.expression).eval(budget=self._budget, memo=self._memo)
+
+    @classmethod
+    def compile(cls, expression: str, backend: NumericBackend | None = None) -> Program:
+        """
+        Компилирует выражение в переиспользуемую программу.
+
+        Args:
+            expression: Выражение в RPN формате.
+            backend: Числовой режим, по умолчанию текущий.
+
+        Returns:
+            Неизменяемая программа, взятая из кэша или скомпилированная.
+
+        Raises:
+            ValueError: При ошибках токенизации.
+        """
+        return (backend or cls._backend).programs(cls._budget).get(expression)
+
+    @classmethod
+    def validate(cls, expression: str, backend: NumericBackend | None = None) -> None:
+        """
+        Проверяет выражение без вычисления.
+
+        Выражение компилируется (с обращением к кэшу программ), и его
+        структура проверяется одним проходом по токенам программы
+        (см. validator.validate): оптимизатор не меняет программы
+        с ошибкой структуры. Ошибки операций, например деление
+        на ноль, при этом не обнаруживаются.
+
+        Args:
+            expression: Выражение в RPN формате.
+            backend: Числовой режим, по умолчанию текущий.
+
+        Raises:
+            ValueError: При ошибках токенизации или структуры выражения.
+        """
+        validate(cls.compile(expression, backend).tokens)
+
+    @classmethod
+    def eval_many(cls, expressions: Iterable[str], return_exceptions: bool = False,
+                  backend: NumericBackend | None = None) -> Iterator[float | Exception]:
+        """
+        Лениво вычисляет поток выражений.
+
+        Выражения читаются из итерируемого объекта по одному, поэтому
+        потребление памяти не зависит от длины входа. Кэш программ и
+        вычислитель переиспользуются для всех выражений потока.
+
+        Args:
+            expressions: Итерируемый объект со строками выражений
+                (список, файл, генератор).
+            return_exceptions: Если True, ошибка вычисления выдаётся
+                вместо результата, и обработка потока продолжается.
+            backend: Числовой режим, по умолчанию текущий.
+
+        Yields:
+            Результаты вычисления в порядке входных выражений.
+
+        Raises:
+            ValueError: При некорректном выражении, если return_exceptions=False.
+        """
+        get_program = (backend or cls._backend).programs(cls._budget).get
+        evaluator = cls.evaluator()
+        for expression in expressions:
+            result: float | Exception
+            try:
+                if METRICS.enabled:
+                    result = METRICS.evaluate(get_program, expression, evaluator)
+                else:
+                    result = get_program(expression).eval(evaluator)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                result = e
+            yield result
+
+    @classmethod
+    def eval_stream(cls, source: str | TextIO, chunk_size: int = STREAM_CHUNK_SIZE) -> float:
+        """
+        Вычисляет одно большое выражение в потоковом режиме.
+
+        Токены разбираются генератором и сразу передаются вычислителю,
+        поэтому память ограничена глубиной стека, а не числом токенов.
+        Программа не компилируется и не кэшируется. Ошибки выдаются
+        в порядке чтения: например, деление на ноль в начале выражения
+        обнаруживается раньше незакрытой скобки в его конце.
+
+        Args:
+            source: Строка или текстовый поток (например, открытый файл).
+            chunk_size: Размер блока чтения в символах.
+
+        Returns:
+            Числовой результат вычисления выражения.
+
+        Raises:
+            ValueError: При некорректном выражении.
+        """
+        backend = cls._backend
+        if backend.to_number is None:
+            tokens = iter_tokens(source, chunk_size=chunk_size)
+        else:
+            tokens = iter_tokens(source, operators=backend.operators(),
+                                 chunk_size=chunk_size, to_number=backend.to_number)
+        return Evaluator(tokens, budget=cls._budget).evaluate()
+
+    @classmethod
+    def evaluator(cls) -> Evaluator:
+        """
+        Создаёт вычислитель с бюджетом и таблицей подвыражений калькулятора.
+
+        Returns:
+            Вычислитель для переиспользования в пакете выражений.
+        """
+        return Evaluator((), budget=cls._budget, memo=cls._memo, float_stack=cls._float_stack,
+                         validate=cls._validate)
+
+    @classmethod
+    def engine(cls) -> Engine:
+        """
+        Создаёт потокобезопасный движок с настройками калькулятора.
+
+        Движок получает текущие числовой режим, бюджет, режимы
+        типизированного стека и проверки структуры и общую таблицу
+        подвыражений;
+        последующие configure_* на него не влияют.
+
+        Returns:
+            Движок, который можно разделить между потоками.
+        """
+        return Engine(cls._backend, cls._budget, cls._memo, cls._float_stack, cls._validate)
+
+    @staticmethod
+    def register_operator(symbol: str, arity: int, func: Callable,
+                          validate: Callable | None = None, pure: bool = True) -> Operator:
+        """
+        Регистрирует пользовательский оператор.
+
+        Пример: Calculator.register_operator('max', 2, max).
+
+        Args:
+            symbol: Слово (min, sqrt) или знаки, не занятые встроенными операторами.
+            arity: Число аргументов: 1 или 2.
+            func: Реализация оператора.
+            validate: Необязательная проверка аргументов перед вызовом func.
+            pure: Оператор без побочных эффектов; над константами он
+                вычисляется один раз при компиляции.
+
+        Returns:
+            Зарегистрированный оператор.
+
+        Raises:
+            ValueError: При некорректном или уже занятом символе.
+        """
+        return OPERATORS.register(symbol, arity, func, validate, pure)
+
+    @classmethod
+    def configure_cache(cls, maxsize: int) -> None:
+        """
+        Задаёт размер кэша программ каждого числового режима.
+
+        Args:
+            maxsize: Максимальное число программ, 0 отключает кэш.
+
+        Raises:
+            ValueError: Если размер отрицательный.
+        """
+        for backend in BACKENDS.values():
+            backend.cache.resize(maxsize)
+            backend.budget_cache.resize(maxsize)
+
+    @classmethod
+    def configure_backend(cls, backend: NumericBackend | str) -> None:
+        """
+        Задаёт числовой режим для всех последующих вычислений.
+
+        Пример: Calculator.configure_backend('fraction').
 
-        evaluator = Evaluator(tokens)
-        result = evaluator.evaluate()
+        Args:
+            backend: Числовой режим или его имя (native, fraction, decimal).
+
+        Raises:
+            ValueError: При неизвестном имени режима.
+        """
+        cls._backend = backend_by_name(backend) if isinstance(backend, str) else backend
+
+    @classmethod
+    def get_backend(cls) -> NumericBackend:
+        """
+        Возвращает текущий числовой режим.
+
+        Returns:
+            Числовой режим.
+        """
+        return cls._backend
+
+    @classmethod
+    def configure_budget(cls, budget: Budget | None) -> None:
+        """
+        Задаёт бюджет для всех последующих вычислений.
+
+        Пример: Calculator.configure_budget(Budget(max_operations=10000, timeout=0.5)).
+
+        Args:
+            budget: Бюджет вычисления или None, чтобы снять ограничения.
+        """
+        cls._budget = budget
+
+    @classmethod
+    def get_budget(cls) -> Budget | None:
+        """
+        Возвращает текущий бюджет вычислений.
+
+        Returns:
+            Бюджет или None, если ограничения не заданы.
+        """
+        return cls._budget
+
+    @classmethod
+    def configure_float_stack(cls, enabled: bool) -> None:
+        """
+        Включает вычисление float выражений на типизированном стеке.
+
+        Действует на вычислители пакетов; основной выигрыш получает
+        байтовый разбор строк (см. buffers.evaluate_buffer), где выражения
+        не сворачиваются компиляцией. Выражения из чисел и операторов
+        +, -, *, /, ** с хотя бы одним float или делением вычисляются
+        в double без списка-стека (см. Evaluator), остальные выражения
+        и ошибки — обычным путём.
+
+        Args:
+            enabled: True, чтобы включить режим.
+        """
+        cls._float_stack = enabled
+
+    @classmethod
+    def get_float_stack(cls) -> bool:
+        """
+        Возвращает, включён ли типизированный стек для пакетов.
+
+        Returns:
+            True, если режим включён.
+        """
+        return cls._float_stack
+
+    @classmethod
+    def configure_validation(cls, enabled: bool) -> None:
+        """
+        Включает проверку структуры выражений пакетов до вычисления.
+
+        Действует на вычислители пакетов (eval_many, evaluate_buffer):
+        некорректное выражение отклоняется без выполнения операций,
+        и ошибка структуры выдаётся раньше ошибок операций (например,
+        для 1 0 / + — нехватка аргументов, а не деление на ноль).
+        Calculator.eval сохраняет обычный порядок ошибок.
+
+        Args:
+            enabled: True, чтобы включить проверку.
+        """
+        cls._validate = enabled
+
+    @classmethod
+    def get_validation(cls) -> bool:
+        """
+        Возвращает, включена ли проверка структуры выражений пакетов.
+
+        Returns:
+            True, если проверка включена.
+        """
+        return cls._validate
+
+    @classmethod
+    def configure_memo(cls, memo: SubexpressionMemo | int) -> None:
+        """
+        Задаёт таблицу значений подвыражений или её размер.
+
+        Пример: Calculator.configure_memo(SubexpressionMemo(1024)).
+
+        Args:
+            memo: Новая таблица или максимальное число значений
+                текущей таблицы, 0 отключает таблицу.
+
+        Raises:
+            ValueError: Если размер отрицательный.
+        """
+        if isinstance(memo, SubexpressionMemo):
+            cls._memo = memo
+        else:
+            cls._memo.resize(memo)
+
+    @classmethod
+    def get_memo(cls) -> SubexpressionMemo:
+        """
+        Возвращает общую таблицу значений подвыражений.
+
+        Returns:
+            Таблица подвыражений.
+        """
+        return cls._memo
+
+    @classmethod
+    def memo_info(cls) -> CacheInfo:
+        """
+        Возвращает статистику таблицы значений подвыражений.
+
+        Returns:
+            Счётчики попаданий, промахов и вытеснений; доля попаданий — hit_rate.
+        """
+        return cls._memo.info()
+
+    @classmethod
+    def configure_tiering(cls, threshold: int) -> None:
+        """
+        Задаёт число вычислений программы, после которого для неё
+        генерируется Python функция (см. Program.configure_tiering).
+
+        Args:
+            threshold: Порог, 0 отключает сгенерированные функции.
+
+        Raises:
+            ValueError: Если порог не является неотрицательным целым.
+        """
+        Program.configure_tiering(threshold)
+
+    @classmethod
+    def cache_info(cls) -> CacheInfo:
+        """
+        Возвращает статистику кэша программ текущего числового режима
+        и бюджета (см. NumericBackend.programs).
+
+        Returns:
+            Счётчики попаданий, промахов и вытеснений.
+        """
+        return cls._backend.programs(cls._budget).info()
 
-        return result
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Очищает кэши программ всех числовых режимов и таблицу подвыражений."""
+        for backend in BACKENDS.values():
+            backend.cache.clear()
+            backend.budget_cache.clear()
+        cls._backend.cache.clear()
+        cls._backend.budget_cache.clear()
+        cls._memo.clear()
@@ -0,0 +1,192 @@
+"""Модуль генерации Python функций для часто вычисляемых программ."""
+import math
+from collections.abc import Callable
+
+from evaluator import Subexpression
+from operators import OPERATORS, Operator, is_integer_value
+from constants import *
+
+# Встроенные операторы, записываемые в код выражением Python
+_BINARY_TEMPLATES = {
+    OP_PLUS: '{} + {}',
+    OP_MINUS: '{} - {}',
+    OP_MULTIPLY: '{} * {}',
+    OP_DIVIDE: '{} / {}',
+    OP_POWER: '{} ** {}',
+    OP_FLOOR_DIV: '{} // {}',
+    OP_MOD: '{} % {}',
+}
+_UNARY_TEMPLATES = {
+    UNARY_PLUS_SYMBOL: '+{}',
+    UNARY_MINUS_SYMBOL: '-{}',
+}
+
+# Операторы с проверкой делителя и сообщения проверки целых аргументов
+_ZERO_CHECKED = frozenset((OP_DIVIDE, OP_FLOOR_DIV, OP_MOD))
+_INTEGER_ONLY = {
+    OP_FLOOR_DIV: ERROR_INTEGER_ONLY_FLOOR_DIV,
+    OP_MOD: ERROR_INTEGER_ONLY_MOD,
+}
+
+# Целые по модулю меньше этого предела записываются в код литералом
+_LITERAL_INT_LIMIT = 1 << 63
+
+# Признак значения, неизвестного при генерации
+_UNKNOWN = object()
+
+
+def generate(tokens: tuple) -> Callable | None:
+    """
+    Генерирует Python функцию, вычисляющую программу без стека.
+
+    Проход повторяет работу стековой машины над токенами, но вместо
+    значений складывает в стек имена локальных переменных и литералы.
+    Каждая операция становится одной строкой кода в порядке RPN,
+    поэтому ошибки возникают в том же порядке, что и у вычислителя.
+    Встроенные операторы записываются выражениями Python с теми же
+    проверками деления на ноль и целых аргументов, что и в operators.py;
+    проверка пропускается, только если аргумент — подходящая константа.
+    Остальные операторы вызываются через Operator.call, а подвыражения
+    берутся через переданную функцию (см. Evaluator._subexpression).
+
+    Программы с именами и скобками, со структурными ошибками или
+    длиннее TIER_MAX_TOKENS не генерируются: их вычисляет вычислитель,
+    который выдаёт те же ошибки, что и раньше.
+
+    Args:
+        tokens: Токены скомпилированной программы.
+
+    Returns:
+        Функция от функции вычисления подвыражений, возвращающая
+        результат программы, или None, если программу нельзя
+        сгенерировать.
+    """
+    if len(tokens) > TIER_MAX_TOKENS:
+        return None
+
+    namespace = {'is_integer': is_integer_value}
+    lines: list[str] = []
+    stack: list[tuple[str, object]] = []
+    for t in tokens:
+        cls = t.__class__
+        if cls is Operator:
+            if len(stack) < t.arity:
+                return None
+            args = stack[-t.arity:]
+            del stack[-t.arity:]
+            stack.append(_operation(t, args, lines, namespace))
+        elif cls is Subexpression:
+            name = _bind(namespace, 's', t)
+            stack.append(_assign(lines, f'subexpression({name})'))
+        elif cls is str:
+            return None
+        else:
+            stack.append((_literal(t, namespace), t))
+
+    if len(stack) != 1:
+        return None
+    lines.append(f'return {stack[0][0]}')
+
+    source = 'def tiered(subexpression):\n' + ''.join(f'    {line}\n' for line in lines)
+    exec(compile(source, TIER_FILENAME, 'exec'), namespace)
+    return namespace['tiered']
+
+
+def _operation(op: Operator, args: list, lines: list, namespace: dict) -> tuple:
+    """
+    Записывает операцию и возвращает её результат.
+
+    Args:
+        op: Оператор.
+        args: Пары из кода и известного значения аргументов.
+        lines: Строки генерируемой функции.
+        namespace: Глобальные имена генерируемой функции.
+
+    Returns:
+        Пара из имени результата и признака неизвестного значения.
+    """
+    if not (op.builtin and OPERATORS.get(op.symbol) is op):
+        name = _bind(namespace, 'f', op.call)
+        return _assign(lines, f'{name}({", ".join(code for code, _ in args)})')
+
+    if op.arity == 1:
+        return _assign(lines, _UNARY_TEMPLATES[op.symbol].format(args[0][0]))
+
+    (a, _), (b, b_value) = args
+    if op.symbol in _ZERO_CHECKED and not (_is_number(b_value) and b_value != 0):
+        lines.append(f'if {b} == 0: raise ZeroDivisionError({ERROR_DIVISION_BY_ZERO!r})')
+    message = _INTEGER_ONLY.get(op.symbol)
+    if message is not None:
+        checks = [f'not is_integer({code})' for code, value in args
+                  if not (_is_number(value) and is_integer_value(value))]
+        if checks:
+            lines.append(f'if {" or ".join(checks)}: raise TypeError({message!r})')
+    return _assign(lines, _BINARY_TEMPLATES[op.symbol].format(a, b))
+
+
+def _assign(lines: list, expression: str) -> tuple:
+    """
+    Записывает присваивание значения новой локальной переменной.
+
+    Args:
+        lines: Строки генерируемой функции.
+        expression: Код значения.
+
+    Returns:
+        Пара из имени переменной и признака неизвестного значения.
+    """
+    name = f'v{len(lines)}'
+    lines.append(f'{name} = {expression}')
+    return name, _UNKNOWN
+
+
+def _literal(value, namespace: dict) -> str:
+    """
+    Возвращает код константы.
+
+    Небольшие целые и конечные float записываются литералом
+    (отрицательные в скобках), остальные значения — именем.
+
+    Args:
+        value: Константа программы.
+        namespace: Глобальные имена генерируемой функции.
+
+    Returns:
+        Код константы.
+    """
+    cls = value.__class__
+    if (cls is int and -_LITERAL_INT_LIMIT < value < _LITERAL_INT_LIMIT
+            or cls is float and math.isfinite(value)):
+        code = repr(value)
+        return f'({code})' if code[0] == '-' else code
+    return _bind(namespace, 'k', value)
+
+
+def _bind(namespace: dict, prefix: str, value) -> str:
+    """
+    Добавляет значение в глобальные имена генерируемой функции.
+
+    Args:
+        namespace: Глобальные имена генерируемой функции.
+        prefix: Префикс имени.
+        value: Значение.
+
+    Returns:
+        Новое имя.
+    """
+    name = f'{prefix}{len(namespace)}'
+    namespace[name] = value
+    return name
+
+
+def _is_number(value) -> bool:
+    """
+    Проверяет, что значение — известная при генерации константа int или float.
+
+    Args:
+        value: Значение или признак неизвестного значения.
+
+    Returns:
+        True для константы int или float.
+    """
+    return value.__class__ is int or value.__class__ is float
@@ -26,14 +26,55 @@ BRACKETS = '()'
 POINT = '.'
 UNARY_PLUS_SYMBOL = '$'
 UNARY_MINUS_SYMBOL = '~'
+VARIABLE_UNDERSCORE = '_'
 
 # Команды интерфейса
 COMMAND_EXIT = 'exit'
 COMMAND_HELP = 'help'
+COMMAND_STATS = 'stats'
+COMMAND_STACK = 'stack'
+COMMAND_DROP = 'drop'
+COMMAND_UNDO = 'undo'
+COMMAND_CLEAR = 'clear'
 
 # Промпт
 PROMPT = '\nRPN> '
 
+# Пакетный режим
+BATCH_READ_SIZE = 1 << 20
+BATCH_WRITE_LINES = 8192
+BATCH_ERROR_FORMAT = 'Строка {}: Ошибка: {}\n'
+# Строка результата с ошибкой в текстовом выводе, сохраняющая выравнивание строк
+BATCH_ERROR_RESULT = 'ошибка'
+BATCH_SUMMARY_FORMAT = 'Обработано выражений: {}, ошибок: {}\n'
+
+# Форматы вывода пакетного режима и поля записей JSON Lines и CSV
+OUTPUT_TEXT = 'text'
+OUTPUT_JSONL = 'jsonl'
+OUTPUT_CSV = 'csv'
+OUTPUT_FORMATS = (OUTPUT_TEXT, OUTPUT_JSONL, OUTPUT_CSV)
+OUTPUT_FIELDS = ('line', 'input', 'result', 'error')
+
+# Однократный режим (выражения в аргументах командной строки)
+ONE_SHOT_FLAGS = ('-e', '--eval')
+ONE_SHOT_ERROR_FORMAT = 'Выражение {}: Ошибка: {}\n'
+
+# Параллельный режим
+PARALLEL_CHUNK_SIZE = 4 << 20
+PARALLEL_CHUNKS_PER_WORKER = 2
+
+# Пул потоков движка вычислений: число выражений в одной задаче
+ENGINE_CHUNK_SIZE = 256
+
+# Сервер
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 7878
+SERVER_LINE_LIMIT = 1 << 20
+SERVER_PIPELINE_DEPTH = 256
+SERVER_INLINE_LENGTH = 4096
+SERVER_RESULT_FORMAT = 'OK {}\n'
+SERVER_ERROR_FORMAT = 'ERR {}\n'
+
 # Сообщения об ошибках
 ERROR_EMPTY_EXPRESSION = 'Пустое выражение'
 ERROR_UNBALANCED_BRACKETS = 'Несбалансированные скобки'
@@ -51,6 +92,28 @@ ERROR_INTEGER_ONLY_FLOOR_DIV = 'Операция // только для целы
 ERROR_INTEGER_ONLY_MOD = 'Операция % только для целых чисел'
 ERROR_INVALID_EXPRESSION = 'Некорректное выражение: осталось {} элементов в стеке'
 ERROR_UNPROCESSED_TOKENS = 'Остались необработанные токены'
+ERROR_INVALID_ARITY = 'Некорректная арность оператора: {}'
+ERROR_INVALID_OPERATOR_SYMBOL = 'Некорректный символ оператора: {}'
+ERROR_OPERATOR_EXISTS = 'Оператор уже зарегистрирован: {}'
+ERROR_UNKNOWN_VARIABLE = 'Неизвестная переменная: {}'
+ERROR_INVALID_VARIABLE_VALUES = 'Некорректные значения переменной: {}'
+ERROR_DIVISION_BY_ZERO_ROWS = 'Деление на ноль в строках: {}'
+ERROR_NUMPY_REQUIRED = 'Для векторного вычисления требуется пакет numpy'
+ERROR_INVALID_WORKERS = 'Некорректное число процессов: {}'
+ERROR_INVALID_CHUNK_SIZE = 'Некорректный размер блока: {}'
+ERROR_PARALLEL_NEEDS_FILE = 'Параллельный режим требует файл с выражениями'
+ERROR_LINE_TOO_LONG = 'Строка длиннее {} байт'
+ERROR_SESSION_EMPTY_STACK = 'Стек пуст'
+ERROR_NOTHING_TO_UNDO = 'Нечего отменять'
+ERROR_INVALID_CACHE_SIZE = 'Некорректный размер кэша: {}'
+ERROR_PROGRAM_IMMUTABLE = 'Скомпилированная программа неизменяема'
+ERROR_BUDGET_RESULT_BITS = 'Превышен бюджет: результат {} займёт около {} бит (предел {})'
+ERROR_BUDGET_COST = 'Превышен бюджет: стоимость {} около {} (предел {})'
+ERROR_BUDGET_OPERATIONS = 'Превышен бюджет: больше {} операций'
+ERROR_BUDGET_TIMEOUT = 'Превышен бюджет: вычисление дольше {} с'
+ERROR_EXACT_POWER = 'Дробная степень не представима точно'
+ERROR_UNKNOWN_BACKEND = 'Неизвестный числовой режим: {}'
+ERROR_INVALID_TIER_THRESHOLD = 'Некорректный порог генерации кода: {}'
 
 # Текст справки
 HELP_TEXT = """
@@ -58,8 +121,76 @@ RPN Калькулятор
 Операции: +, -, *, /, //, %, **
 Унарные: ~ (минус), $ (плюс)
 Примеры: 3 4 +, 5 ~, 2 ( 3 4 + ) *
-Команды: help, exit
+Команды: help, stats, exit
+"""
+
+SESSION_HELP_TEXT = """
+Сеанс: стек сохраняется между строками, например: 3 4, затем +
+Команды сеанса: stack, drop, undo, clear
 """
 
+# Сеанс
+SESSION_UNDO_LIMIT = 1000
+SESSION_STACK_FORMAT = '{}: {}'
+
 # Форматирование вывода
 FLOAT_FORMAT = '{:.6g}'
+
+# Кэш скомпилированных программ
+DEFAULT_CACHE_SIZE = 4096
+
+# Таблица значений дорогих подвыражений (значения могут быть большими целыми)
+DEFAULT_MEMO_SIZE = 256
+
+# Пределы свёртки констант при компиляции: операции крупнее
+# выполняются при вычислении через таблицу подвыражений
+FOLD_MAX_RESULT_BITS = 1 << 12
+FOLD_MAX_COST = 1 << 20
+
+# Генерация Python кода для часто вычисляемых программ
+DEFAULT_TIER_THRESHOLD = 1000
+TIER_MAX_TOKENS = 10000
+TIER_FILENAME = '<rpn-program>'
+
+# Типизированный стек float: целые больше по модулю
+# не представимы в double точно и вычисляются обычным путём
+FLOAT_STACK_MAX_INT = 1 << 53
+
+# Векторное вычисление
+MAX_REPORTED_ROWS = 10
+
+# Потоковый разбор
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Нагрузочные тесты
+BENCHMARK_DEFAULT_SIZE = 2000
+BENCHMARK_REPEAT = 3
+BENCHMARK_SEED = 1
+BENCHMARK_THRESHOLD = 0.1
+BENCHMARK_CHAIN_LENGTH = 50
+BENCHMARK_NESTING_DEPTH = 200
+BENCHMARK_HEADER_FORMAT = '{:<16} {:<11} {:>12} {:>11} {:>7}'
+BENCHMARK_ROW_FORMAT = '{:<16} {:<11} {:>12.0f} {:>11.1f} {:>7}'
+BENCHMARK_REGRESSION_FORMAT = 'Регрессия: {} / {}: {:.0f} -> {:.0f} ops/sec (-{:.1f}%)'
+
+# Метрики
+METRICS_PHASE_COMPILE = 'compile'
+METRICS_PHASE_EVALUATE = 'evaluate'
+METRICS_PHASE_ERROR = 'error'
+METRICS_PHASES = (METRICS_PHASE_COMPILE, METRICS_PHASE_EVALUATE, METRICS_PHASE_ERROR)
+METRICS_BUCKETS = (1e-6, 1e-5, 1e-4, 1e-3, 1e-2, 1e-1, 1.0)
+METRICS_PREFIX = 'rpn'
+MESSAGE_METRICS_DISABLED = 'Метрики отключены, запустите с флагом --metrics'
+CACHE_STATS_FORMAT = '{}: попаданий {}, промахов {}, вытеснений {}, доля попаданий {:.1%}'
+CACHE_STATS_PROGRAMS = 'Кэш программ'
+CACHE_STATS_SUBEXPRESSIONS = 'Подвыражения'
+
+# Бюджет вычислений
+BUDGET_MAX_RESULT_BITS = 1 << 20
+BUDGET_MAX_COST = 1 << 36
+
+# Числовые режимы
+BACKEND_NATIVE = 'native'
+BACKEND_FRACTION = 'fraction'
+BACKEND_DECIMAL = 'decimal'
+BACKEND_NAMES = (BACKEND_NATIVE, BACKEND_FRACTION, BACKEND_DECIMAL)
@@ -0,0 +1,192 @@
+"""Модуль потокобезопасного вычисления выражений."""
+import copy
+import os
+import threading
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+
+from budget import Budget
+from evaluator import Evaluator
+from metrics import METRICS
+from numeric import NATIVE, NumericBackend, backend_by_name
+from program import SubexpressionMemo
+from constants import *
+
+
+class Engine:
+    """
+    Вычислитель выражений, общий для нескольких потоков.
+
+    Движок не хранит состояния вычисления: выражение передаётся
+    в eval, программы берутся из кэша числового режима, а таблица
+    подвыражений общая; обе защищены блокировками. Вычислитель
+    со стеком и массивом типизированного стека у каждого потока
+    свой: он создаётся при первом вызове в потоке и переиспользуется
+    всеми его вызовами, поэтому вызов eval ничего не создаёт.
+    Бюджет хранит счётчики текущего выражения, поэтому каждый поток
+    получает свою копию.
+
+    Пример: Engine('fraction').eval_parallel(lines, workers=8).
+    """
+
+    def __init__(self, backend: NumericBackend | str | None = None, budget: Budget | None = None,
+                 memo: SubexpressionMemo | None = None, float_stack: bool = False,
+                 validate: bool = False):
+        """
+        Инициализирует движок.
+
+        Args:
+            backend: Числовой режим или его имя, по умолчанию native.
+            budget: Бюджет вычисления одного выражения или None.
+            memo: Таблица подвыражений, по умолчанию своя таблица
+                размера DEFAULT_MEMO_SIZE.
+            float_stack: Вычислять float выражения на типизированном стеке
+                (см. Evaluator).
+            validate: Проверять структуру выражений до вычисления
+                (см. Evaluator).
+
+        Raises:
+            ValueError: При неизвестном имени режима.
+        """
+        if isinstance(backend, str):
+            backend = backend_by_name(backend)
+        self.backend = NATIVE if backend is None else backend
+        self.budget = budget
+        self.memo = SubexpressionMemo(DEFAULT_MEMO_SIZE) if memo is None else memo
+        self.float_stack = float_stack
+        self.validate = validate
+        self._local = threading.local()
+
+    def eval(self, expression: str) -> float:
+        """
+        Вычисляет выражение.
+
+        Метод можно вызывать одновременно из любого числа потоков.
+
+        Args:
+            expression: Выражение в RPN формате.
+
+        Returns:
+            Числовой результат вычисления выражения.
+
+        Raises:
+            ValueError: При некорректном выражении.
+        """
+        evaluator = self._evaluator()
+        get_program = self.backend.programs(self.budget).get
+        if METRICS.enabled:
+            return METRICS.evaluate(get_program, expression, evaluator)
+        return get_program(expression).eval(evaluator)
+
+    def eval_many(self, expressions: Iterable[str],
+                  return_exceptions: bool = False) -> list[float | Exception]:
+        """
+        Вычисляет выражения в текущем потоке.
+
+        Args:
+            expressions: Итерируемый объект со строками выражений.
+            return_exceptions: Если True, ошибка вычисления возвращается
+                вместо результата, и обработка продолжается.
+
+        Returns:
+            Результаты в порядке входных выражений.
+
+        Raises:
+            ValueError: При некорректном выражении, если return_exceptions=False.
+        """
+        evaluator = self._evaluator()
+        get_program = self.backend.programs(self.budget).get
+        results: list[float | Exception] = []
+        append = results.append
+        for expression in expressions:
+            result: float | Exception
+            try:
+                if METRICS.enabled:
+                    result = METRICS.evaluate(get_program, expression, evaluator)
+                else:
+                    result = get_program(expression).eval(evaluator)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                result = e
+            append(result)
+        return results
+
+    def eval_parallel(self, expressions: Iterable[str], workers: int | None = None,
+                      chunk_size: int = ENGINE_CHUNK_SIZE,
+                      return_exceptions: bool = False) -> Iterator[float | Exception]:
+        """
+        Вычисляет поток выражений в пуле потоков.
+
+        Выражения читаются блоками по chunk_size, и каждый блок
+        вычисляется одной задачей пула. Одновременно в работе
+        находится ограниченное число блоков, поэтому память
+        не зависит от длины входа. Выигрыш дают сборки CPython
+        без GIL и числовые режимы, операции которых освобождают GIL;
+        с GIL потоки выполняют Python код по очереди.
+
+        Args:
+            expressions: Итерируемый объект со строками выражений.
+            workers: Число потоков, по умолчанию число ядер.
+            chunk_size: Число выражений в одной задаче пула.
+            return_exceptions: Если True, ошибка вычисления выдаётся
+                вместо результата, и обработка продолжается.
+
+        Yields:
+            Результаты в порядке входных выражений.
+
+        Raises:
+            ValueError: При некорректном числе потоков или размере блока,
+                а также при некорректном выражении, если return_exceptions=False.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(ERROR_INVALID_WORKERS.format(workers))
+        if chunk_size < 1:
+            raise ValueError(ERROR_INVALID_CHUNK_SIZE.format(chunk_size))
+
+        expressions = iter(expressions)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            pending: deque[Future[list[float | Exception]]] = deque()
+            while chunk := list(islice(expressions, chunk_size)):
+                pending.append(executor.submit(self.eval_many, chunk, True))
+                if len(pending) >= workers * PARALLEL_CHUNKS_PER_WORKER:
+                    yield from self._results(pending.popleft(), return_exceptions)
+            while pending:
+                yield from self._results(pending.popleft(), return_exceptions)
+
+    @staticmethod
+    def _results(future: Future[list[float | Exception]], return_exceptions: bool) -> Iterator[float | Exception]:
+        """
+        Выдаёт результаты блока, выбрасывая первую ошибку при необходимости.
+
+        Args:
+            future: Задача пула с результатами блока.
+            return_exceptions: Выдавать ошибки вместо результатов.
+
+        Yields:
+            Результаты блока по порядку.
+        """
+        for result in future.result():
+            if isinstance(result, Exception) and not return_exceptions:
+                raise result
+            yield result
+
+    def _evaluator(self) -> Evaluator:
+        """
+        Возвращает вычислитель текущего потока, создавая его при первом вызове.
+
+        Returns:
+            Вычислитель с копией бюджета и общей таблицей подвыражений.
+        """
+        try:
+            return self._local.evaluator
+        except AttributeError:
+            budget = None if self.budget is None else copy.copy(self.budget)
+            evaluator = Evaluator((), budget=budget, memo=self.memo, float_stack=self.float_stack,
+                                  validate=self.validate)
+            self._local.evaluator = evaluator
+            return evaluator
@@ -1,23 +1,118 @@
 """Модуль вычисления RPN выражений."""
+from array import array
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+
+from budget import Budget
+from floatstack import evaluate_floats, new_stack
+from operators import OPERATORS, Operator, OperatorRegistry, is_integer_value
+from validator import validate
 from constants import *
 
+# Признак исчерпанного итератора токенов
+_END = object()
+
+
+class Subexpression:
+    """
+    Подвыражение из констант и чистых операторов.
+
+    Оптимизатор заменяет им операции над константами, которые дорого
+    выполнять при компиляции (например, степень с большим результатом),
+    и содержащие их подвыражения. Равные подвыражения разных программ
+    равны и имеют одинаковый хэш: ключом служит последовательность
+    токенов, в которой числа различаются и по типу, а операторы —
+    по объекту. Поэтому значение вычисляется один раз и берётся
+    из таблицы подвыражений (см. program.SubexpressionMemo).
+    """
+
+    __slots__ = ('tokens', '_key', '_hash')
+
+    def __init__(self, tokens: tuple):
+        """
+        Инициализирует подвыражение.
+
+        Args:
+            tokens: Токены подвыражения: числа, объекты Operator
+                и вложенные подвыражения.
+        """
+        self.tokens = tokens
+        self._key = tuple(t if t.__class__ is Operator else (t.__class__, t) for t in tokens)
+        self._hash = hash(self._key)
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __eq__(self, other) -> bool:
+        return other.__class__ is Subexpression and self._key == other._key
+
+    def __repr__(self) -> str:
+        return f'Subexpression({len(self.tokens)} токенов)'
+
 
 class Evaluator:
     """
     Вычислитель для RPN выражений.
 
     Обрабатывает токены и выполняет операции.
+    Операторы берутся из реестра и вызываются напрямую.
+
+    В режиме float_stack список токенов без бюджета сначала
+    вычисляется в double на переиспользуемом массиве array('d')
+    (см. floatstack.evaluate_floats), а выражения, которым нужна
+    обычная арифметика, вычисляются обычным путём.
+
+    В режиме validate структура списка токенов проверяется до
+    вычисления (см. validator.validate): некорректное выражение
+    отклоняется без выполнения операций, и ошибка структуры
+    выдаётся раньше ошибок операций, которые встретились бы до неё.
     """
 
-    def __init__(self, tokens: list[str]):
+    def __init__(self, tokens: Iterable, variables: Mapping[str, float] | None = None,
+                 operators: OperatorRegistry | None = None, budget: Budget | None = None,
+                 memo=None, float_stack: bool = False, validate: bool = False):
         """
         Инициализирует вычислитель.
 
+        Args:
+            tokens: Токены для вычисления: список или итератор,
+                который читается однократно. Числовые токены
+                могут быть переданы уже преобразованными в int или float,
+                а операторы — объектами Operator (см. Tokenizer.decode).
+            variables: Значения именованных переменных.
+            operators: Реестр операторов, по умолчанию общий реестр.
+            budget: Бюджет вычисления, проверяемый перед каждой операцией.
+            memo: Таблица значений подвыражений (см. program.SubexpressionMemo);
+                без неё подвыражения вычисляются каждый раз.
+            float_stack: Вычислять выражения из чисел float и операторов
+                +, -, *, /, ** на типизированном стеке double. Результат
+                таких выражений всегда float; целые промежуточные значения
+                больше 2**53 при этом округляются.
+            validate: Проверять структуру списка токенов до вычисления.
+        """
+        self.tokens = tokens
+        self.variables = {} if variables is None else variables
+        self.operators = OPERATORS if operators is None else operators
+        self.budget = budget
+        self.memo = memo
+        self.float_stack = float_stack
+        self.validate = validate
+        self.depth: int | None = None
+        self._floats: array | None = None
+
+    def reset(self, tokens: Iterable, depth: int | None = None) -> None:
+        """
+        Готовит вычислитель к вычислению нового набора токенов.
+
+        Позволяет переиспользовать один вычислитель для множества выражений.
+
         Args:
             tokens: Список токенов для вычисления.
+            depth: Наибольшая высота стека, если структура токенов
+                уже проверена; иначе режимы float_stack и validate
+                проверяют её сами.
         """
         self.tokens = tokens
-        self.i = 0
+        self.depth = depth
 
     def evaluate(self) -> float:
         """
@@ -29,17 +124,72 @@ class Evaluator:
         Raises:
             ValueError: Если остались необработанные токены.
         """
-        result = self._parse()
-        if self.i < len(self.tokens):
+        if self.validate and self.depth is None and isinstance(self.tokens, (list, tuple)):
+            self.depth = validate(self.tokens)
+        if self.budget is not None:
+            self.budget.start()
+        elif self.float_stack and isinstance(self.tokens, (list, tuple)):
+            result = self._evaluate_floats(self.tokens)
+            if result is not None:
+                return result
+        tokens = iter(self.tokens)
+        result = self._parse(tokens)
+        if next(tokens, _END) is not _END:
             raise ValueError(ERROR_UNPROCESSED_TOKENS)
         return result
 
-    def _parse(self) -> float:
+    def run(self, stack: list) -> None:
+        """
+        Выполняет токены над существующим стеком операндов.
+
+        В отличие от evaluate, не требует, чтобы в стеке осталось
+        ровно одно значение: операторы могут использовать значения,
+        уже лежащие в стеке, а результаты остаются в нём.
+
+        Args:
+            stack: Стек операндов, изменяемый на месте.
+
+        Raises:
+            ValueError: При некорректной структуре выражения.
+        """
+        if self.budget is not None:
+            self.budget.start()
+        frames: list[int] = []
+        if self._execute(iter(self.tokens), stack, frames) is None or frames:
+            raise ValueError(ERROR_UNBALANCED_BRACKETS)
+
+    def _evaluate_floats(self, tokens: Sequence) -> float | None:
+        """
+        Вычисляет токены на типизированном стеке double.
+
+        Массив стека создаётся по наибольшей высоте стека выражения
+        и переиспользуется следующими выражениями, пока хватает его длины.
+
+        Args:
+            tokens: Список или кортеж токенов вычислителя.
+
+        Returns:
+            Результат float или None, если выражение нужно вычислить
+            обычным путём (в том числе при любой ошибке: её выдаст
+            обычный проход в порядке вычисления).
+        """
+        depth = self.depth
+        if depth is None:
+            try:
+                depth = validate(tokens)
+            except ValueError:
+                return None
+        stack = self._floats
+        if stack is None or len(stack) < depth:
+            stack = self._floats = new_stack(depth)
+        return evaluate_floats(tokens, stack)
+
+    def _parse(self, tokens: Iterator) -> float:
         """
         Парсит токены и вычисляет результат выражения RPN.
 
-        Использует стек для обработки операндов и операторов.
-        Поддерживает рекурсивную обработку скобок.
+        Args:
+            tokens: Итератор токенов.
 
         Returns:
             Результат вычисления выражения.
@@ -47,57 +197,149 @@ class Evaluator:
         Raises:
             ValueError: При некорректной структуре выражения.
         """
-        stack = []
-        while self.i < len(self.tokens):
-            t = self.tokens[self.i]
-
-            if t == OPENING_BRACKET:
-                self.i += 1
-                res = self._parse()
-                stack.append(res)
-
-            elif t == CLOSING_BRACKET:
-                self.i += 1
-                if len(stack) != 1:
-                    if len(stack) == 0:
-                        raise ValueError(ERROR_EMPTY_BRACKETS)
-                    else:
-                        msg = ERROR_INVALID_BRACKET_EXPRESSION.format(len(stack))
-                        raise ValueError(msg)
-                return stack[0]
-
-            elif t in UNARY_OPERATORS:
-                if len(stack) < 1:
-                    raise ValueError(ERROR_NOT_ENOUGH_UNARY_ARGS)
-                a = stack.pop()
-                stack.append(self._calc_unary(a, t))
-                self.i += 1
-
-            elif t in BINARY_OPERATORS:
-                if len(stack) < 2:
-                    raise ValueError(ERROR_NOT_ENOUGH_BINARY_ARGS)
-                b = stack.pop()
-                a = stack.pop()
-                stack.append(self._calc(a, b, t))
-                self.i += 1
-
-            else:
-                stack.append(self._to_number(t))
-                self.i += 1
+        stack: list = []
+        frames: list[int] = []
+        base = self._execute(tokens, stack, frames)
+        if base is None:
+            # Закрывающая скобка без пары завершила разбор
+            return stack[0]
+
+        # Незакрытые скобки: содержимое каждой должно свестись к одному значению
+        while frames:
+            size = len(stack) - base
+            if size != 1:
+                raise ValueError(ERROR_INVALID_EXPRESSION.format(size))
+            base = frames.pop()
 
         if len(stack) != 1:
             msg = ERROR_INVALID_EXPRESSION.format(len(stack))
             raise ValueError(msg)
         return stack[0]
 
+    def _execute(self, tokens: Iterator, stack: list, frames: list) -> int | None:
+        """
+        Выполняет токены над стеком операндов.
+
+        Использует один стек для операндов всех уровней вложенности.
+        Скобки обрабатываются без рекурсии: для каждой открытой скобки
+        в стек кадров записывается высота стека операндов, поэтому
+        проверка содержимого скобок сводится к сравнению высот.
+        Глубина вложенности ограничена только памятью.
+        Операторы выполняются прямым вызовом Operator.call.
+        Токены читаются из итератора по одному, поэтому их источником
+        может быть и генератор (см. tokenizer.iter_tokens).
+
+        Args:
+            tokens: Итератор токенов.
+            stack: Стек операндов, изменяемый на месте.
+            frames: Стек кадров скобок; после выполнения в нём
+                остаются кадры незакрытых скобок.
+
+        Returns:
+            Высота стека в начале текущего кадра или None, если
+            разбор завершила закрывающая скобка без пары.
+
+        Raises:
+            ValueError: При некорректной структуре выражения.
+        """
+        find_operator = self.operators.get
+        budget = self.budget
+        push = stack.append
+        pop = stack.pop
+        base = 0
+
+        for t in tokens:
+            if t.__class__ is str:
+                if t == OPENING_BRACKET:
+                    frames.append(base)
+                    base = len(stack)
+                    continue
+
+                if t == CLOSING_BRACKET:
+                    size = len(stack) - base
+                    if size != 1:
+                        if size == 0:
+                            raise ValueError(ERROR_EMPTY_BRACKETS)
+                        else:
+                            msg = ERROR_INVALID_BRACKET_EXPRESSION.format(size)
+                            raise ValueError(msg)
+                    if not frames:
+                        # Закрывающая скобка без пары завершает разбор
+                        return None
+                    base = frames.pop()
+                    continue
+
+                op = find_operator(t)
+                if op is None:
+                    push(self._to_operand(t))
+                    continue
+
+            elif t.__class__ is Operator:
+                # Оператор, уже найденный в реестре при компиляции программы
+                op = t
+
+            elif t.__class__ is Subexpression:
+                push(self._subexpression(t))
+                continue
+
+            else:
+                # Число, уже преобразованное при компиляции программы
+                push(t)
+                continue
+
+            if op.arity == 1:
+                if len(stack) - base < 1:
+                    raise ValueError(ERROR_NOT_ENOUGH_UNARY_ARGS)
+                if budget is not None:
+                    budget.charge(op, stack[-1])
+                push(op.call(pop()))
+            else:
+                if len(stack) - base < 2:
+                    raise ValueError(ERROR_NOT_ENOUGH_BINARY_ARGS)
+                b = pop()
+                if budget is not None:
+                    budget.charge(op, stack[-1], b)
+                push(op.call(pop(), b))
+
+        return base
+
+    def _subexpression(self, subexpression: Subexpression) -> float:
+        """
+        Возвращает значение подвыражения, вычисляя его при промахе таблицы.
+
+        С бюджетом таблица не используется: значение из неё
+        не учитывалось бы бюджетом текущего выражения.
+
+        Args:
+            subexpression: Подвыражение программы.
+
+        Returns:
+            Значение подвыражения.
+        """
+        if self.memo is None or self.budget is not None:
+            return self._compute(subexpression)
+        return self.memo.get(subexpression, self._compute)
+
+    def _compute(self, subexpression: Subexpression) -> float:
+        """
+        Вычисляет подвыражение с бюджетом текущего выражения.
+
+        Args:
+            subexpression: Подвыражение программы.
+
+        Returns:
+            Значение подвыражения.
+        """
+        return self._parse(iter(subexpression.tokens))
+
     def _calc(self, a: float, b: float, op: str) -> float:
         """
-        Выполняет бинарную арифметическую операцию.
+        Выполняет бинарную операцию по символу оператора.
 
         Args:
             a: Первый операнд.
             b: Второй операнд.
-            op: Оператор (+, -, *, /, //, %, **).
+            op: Символ бинарного оператора.
 
         Returns:
             Результат операции.
@@ -107,39 +349,18 @@ class Evaluator:
             ZeroDivisionError: При делении на ноль.
             TypeError: При использовании // или % с нецелыми числами.
         """
-        if op == OP_PLUS:
-            return a + b
-        if op == OP_MINUS:
-            return a - b
-        if op == OP_MULTIPLY:
-            return a * b
-        if op == OP_DIVIDE:
-            if b == 0:
-                raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
-            return a / b
-        if op == OP_POWER:
-            return a ** b
-        if op == OP_FLOOR_DIV:
-            if b == 0:
-                raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
-            if not self._is_integer_value(a) or not self._is_integer_value(b):
-                raise TypeError(ERROR_INTEGER_ONLY_FLOOR_DIV)
-            return a // b
-        if op == OP_MOD:
-            if b == 0:
-                raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
-            if not self._is_integer_value(a) or not self._is_integer_value(b):
-                raise TypeError(ERROR_INTEGER_ONLY_MOD)
-            return a % b
-        raise ValueError(ERROR_UNKNOWN_OPERATOR.format(op))
+        operator = self.operators.get(op)
+        if operator is None or operator.arity != 2:
+            raise ValueError(ERROR_UNKNOWN_OPERATOR.format(op))
+        return operator.call(a, b)
 
     def _calc_unary(self, a: float, op: str) -> float:
         """
-        Выполняет унарную арифметическую операцию.
+        Выполняет унарную операцию по символу оператора.
 
         Args:
             a: Операнд.
-            op: Унарный оператор ($ для +a, ~ для -a).
+            op: Символ унарного оператора.
 
         Returns:
             Результат унарной операции.
@@ -147,13 +368,34 @@ class Evaluator:
         Raises:
             ValueError: Если унарный оператор неизвестен.
         """
-        if op == UNARY_PLUS_SYMBOL:
-            return +a
-        if op == UNARY_MINUS_SYMBOL:
-            return -a
-        raise ValueError(ERROR_UNKNOWN_UNARY_OPERATOR.format(op))
+        operator = self.operators.get(op)
+        if operator is None or operator.arity != 1:
+            raise ValueError(ERROR_UNKNOWN_UNARY_OPERATOR.format(op))
+        return operator.call(a)
+
+    def _to_operand(self, token: str) -> float:
+        """
+        Преобразует токен операнда в значение.
+
+        Операнд является либо числом, либо именем переменной.
 
-    def _to_number(self, token: str) -> float:
+        Args:
+            token: Строковый токен операнда.
+
+        Returns:
+            Числовое значение или значение переменной.
+
+        Raises:
+            ValueError: Если переменная неизвестна или число некорректно.
+        """
+        if token and (token[0].isalpha() or token[0] == VARIABLE_UNDERSCORE):
+            if token not in self.variables:
+                raise ValueError(ERROR_UNKNOWN_VARIABLE.format(token))
+            return self.variables[token]
+        return self._to_number(token)
+
+    @staticmethod
+    def _to_number(token: str) -> float:
         """
         Преобразует строковый токен в число.
 
@@ -187,8 +429,4 @@ class Evaluator:
         Returns:
             True если число является целым по значению.
         """
-        if isinstance(num, int):
-            return True
-        if isinstance(num, float):
-            return num.is_integer()
-        return False
+        return is_integer_value(num)
@@ -0,0 +1,122 @@
+"""Модуль вычисления float выражений на типизированном стеке."""
+from array import array
+from collections.abc import Sequence
+
+from operators import OPERATORS
+from constants import *
+
+# Встроенные операторы, которые выполняются над float напрямую
+_ADD = OPERATORS.get(OP_PLUS)
+_SUB = OPERATORS.get(OP_MINUS)
+_MUL = OPERATORS.get(OP_MULTIPLY)
+_DIV = OPERATORS.get(OP_DIVIDE)
+_POW = OPERATORS.get(OP_POWER)
+_NEG = OPERATORS.get(UNARY_MINUS_SYMBOL)
+_POS = OPERATORS.get(UNARY_PLUS_SYMBOL)
+
+_ITEM_SIZE = array('d').itemsize
+
+# Пределы точных целых в double: сравнение float с float быстрее, чем с int
+_HIGH = float(FLOAT_STACK_MAX_INT)
+_LOW = -_HIGH
+
+
+def new_stack(depth: int) -> array:
+    """
+    Создаёт стек операндов заданной глубины.
+
+    Args:
+        depth: Наибольшая высота стека выражения.
+
+    Returns:
+        Массив double из depth нулей.
+    """
+    return array('d', bytes(_ITEM_SIZE * depth))
+
+
+def evaluate_floats(tokens: Sequence, stack: array) -> float | None:
+    """
+    Вычисляет выражение в double на массиве array('d').
+
+    Вершина стека хранится в локальной переменной, остальные
+    значения — в массиве с явным индексом вершины, без добавления
+    и удаления элементов списка. Структура выражения должна быть
+    уже проверена (см. validator.validate), а длина массива — не меньше
+    наибольшей высоты стека: проверки числа аргументов не выполняются.
+
+    Выражение не вычисляется (возвращается None), если ему нужна
+    обычная арифметика: целочисленные операторы // и %, пользовательские
+    операторы, подвыражения, переменные, целые больше FLOAT_STACK_MAX_INT
+    по модулю, выражение из одних целых без деления (его результат — int)
+    или операция, выбросившая исключение либо давшая не float
+    (деление на ноль, переполнение степени, комплексный результат).
+    В выражении с целыми литералами не вычисляется и результат +, -, *
+    или ** больше FLOAT_STACK_MAX_INT по модулю: над целыми обычная
+    арифметика точна, а double — нет.
+
+    Args:
+        tokens: Токены с уже преобразованными числами и операторами.
+        stack: Массив для значений под вершиной стека.
+
+    Returns:
+        Результат float или None, если выражение нужно вычислить
+        обычным вычислителем.
+    """
+    top = -1
+    acc = 0.0
+    exact = True
+    # Встречались целые литералы: большие результаты могут быть целыми
+    ints = False
+    low, high = _LOW, _HIGH
+    try:
+        for t in tokens:
+            cls = t.__class__
+            if cls is float:
+                top += 1
+                stack[top] = acc
+                acc = t
+                exact = False
+            elif cls is int:
+                if not -FLOAT_STACK_MAX_INT <= t <= FLOAT_STACK_MAX_INT:
+                    return None
+                top += 1
+                stack[top] = acc
+                acc = float(t)
+                ints = True
+            elif t is _ADD:
+                acc = stack[top] + acc
+                top -= 1
+                if ints and not low <= acc <= high:
+                    return None
+            elif t is _MUL:
+                acc = stack[top] * acc
+                top -= 1
+                if ints and not low <= acc <= high:
+                    return None
+            elif t is _SUB:
+                acc = stack[top] - acc
+                top -= 1
+                if ints and not low <= acc <= high:
+                    return None
+            elif t is _DIV:
+                acc = stack[top] / acc
+                top -= 1
+                exact = False
+            elif t is _NEG:
+                acc = -acc
+            elif t is _POW:
+                acc = stack[top] ** acc
+                top -= 1
+                if ints and not low <= acc <= high:
+                    return None
+            elif t is _POS or cls is str and t in BRACKETS:
+                # Скобки уже проверены и на значения не влияют
+                continue
+            else:
+                return None
+    except (ArithmeticError, TypeError):
+        # Ошибку и её текст выдаст обычный вычислитель
+        return None
+    if exact or acc.__class__ is not float:
+        return None
+    return acc
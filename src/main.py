@@ -1,5 +1,22 @@
 """Главный модуль программы."""
+import sys
+
+if __name__ == "__main__":
+    # Однократный режим (-e) не загружает argparse, калькулятор и справку
+    from oneshot import parse_expressions, run_expressions
+    _expressions = parse_expressions(sys.argv[1:])
+    if _expressions is not None:
+        sys.exit(run_expressions(_expressions, sys.stdout, sys.stderr))
+
+import argparse
+from collections.abc import Iterable, Iterator
+from typing import TextIO
+
+from budget import Budget
 from calculator import Calculator
+from metrics import METRICS
+from oneshot import format_result, run_expressions
+from writers import WRITERS
 from constants import *
 
 
@@ -13,33 +30,181 @@ def show_help() -> None:
     print(HELP_TEXT)
 
 
-def format_result(result: float) -> str:
+def show_stats() -> None:
+    """
+    Отображает накопленные метрики в текстовом формате.
+
+    Если метрики не включены, выводит подсказку. Статистика кэша
+    программ и таблицы подвыражений выводится всегда.
+    """
+    if METRICS.enabled:
+        print(METRICS.export_text(), end='')
+    else:
+        print(MESSAGE_METRICS_DISABLED)
+    for name, info in ((CACHE_STATS_PROGRAMS, Calculator.cache_info()),
+                       (CACHE_STATS_SUBEXPRESSIONS, Calculator.memo_info())):
+        print(CACHE_STATS_FORMAT.format(name, info.hits, info.misses, info.evictions, info.hit_rate))
+
+
+def run_batch(source: TextIO, out: TextIO, err: TextIO,
+              output_format: str = OUTPUT_TEXT) -> int:
     """
-    Форматирует числовой результат для отображения.
+    Вычисляет выражения из потока в неинтерактивном режиме.
 
-    Преобразует float числа с нулевой дробной частью в int формат
-    для более читаемого вывода.
+    Вход читается большими блоками строк. Каждая непустая строка
+    считается отдельным выражением.
 
     Args:
-        result: Числовой результат для форматирования.
+        source: Входной поток с выражениями, по одному на строку.
+        out: Поток для результатов.
+        err: Поток для ошибок и сводки.
+        output_format: Формат вывода: text, jsonl или csv.
 
     Returns:
-        Отформатированная строка представления числа.
+        Код завершения: 0 без ошибок, 1 если были ошибки.
     """
-    if isinstance(result, float) and result.is_integer():
-        return str(int(result))
-    elif isinstance(result, float):
-        return FLOAT_FORMAT.format(result)
-    else:
-        return str(result)
+    return write_results(_read_results(source), out, err, output_format)
 
 
-def main() -> None:
+def run_parallel(path: str, out: TextIO, err: TextIO,
+                 workers: int | None, chunk_size: int,
+                 output_format: str = OUTPUT_TEXT) -> int:
     """
-    Основная функция программы.
+    Вычисляет файл с выражениями в пуле процессов.
+
+    Args:
+        path: Путь к файлу с выражениями.
+        out: Поток для результатов.
+        err: Поток для ошибок и сводки.
+        workers: Число процессов, по умолчанию число ядер.
+        chunk_size: Размер блока файла в байтах.
+        output_format: Формат вывода: text, jsonl или csv.
 
-    Запускает интерактивный цикл обработки пользовательского ввода,
-    поддерживает вычисления RPN выражений и команды управления.
+    Returns:
+        Код завершения: 0 без ошибок, 1 если были ошибки.
+    """
+    from parallel import evaluate_file_parallel
+
+    results = evaluate_file_parallel(path, workers, chunk_size)
+    return write_results(_number_results(results, _file_lines(path, output_format)),
+                         out, err, output_format)
+
+
+def run_file(path: str, out: TextIO, err: TextIO, output_format: str = OUTPUT_TEXT) -> int:
+    """
+    Вычисляет файл с выражениями, отображённый в память.
+
+    Файл не декодируется и не копируется целиком (см. buffers).
+
+    Args:
+        path: Путь к файлу с выражениями.
+        out: Поток для результатов.
+        err: Поток для ошибок и сводки.
+        output_format: Формат вывода: text, jsonl или csv.
+
+    Returns:
+        Код завершения: 0 без ошибок, 1 если были ошибки.
+    """
+    from buffers import evaluate_file_mapped
+
+    results = evaluate_file_mapped(path, return_exceptions=True)
+    return write_results(_number_results(results, _file_lines(path, output_format)),
+                         out, err, output_format)
+
+
+def _file_lines(path: str, output_format: str) -> Iterator[bytes] | None:
+    """
+    Возвращает строки файла, если формату вывода нужны выражения.
+
+    Args:
+        path: Путь к файлу с выражениями.
+        output_format: Формат вывода.
+
+    Returns:
+        Итератор строк файла или None.
+    """
+    if not WRITERS[output_format].needs_input:
+        return None
+    from buffers import iter_file_lines
+
+    return iter_file_lines(path)
+
+
+def _number_results(results: Iterable[float | Exception | None],
+                    lines: Iterable[bytes] | None = None) -> Iterator[tuple[int, str | None, float | Exception]]:
+    """
+    Нумерует результаты строк файла, пропуская пустые строки.
+
+    Args:
+        results: Результаты по строкам, None для пустых строк.
+        lines: Строки файла в байтах в том же порядке или None.
+
+    Yields:
+        Тройки (номер строки, выражение или None, результат или исключение).
+    """
+    if lines is None:
+        for line_number, result in enumerate(results, 1):
+            if result is not None:
+                yield line_number, None, result
+        return
+
+    for line_number, (line, result) in enumerate(zip(lines, results), 1):
+        if result is not None:
+            yield line_number, line.decode('utf-8', 'replace').strip(), result
+
+
+def write_results(records: Iterable[tuple[int, str | None, float | Exception]],
+                  out: TextIO, err: TextIO, output_format: str = OUTPUT_TEXT) -> int:
+    """
+    Записывает результаты пакетного вычисления.
+
+    Записи форматируются и записываются в выходной поток пакетами
+    по BATCH_WRITE_LINES (см. writers). В текстовом формате ошибки
+    выводятся в поток ошибок с номером строки, в форматах jsonl и csv —
+    в поле error записи. В конце в поток ошибок выводится сводка.
+
+    Args:
+        records: Тройки (номер строки, выражение, результат или исключение).
+        out: Поток для результатов.
+        err: Поток для ошибок и сводки.
+        output_format: Формат вывода: text, jsonl или csv.
+
+    Returns:
+        Код завершения: 0 без ошибок, 1 если были ошибки.
+    """
+    return WRITERS[output_format](out, err).write(records)
+
+
+def _read_results(source: TextIO) -> Iterator[tuple[int, str, float | Exception]]:
+    """
+    Читает поток блоками строк и вычисляет выражения.
+
+    Args:
+        source: Входной поток с выражениями.
+
+    Yields:
+        Тройки (номер строки, выражение, результат или исключение)
+        для непустых строк.
+    """
+    line_number = 0
+    while True:
+        lines = source.readlines(BATCH_READ_SIZE)
+        if not lines:
+            return
+
+        results = Calculator.eval_many(lines, return_exceptions=True)
+        for line, result in zip(lines, results):
+            line_number += 1
+            if isinstance(result, Exception) and not line.strip():
+                continue
+            yield line_number, line.strip(), result
+
+
+def run_repl() -> None:
+    """
+    Запускает интерактивный цикл обработки пользовательского ввода.
+
+    Поддерживает вычисления RPN выражений и команды управления.
     """
     show_help()
 
@@ -54,6 +219,10 @@ def main() -> None:
                 show_help()
                 continue
 
+            elif expr.lower() == COMMAND_STATS:
+                show_stats()
+                continue
+
             calc = Calculator(expr)
             result = calc.eval()
             formatted_result = format_result(result)
@@ -70,5 +239,199 @@ def main() -> None:
             print(f"Ошибка: {e}")
 
 
+def run_session() -> None:
+    """
+    Запускает интерактивный сеанс с сохраняемым стеком.
+
+    Каждая строка выполняется над стеком, оставшимся от предыдущих
+    строк, и выводится значение на его вершине. Команды stack, drop,
+    undo и clear показывают и изменяют стек.
+    """
+    from session import Session
+
+    session = Session(budget=Calculator.get_budget())
+    show_help()
+    print(SESSION_HELP_TEXT)
+
+    while True:
+        try:
+            expr = input(PROMPT).strip()
+            command = expr.lower()
+
+            if command == COMMAND_EXIT:
+                break
+
+            elif command == COMMAND_HELP:
+                show_help()
+                print(SESSION_HELP_TEXT)
+
+            elif command == COMMAND_STATS:
+                show_stats()
+
+            elif command == COMMAND_STACK:
+                show_stack(session.stack)
+
+            elif command == COMMAND_DROP:
+                print(format_result(session.drop()))
+
+            elif command == COMMAND_UNDO:
+                session.undo()
+                show_stack(session.stack)
+
+            elif command == COMMAND_CLEAR:
+                session.clear()
+
+            else:
+                print(format_result(session.eval(expr)))
+
+        except KeyboardInterrupt:
+            print("\nCtrl+C")
+
+        except EOFError:
+            break
+
+        except Exception as e:
+            print(f"Ошибка: {e}")
+
+
+def show_stack(stack: tuple) -> None:
+    """
+    Отображает стек сеанса от дна к вершине.
+
+    Args:
+        stack: Значения стека.
+    """
+    if not stack:
+        print(ERROR_SESSION_EMPTY_STACK)
+    for position, value in enumerate(stack, 1):
+        print(SESSION_STACK_FORMAT.format(position, format_result(value)))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv: Список аргументов, по умолчанию sys.argv[1:].
+
+    Returns:
+        Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description='RPN калькулятор')
+    parser.add_argument('file', nargs='?',
+                        help='файл с выражениями для пакетного режима')
+    parser.add_argument(*ONE_SHOT_FLAGS, nargs='+', action='extend', dest='expressions',
+                        metavar='EXPR', help='вычислить выражения из аргументов и завершиться')
+    parser.add_argument('-b', '--batch', action='store_true',
+                        help='пакетный режим: читать выражения из stdin без приглашений')
+    parser.add_argument('-f', '--format', choices=OUTPUT_FORMATS, default=OUTPUT_TEXT,
+                        dest='output_format',
+                        help='формат вывода пакетного режима: text (строка на каждую непустую '
+                             'строку входа, при ошибке — "ошибка", сообщение в stderr), '
+                             'jsonl (JSON Lines) или csv (поля line, input, result, error)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        help='число процессов для параллельного вычисления файла '
+                             '(0 — по числу ядер)')
+    parser.add_argument('--chunk-size', type=int, default=PARALLEL_CHUNK_SIZE,
+                        help='размер блока файла в байтах для параллельного режима')
+    parser.add_argument('-s', '--session', action='store_true',
+                        help='сеанс: стек сохраняется между строками (команды stack, drop, undo, clear)')
+    parser.add_argument('--budget', action='store_true',
+                        help='ограничить размер и стоимость операций над большими целыми')
+    parser.add_argument('--max-operations', type=int,
+                        help='предельное число операций в выражении (включает --budget)')
+    parser.add_argument('--timeout', type=float,
+                        help='предельное время вычисления выражения в секундах (включает --budget)')
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default=BACKEND_NATIVE,
+                        help='числовой режим: native (int/float), fraction (точные дроби) '
+                             'или decimal (десятичная арифметика)')
+    parser.add_argument('--float-stack', action='store_true',
+                        help='вычислять float выражения пакетного режима на типизированном '
+                             'стеке double (результаты таких выражений всегда float)')
+    parser.add_argument('--validate', action='store_true',
+                        help='пакетный режим: проверять структуру строк до вычисления, '
+                             'ошибки структуры выдаются раньше ошибок операций')
+    parser.add_argument('--metrics', action='store_true',
+                        help='собирать метрики вычислений (команда stats в интерактивном режиме)')
+    parser.add_argument('--metrics-file',
+                        help='файл для записи метрик в текстовом формате при завершении')
+    args = parser.parse_args(argv)
+    if args.jobs is not None and not args.file:
+        parser.error(ERROR_PARALLEL_NEEDS_FILE)
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Основная функция программы.
+
+    Флаг -e вычисляет выражения из аргументов. Без других флагов он
+    обрабатывается ещё до импорта модуля (см. oneshot), с ними — здесь,
+    с учётом бюджета и числового режима.
+    Запускает параллельный режим, если задан флаг --jobs, и пакетный,
+    если задан файл, флаг --batch или стандартный ввод не является
+    терминалом. Флаг --session запускает сеанс с сохраняемым стеком.
+    Иначе запускает интерактивный режим. Флаги --metrics и --metrics-file включают
+    сбор метрик; файл метрик записывается при завершении. Флаги
+    --budget, --max-operations и --timeout задают бюджет вычислений,
+    флаг --backend — числовой режим, флаг --float-stack — вычисление
+    float выражений на типизированном стеке, флаг --validate — проверку
+    структуры строк пакетного режима до вычисления.
+
+    Args:
+        argv: Список аргументов командной строки.
+
+    Returns:
+        Код завершения программы.
+    """
+    args = parse_args(argv)
+    if args.metrics or args.metrics_file:
+        METRICS.enable()
+    if args.budget or args.max_operations is not None or args.timeout is not None:
+        Calculator.configure_budget(Budget(max_operations=args.max_operations, timeout=args.timeout))
+    Calculator.configure_backend(args.backend)
+    Calculator.configure_float_stack(args.float_stack)
+    Calculator.configure_validation(args.validate)
+
+    try:
+        return _run(args)
+    finally:
+        if args.metrics_file:
+            METRICS.write(args.metrics_file)
+
+
+def _run(args: argparse.Namespace) -> int:
+    """
+    Запускает выбранный режим работы.
+
+    Args:
+        args: Разобранные аргументы командной строки.
+
+    Returns:
+        Код завершения программы.
+    """
+    if args.expressions:
+        return run_expressions(args.expressions, sys.stdout, sys.stderr,
+                               lambda expression: Calculator(expression).eval())
+
+    if args.jobs is not None:
+        workers = args.jobs or None
+        return run_parallel(args.file, sys.stdout, sys.stderr, workers, args.chunk_size,
+                            args.output_format)
+
+    if args.file:
+        return run_file(args.file, sys.stdout, sys.stderr, args.output_format)
+
+    if args.session:
+        run_session()
+        return 0
+
+    if args.batch or not sys.stdin.isatty():
+        return run_batch(sys.stdin, sys.stdout, sys.stderr, args.output_format)
+
+    run_repl()
+    return 0
+
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""Модуль метрик времени выполнения калькулятора."""
+import os
+import re
+import threading
+from bisect import bisect_left
+from collections.abc import Callable, Iterable
+from time import perf_counter
+
+import constants
+from operators import Operator
+from constants import *
+
+
+def _error_pattern() -> re.Pattern:
+    """
+    Строит выражение, сопоставляющее текст ошибки с константой ERROR_*.
+
+    Returns:
+        Регулярное выражение с именованной группой для каждой константы.
+    """
+    groups = []
+    for name in dir(constants):
+        if name.startswith('ERROR_'):
+            template = re.escape(getattr(constants, name)).replace(r'\{\}', '.*')
+            groups.append(f'(?P<{name}>{template})')
+    return re.compile('|'.join(groups), re.DOTALL)
+
+
+_ERROR_RE = _error_pattern()
+
+
+def error_type(error: Exception) -> str:
+    """
+    Определяет тип ошибки по тексту исключения.
+
+    Args:
+        error: Исключение, выброшенное при вычислении.
+
+    Returns:
+        Имя константы ERROR_* или имя класса исключения,
+        если текст не совпадает ни с одной константой.
+    """
+    match = _ERROR_RE.fullmatch(str(error))
+    if match is None or match.lastgroup is None:
+        return type(error).__name__
+    return match.lastgroup
+
+
+def stack_depth(tokens: Iterable) -> int:
+    """
+    Вычисляет максимальную глубину стека операндов программы.
+
+    Глубина считается по токенам без вычисления: операнд добавляет
+    одно значение, бинарный оператор снимает одно, унарный и скобки
+    высоту не меняют.
+
+    Args:
+        tokens: Токены скомпилированной программы.
+
+    Returns:
+        Максимальная высота стека операндов.
+    """
+    height = 0
+    deepest = 0
+    for t in tokens:
+        if t.__class__ is Operator:
+            if t.arity == 2:
+                height -= 1
+        elif t.__class__ is not str or t not in BRACKETS:
+            height += 1
+            if height > deepest:
+                deepest = height
+    return deepest
+
+
+class Histogram:
+    """
+    Гистограмма задержек с фиксированными границами корзин.
+
+    Хранит число наблюдений в каждой корзине, их сумму и количество.
+    """
+
+    __slots__ = ('bounds', 'counts', 'total', 'count')
+
+    def __init__(self, bounds: tuple[float, ...] = METRICS_BUCKETS):
+        """
+        Инициализирует пустую гистограмму.
+
+        Args:
+            bounds: Верхние границы корзин в секундах по возрастанию.
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Добавляет наблюдение.
+
+        Args:
+            value: Задержка в секундах.
+        """
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def snapshot(self) -> dict:
+        """
+        Возвращает копию состояния гистограммы.
+
+        Returns:
+            Словарь с накопленными числами по границам, суммой и количеством.
+        """
+        buckets = {}
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float('inf'),), self.counts):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {'buckets': buckets, 'sum': self.total, 'count': self.count}
+
+
+class Metrics:
+    """
+    Счётчики и гистограммы вычислений калькулятора.
+
+    Метрики выключены по умолчанию. Калькулятор проверяет флаг enabled
+    перед каждым вычислением, поэтому в выключенном состоянии затраты
+    сводятся к чтению одного атрибута. Во включённом состоянии
+    вычисление выполняется через evaluate, который замеряет фазы:
+    compile (токенизация и разбор, включая обращение к кэшу),
+    evaluate (выполнение программы) и error (полное время выражений,
+    завершившихся ошибкой).
+    Фазы замеряются без блокировки, а счётчики и гистограммы
+    обновляются под ней, поэтому метрики можно собирать из нескольких
+    потоков (см. engine.Engine).
+    """
+
+    def __init__(self):
+        """Инициализирует выключенные метрики."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self) -> None:
+        """Включает сбор метрик."""
+        self.enabled = True
+
+    def disable(self) -> None:
+        """Выключает сбор метрик, сохраняя накопленные значения."""
+        self.enabled = False
+
+    def reset(self) -> None:
+        """Сбрасывает все счётчики и гистограммы."""
+        with self._lock:
+            self.phases = {phase: Histogram() for phase in METRICS_PHASES}
+            self.expressions = 0
+            self.tokens = 0
+            self.errors: dict[str, int] = {}
+            self.max_stack_depth = 0
+
+    def evaluate(self, compile_program: Callable, expression: str, evaluator=None) -> float:
+        """
+        Вычисляет выражение с замером фаз.
+
+        Args:
+            compile_program: Функция, возвращающая программу по выражению.
+            expression: Выражение в RPN формате.
+            evaluator: Переиспользуемый вычислитель или None.
+
+        Returns:
+            Числовой результат вычисления выражения.
+
+        Raises:
+            Exception: Исключение вычисления после его учёта.
+        """
+        tokens = None
+        start = perf_counter()
+        try:
+            program = compile_program(expression)
+            compiled = perf_counter()
+            tokens = program.tokens
+            result = program.eval(evaluator)
+        except Exception as e:
+            elapsed = perf_counter() - start
+            kind = error_type(e)
+            depth = 0 if tokens is None else stack_depth(tokens)
+            with self._lock:
+                self._count(tokens, depth)
+                self.phases[METRICS_PHASE_ERROR].observe(elapsed)
+                self.errors[kind] = self.errors.get(kind, 0) + 1
+            raise
+
+        finished = perf_counter()
+        depth = stack_depth(tokens)
+        with self._lock:
+            self._count(tokens, depth)
+            self.phases[METRICS_PHASE_COMPILE].observe(compiled - start)
+            self.phases[METRICS_PHASE_EVALUATE].observe(finished - compiled)
+        return result
+
+    def _count(self, tokens: tuple | None, depth: int) -> None:
+        """
+        Учитывает выражение в счётчиках; вызывается под блокировкой.
+
+        Args:
+            tokens: Токены скомпилированной программы или None,
+                если выражение не скомпилировалось.
+            depth: Наибольшая высота стека программы.
+        """
+        self.expressions += 1
+        if tokens is not None:
+            self.tokens += len(tokens)
+            if depth > self.max_stack_depth:
+                self.max_stack_depth = depth
+
+    def snapshot(self) -> dict:
+        """
+        Возвращает копию всех метрик.
+
+        Returns:
+            Словарь со счётчиками, ошибками по типам и гистограммами фаз.
+        """
+        with self._lock:
+            return {
+                'expressions': self.expressions,
+                'tokens': self.tokens,
+                'errors': dict(self.errors),
+                'max_stack_depth': self.max_stack_depth,
+                'phases': {phase: h.snapshot() for phase, h in self.phases.items()},
+            }
+
+    def export_text(self) -> str:
+        """
+        Форматирует метрики в текстовом формате Prometheus.
+
+        Returns:
+            Текст с одной метрикой на строку.
+        """
+        snapshot = self.snapshot()
+        lines = [
+            f'{METRICS_PREFIX}_expressions_total {snapshot["expressions"]}',
+            f'{METRICS_PREFIX}_tokens_total {snapshot["tokens"]}',
+            f'{METRICS_PREFIX}_max_stack_depth {snapshot["max_stack_depth"]}',
+        ]
+        for kind, count in sorted(snapshot['errors'].items()):
+            lines.append(f'{METRICS_PREFIX}_errors_total{{type="{kind}"}} {count}')
+        for phase, histogram in snapshot['phases'].items():
+            name = f'{METRICS_PREFIX}_phase_seconds'
+            for bound, count in histogram['buckets'].items():
+                le = '+Inf' if bound == float('inf') else repr(bound)
+                lines.append(f'{name}_bucket{{phase="{phase}",le="{le}"}} {count}')
+            lines.append(f'{name}_sum{{phase="{phase}"}} {histogram["sum"]!r}')
+            lines.append(f'{name}_count{{phase="{phase}"}} {histogram["count"]}')
+        lines.append('')
+        return '\n'.join(lines)
+
+    def write(self, path: str) -> None:
+        """
+        Записывает текстовый экспорт в файл.
+
+        Файл заменяется атомарно, поэтому читатель никогда
+        не видит частично записанные метрики.
+
+        Args:
+            path: Путь к файлу.
+        """
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.export_text())
+        os.replace(temp_path, path)
+
+
+# Общие метрики калькулятора
+METRICS = Metrics()
@@ -0,0 +1,332 @@
+"""Модуль числовых режимов: обычная, рациональная и десятичная арифметика."""
+import decimal
+import operator
+from collections.abc import Callable
+from fractions import Fraction
+
+from budget import Budget
+from operators import OPERATORS, Operator, OperatorRegistry, is_integer_value
+from program import ProgramCache
+from constants import *
+
+
+class NumericBackend:
+    """
+    Числовой режим калькулятора.
+
+    Определяет преобразование числовых литералов и реализации
+    встроенных операторов. Целые литералы во всех режимах остаются
+    int, и операции над двумя целыми выполняются обычной арифметикой
+    Python. Точный тип появляется только там, где без него нельзя:
+    у дробного литерала или у нецелого частного. У каждого режима
+    свой кэш скомпилированных программ и отдельный кэш программ
+    без свёртки констант для вычислений с бюджетом (см. programs).
+    """
+
+    def __init__(self, name: str, to_number: Callable[[str], object] | None,
+                 replacements: Callable[[], dict[str, Callable]]):
+        """
+        Инициализирует режим.
+
+        Args:
+            name: Имя режима.
+            to_number: Преобразование числового токена или None для int/float.
+            replacements: Функция, возвращающая реализации встроенных
+                операторов, заменяемых в этом режиме, по символам.
+        """
+        self.name = name
+        self.to_number = to_number
+        self._replacements = replacements
+        self._registry: OperatorRegistry | None = None
+        self._custom_symbols: frozenset | None = None
+        owner = None if to_number is None else self
+        self.cache = ProgramCache(DEFAULT_CACHE_SIZE, owner)
+        self.budget_cache = ProgramCache(DEFAULT_CACHE_SIZE, owner, optimize_program=False)
+
+    def __repr__(self) -> str:
+        return f'NumericBackend({self.name!r})'
+
+    def programs(self, budget: Budget | None) -> ProgramCache:
+        """
+        Возвращает кэш программ для вычислений с бюджетом или без него.
+
+        Оптимизатор выполняет операции над константами при компиляции,
+        а дорогие подвыражения берёт из общей таблицы, и бюджет
+        их не видит. Поэтому с бюджетом программы компилируются
+        без свёртки, и каждая операция учитывается при вычислении.
+
+        Args:
+            budget: Бюджет вычисления или None.
+
+        Returns:
+            Кэш программ со свёрткой констант без бюджета,
+            иначе кэш программ без свёртки.
+        """
+        return self.cache if budget is None else self.budget_cache
+
+    def operators(self) -> OperatorRegistry:
+        """
+        Возвращает реестр операторов режима.
+
+        Реестр копирует общий реестр, включая пользовательские операторы,
+        и заменяет встроенные операторы реализациями режима. Копия
+        создаётся заново только после регистрации или удаления
+        пользовательского оператора, поэтому программы режима
+        разделяют одни и те же объекты операторов.
+
+        Returns:
+            Реестр операторов.
+
+        Raises:
+            ValueError: Если режим заменяет оператор, которого нет в общем реестре.
+        """
+        if self._registry is None or self._custom_symbols is not OPERATORS.custom_symbols:
+            registry = OPERATORS.copy()
+            for symbol, func in self._replacements().items():
+                builtin = OPERATORS.get(symbol)
+                if builtin is None:
+                    raise ValueError(ERROR_UNKNOWN_OPERATOR.format(symbol))
+                registry._add_builtin(Operator(symbol, builtin.arity, func))
+            self._registry = registry
+            self._custom_symbols = OPERATORS.custom_symbols
+        return self._registry
+
+
+def _fraction_number(token: str) -> int | Fraction:
+    """
+    Преобразует числовой токен в int или Fraction.
+
+    Args:
+        token: Проверенный числовой токен.
+
+    Returns:
+        int для целых значений, иначе точная дробь.
+    """
+    if POINT not in token:
+        return int(token)
+    return _normalize(Fraction(token))
+
+
+def _normalize(value: Fraction) -> int | Fraction:
+    """
+    Возвращает целое значение дроби как int.
+
+    Args:
+        value: Дробь.
+
+    Returns:
+        int если знаменатель равен 1, иначе исходная дробь.
+    """
+    if value.denominator == 1:
+        return value.numerator
+    return value
+
+
+def _fraction_divide(a, b):
+    """
+    Делит точно, оставляя целые частные в int.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Частное: int или Fraction.
+
+    Raises:
+        ZeroDivisionError: При делении на ноль.
+    """
+    if b == 0:
+        raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+    if a.__class__ is int and b.__class__ is int:
+        if a % b == 0:
+            return a // b
+        return Fraction(a, b)
+    return _normalize(Fraction(a) / b)
+
+
+def _fraction_power(a, b):
+    """
+    Возводит в степень точно.
+
+    Args:
+        a: Основание.
+        b: Показатель степени.
+
+    Returns:
+        Степень: int или Fraction.
+
+    Raises:
+        ZeroDivisionError: Если ноль возводится в отрицательную степень.
+        ValueError: Если показатель не целый.
+    """
+    if not is_integer_value(b) and not (isinstance(b, Fraction) and b.denominator == 1):
+        raise ValueError(ERROR_EXACT_POWER)
+    b = int(b)
+    if b < 0:
+        if a == 0:
+            raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+        return _normalize(Fraction(a) ** b)
+    if a.__class__ is int:
+        return a ** b
+    return _normalize(a ** b)
+
+
+def _fraction_lift(func: Callable) -> Callable:
+    """
+    Оборачивает операцию так, чтобы целые дроби становились int.
+
+    Args:
+        func: Операция над int и Fraction.
+
+    Returns:
+        Операция с быстрым путём для двух int.
+    """
+    def call(a, b):
+        if a.__class__ is int and b.__class__ is int:
+            return func(a, b)
+        return _normalize(func(a, b))
+    return call
+
+
+def _fraction_replacements() -> dict[str, Callable]:
+    """
+    Возвращает операторы рационального режима.
+
+    Сложение, вычитание и умножение над int и Fraction точны,
+    но их целые результаты приводятся к int, чтобы последующие
+    операции (в том числе // и %) снова шли по быстрому пути.
+
+    Returns:
+        Реализации по символам операторов.
+    """
+    return {
+        OP_PLUS: _fraction_lift(operator.add),
+        OP_MINUS: _fraction_lift(operator.sub),
+        OP_MULTIPLY: _fraction_lift(operator.mul),
+        OP_DIVIDE: _fraction_divide,
+        OP_POWER: _fraction_power,
+    }
+
+
+def decimal_backend(context: decimal.Context | None = None) -> NumericBackend:
+    """
+    Создаёт десятичный режим с заданным контекстом.
+
+    Операции над Decimal выполняются методами контекста, поэтому
+    точность и округление не зависят от контекста текущего потока.
+    Операции над двумя int выполняются обычной арифметикой,
+    а деление целых без остатка даёт int.
+
+    Пример: decimal_backend(decimal.Context(prec=10, rounding=decimal.ROUND_HALF_UP)).
+
+    Args:
+        context: Контекст decimal, по умолчанию копия decimal.DefaultContext.
+
+    Returns:
+        Десятичный режим.
+    """
+    ctx = decimal.DefaultContext.copy() if context is None else context
+
+    def lift(int_func: Callable, decimal_func: Callable) -> Callable:
+        def call(a, b):
+            if a.__class__ is int and b.__class__ is int:
+                return int_func(a, b)
+            return decimal_func(a, b)
+        return call
+
+    def divide(a, b):
+        if b == 0:
+            raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+        if a.__class__ is int and b.__class__ is int and a % b == 0:
+            return a // b
+        return ctx.divide(a, b)
+
+    def power(a, b):
+        if a.__class__ is int and b.__class__ is int and b >= 0:
+            return a ** b
+        if a == 0 and b < 0:
+            raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+        return ctx.power(a, b)
+
+    def integral(func: Callable, message: str) -> Callable:
+        # // и % сохраняют семантику Python (округление вниз),
+        # поэтому целые по значению Decimal приводятся к int
+        def call(a, b):
+            if b == 0:
+                raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+            if a.__class__ is not int or b.__class__ is not int:
+                if not _is_integral_decimal(a) or not _is_integral_decimal(b):
+                    raise TypeError(message)
+                a, b = int(a), int(b)
+            return func(a, b)
+        return call
+
+    def unary(int_func: Callable, decimal_func: Callable) -> Callable:
+        def call(a):
+            if a.__class__ is int:
+                return int_func(a)
+            return decimal_func(a)
+        return call
+
+    def replacements() -> dict[str, Callable]:
+        return {
+            OP_PLUS: lift(operator.add, ctx.add),
+            OP_MINUS: lift(operator.sub, ctx.subtract),
+            OP_MULTIPLY: lift(operator.mul, ctx.multiply),
+            OP_DIVIDE: divide,
+            OP_POWER: power,
+            OP_FLOOR_DIV: integral(operator.floordiv, ERROR_INTEGER_ONLY_FLOOR_DIV),
+            OP_MOD: integral(operator.mod, ERROR_INTEGER_ONLY_MOD),
+            UNARY_MINUS_SYMBOL: unary(operator.neg, ctx.minus),
+            UNARY_PLUS_SYMBOL: unary(operator.pos, ctx.plus),
+        }
+
+    def to_number(token: str) -> int | decimal.Decimal:
+        if POINT not in token:
+            return int(token)
+        return decimal.Decimal(token)
+
+    return NumericBackend(BACKEND_DECIMAL, to_number, replacements)
+
+
+def _is_integral_decimal(value) -> bool:
+    """
+    Проверяет, является ли число целым по значению.
+
+    Args:
+        value: int или Decimal.
+
+    Returns:
+        True для int и конечных Decimal без дробной части.
+    """
+    if value.__class__ is int:
+        return True
+    return value.is_finite() and value == value.to_integral_value()
+
+
+NATIVE = NumericBackend(BACKEND_NATIVE, None, dict)
+FRACTION = NumericBackend(BACKEND_FRACTION, _fraction_number, _fraction_replacements)
+DECIMAL = decimal_backend()
+
+# Режимы по именам
+BACKENDS = {backend.name: backend for backend in (NATIVE, FRACTION, DECIMAL)}
+
+
+def backend_by_name(name: str) -> NumericBackend:
+    """
+    Возвращает числовой режим по имени.
+
+    Args:
+        name: Имя режима: native, fraction или decimal.
+
+    Returns:
+        Числовой режим.
+
+    Raises:
+        ValueError: При неизвестном имени.
+    """
+    backend = BACKENDS.get(name)
+    if backend is None:
+        raise ValueError(ERROR_UNKNOWN_BACKEND.format(name))
+    return backend
@@ -0,0 +1,109 @@
+"""
+Модуль однократного вычисления выражений из командной строки.
+
+Используется при вызове main.py -e "3 4 +" из скриптов, где запуск
+процесса стоит дороже самого вычисления. Импортирует только
+токенизатор и вычислитель: без argparse, кэша программ, оптимизатора,
+числовых режимов, метрик и справки.
+"""
+from collections.abc import Callable, Iterable
+from typing import TextIO
+
+from tokenizer import Tokenizer
+from evaluator import Evaluator
+from constants import *
+
+
+def format_result(result: float) -> str:
+    """
+    Форматирует числовой результат для отображения.
+
+    Преобразует float числа с нулевой дробной частью в int формат
+    для более читаемого вывода.
+
+    Args:
+        result: Числовой результат для форматирования.
+
+    Returns:
+        Отформатированная строка представления числа.
+    """
+    if isinstance(result, float) and result.is_integer():
+        return str(int(result))
+    elif isinstance(result, float):
+        return FLOAT_FORMAT.format(result)
+    else:
+        return str(result)
+
+
+def evaluate(expression: str) -> float:
+    """
+    Вычисляет выражение без кэша и оптимизации.
+
+    Args:
+        expression: Выражение в RPN формате.
+
+    Returns:
+        Числовой результат вычисления выражения.
+
+    Raises:
+        ValueError: При некорректном выражении.
+    """
+    return Evaluator(Tokenizer(expression).decode()).evaluate()
+
+
+def parse_expressions(argv: list[str]) -> list[str] | None:
+    """
+    Извлекает выражения из аргументов вида -e EXPR [EXPR ...] [-e EXPR ...].
+
+    Аргумент считается флагом, если начинается с минуса, не содержит
+    пробелов и не похож на отрицательное число (как в argparse).
+
+    Args:
+        argv: Аргументы командной строки без имени программы.
+
+    Returns:
+        Список выражений или None, если есть другие флаги или нет
+        ни одного выражения; тогда аргументы разбирает main.parse_args.
+    """
+    if not argv or argv[0] not in ONE_SHOT_FLAGS:
+        return None
+    expressions = []
+    for arg in argv:
+        if arg in ONE_SHOT_FLAGS:
+            continue
+        if arg[:1] == OP_MINUS and ' ' not in arg and not arg[1:2].isdigit():
+            return None
+        expressions.append(arg)
+    return expressions or None
+
+
+def run_expressions(expressions: Iterable[str], out: TextIO, err: TextIO,
+                    evaluate: Callable[[str], float] = evaluate) -> int:
+    """
+    Вычисляет выражения по одному и выводит результаты.
+
+    Результат каждого выражения выводится отдельной строкой, ошибка —
+    в поток ошибок с номером выражения; остальные выражения
+    вычисляются дальше.
+
+    Args:
+        expressions: Выражения в RPN формате.
+        out: Поток для результатов.
+        err: Поток для ошибок.
+        evaluate: Функция вычисления выражения.
+
+    Returns:
+        Код завершения: 0 без ошибок, 1 если были ошибки.
+    """
+    errors = 0
+    for number, expression in enumerate(expressions, 1):
+        try:
+            # Форматирование тоже может выбросить ошибку: целое
+            # длиннее предела преобразования в строку
+            line = format_result(evaluate(expression))
+        except Exception as e:
+            errors += 1
+            err.write(ONE_SHOT_ERROR_FORMAT.format(number, e))
+            continue
+        out.write(line + '\n')
+    return 1 if errors else 0
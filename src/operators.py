@@ -0,0 +1,318 @@
+"""Модуль реестра операторов."""
+import operator
+import re
+from collections.abc import Callable, Iterator
+
+from constants import *
+
+# Допустимые символы пользовательских операторов: слово (min, max, sqrt)
+# или последовательность знаков, не пересекающихся со встроенными.
+_WORD_SYMBOL_RE = re.compile(r'[A-Za-z_]\w*')
+_PUNCT_SYMBOL_RE = re.compile(r'[!&|^<>=?@#:;,\\`\'"]+')
+
+
+class Operator:
+    """
+    Описание оператора.
+
+    Хранит символ, арность, реализацию и необязательную проверку
+    аргументов. Проверка и реализация объединяются в один вызываемый
+    объект call при создании оператора, поэтому при вычислении оператор
+    вызывается напрямую, без поиска и ветвлений.
+    """
+
+    __slots__ = ('symbol', 'arity', 'func', 'validate', 'call', 'pure', 'builtin')
+
+    def __init__(self, symbol: str, arity: int, func: Callable,
+                 validate: Callable | None = None, pure: bool = True):
+        """
+        Инициализирует оператор.
+
+        Args:
+            symbol: Символ оператора в выражении.
+            arity: Число аргументов: 1 или 2.
+            func: Реализация оператора.
+            validate: Проверка аргументов, вызывается перед реализацией
+                с теми же аргументами и выбрасывает исключение при ошибке.
+            pure: Результат зависит только от аргументов, поэтому
+                оператор над константами можно вычислить при компиляции.
+
+        Raises:
+            ValueError: При некорректной арности.
+        """
+        if arity not in (1, 2):
+            raise ValueError(ERROR_INVALID_ARITY.format(arity))
+        self.symbol = symbol
+        self.arity = arity
+        self.func = func
+        self.validate = validate
+        self.pure = pure
+        self.builtin = False
+        self.call = self._bind(arity, func, validate)
+
+    def __repr__(self) -> str:
+        return f'Operator({self.symbol!r}, {self.arity})'
+
+    @staticmethod
+    def _bind(arity: int, func: Callable, validate: Callable | None) -> Callable:
+        """
+        Объединяет проверку и реализацию в один вызываемый объект.
+
+        Args:
+            arity: Число аргументов.
+            func: Реализация оператора.
+            validate: Проверка аргументов или None.
+
+        Returns:
+            Вызываемый объект, выполняющий проверку и операцию.
+        """
+        if validate is None:
+            return func
+
+        if arity == 1:
+            def call_unary(a):
+                validate(a)
+                return func(a)
+            return call_unary
+
+        def call_binary(a, b):
+            validate(a, b)
+            return func(a, b)
+        return call_binary
+
+
+class OperatorRegistry:
+    """
+    Реестр операторов калькулятора.
+
+    Сопоставляет символам операторы. Токенизатор и вычислитель
+    используют реестр для распознавания и выполнения операторов,
+    поэтому пользовательские операторы работают так же быстро,
+    как встроенные.
+    """
+
+    def __init__(self):
+        """Инициализирует пустой реестр."""
+        self._operators = {}
+        self.custom_symbols = frozenset()
+
+    def register(self, symbol: str, arity: int, func: Callable,
+                 validate: Callable | None = None, pure: bool = True) -> Operator:
+        """
+        Регистрирует пользовательский оператор.
+
+        Символ должен быть словом (min, max, sqrt) или последовательностью
+        знаков, не используемых встроенными операторами (например, ^ или &&).
+
+        Args:
+            symbol: Символ оператора.
+            arity: Число аргументов: 1 или 2.
+            func: Реализация оператора.
+            validate: Необязательная проверка аргументов.
+            pure: Оператор без побочных эффектов, допускающий
+                вычисление над константами при компиляции.
+
+        Returns:
+            Зарегистрированный оператор.
+
+        Raises:
+            ValueError: При некорректном или уже занятом символе.
+        """
+        if symbol in self._operators:
+            raise ValueError(ERROR_OPERATOR_EXISTS.format(symbol))
+        if not (_WORD_SYMBOL_RE.fullmatch(symbol) or _PUNCT_SYMBOL_RE.fullmatch(symbol)):
+            raise ValueError(ERROR_INVALID_OPERATOR_SYMBOL.format(symbol))
+
+        op = Operator(symbol, arity, func, validate, pure)
+        self._operators[symbol] = op
+        self.custom_symbols = self.custom_symbols | {symbol}
+        return op
+
+    def unregister(self, symbol: str) -> None:
+        """
+        Удаляет пользовательский оператор.
+
+        Args:
+            symbol: Символ оператора.
+
+        Raises:
+            ValueError: Если оператор не зарегистрирован или встроенный.
+        """
+        if symbol not in self.custom_symbols:
+            raise ValueError(ERROR_UNKNOWN_OPERATOR.format(symbol))
+        del self._operators[symbol]
+        self.custom_symbols = self.custom_symbols - {symbol}
+
+    def get(self, symbol) -> Operator | None:
+        """
+        Возвращает оператор по символу.
+
+        Args:
+            symbol: Символ оператора.
+
+        Returns:
+            Оператор или None, если символ не является оператором.
+        """
+        return self._operators.get(symbol)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._operators
+
+    def __iter__(self) -> Iterator[Operator]:
+        return iter(self._operators.values())
+
+    def copy(self) -> 'OperatorRegistry':
+        """
+        Создаёт копию реестра.
+
+        Returns:
+            Новый реестр с теми же операторами.
+        """
+        registry = OperatorRegistry()
+        registry._operators = dict(self._operators)
+        registry.custom_symbols = self.custom_symbols
+        return registry
+
+    def _add_builtin(self, op: Operator) -> None:
+        """
+        Добавляет или заменяет встроенный оператор.
+
+        Args:
+            op: Оператор.
+        """
+        op.builtin = True
+        self._operators[op.symbol] = op
+
+
+def is_integer_value(num: float) -> bool:
+    """
+    Проверяет, является ли число целым по значению.
+
+    Учитывает float числа вида 5.0 как целые.
+
+    Args:
+        num: Число для проверки.
+
+    Returns:
+        True если число является целым по значению.
+    """
+    if isinstance(num, int):
+        return True
+    if isinstance(num, float):
+        return num.is_integer()
+    return False
+
+
+def divide(a: float, b: float) -> float:
+    """
+    Выполняет деление с проверкой делителя.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Частное.
+
+    Raises:
+        ZeroDivisionError: При делении на ноль.
+    """
+    if b == 0:
+        raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+    return a / b
+
+
+def floor_divide(a: float, b: float) -> float:
+    """
+    Выполняет целочисленное деление с проверкой аргументов.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Целая часть частного.
+
+    Raises:
+        ZeroDivisionError: При делении на ноль.
+        TypeError: Если аргументы не целые по значению.
+    """
+    if b == 0:
+        raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+    if not is_integer_value(a) or not is_integer_value(b):
+        raise TypeError(ERROR_INTEGER_ONLY_FLOOR_DIV)
+    return a // b
+
+
+def modulo(a: float, b: float) -> float:
+    """
+    Вычисляет остаток от деления с проверкой аргументов.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Остаток от деления.
+
+    Raises:
+        ZeroDivisionError: При делении на ноль.
+        TypeError: Если аргументы не целые по значению.
+    """
+    if b == 0:
+        raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+    if not is_integer_value(a) or not is_integer_value(b):
+        raise TypeError(ERROR_INTEGER_ONLY_MOD)
+    return a % b
+
+
+def _make_default_registry() -> OperatorRegistry:
+    """
+    Создаёт реестр со встроенными операторами.
+
+    Returns:
+        Реестр встроенных операторов.
+    """
+    # Проверки аргументов встроенных операторов выполняются внутри
+    # реализации, чтобы не тратить лишний вызов на каждую операцию
+    registry = OperatorRegistry()
+    for op in (
+        Operator(OP_PLUS, 2, operator.add),
+        Operator(OP_MINUS, 2, operator.sub),
+        Operator(OP_MULTIPLY, 2, operator.mul),
+        Operator(OP_DIVIDE, 2, divide),
+        Operator(OP_POWER, 2, operator.pow),
+        Operator(OP_FLOOR_DIV, 2, floor_divide),
+        Operator(OP_MOD, 2, modulo),
+        Operator(UNARY_PLUS_SYMBOL, 1, operator.pos),
+        Operator(UNARY_MINUS_SYMBOL, 1, operator.neg),
+    ):
+        registry._add_builtin(op)
+    return registry
+
+
+# Реестр по умолчанию, общий для токенизатора и вычислителя
+OPERATORS = _make_default_registry()
+
+
+def register_operator(symbol: str, arity: int, func: Callable,
+                      validate: Callable | None = None, pure: bool = True) -> Operator:
+    """
+    Регистрирует пользовательский оператор в реестре по умолчанию.
+
+    Пример: register_operator('max', 2, max).
+
+    Args:
+        symbol: Символ оператора.
+        arity: Число аргументов: 1 или 2.
+        func: Реализация оператора.
+        validate: Необязательная проверка аргументов.
+        pure: Оператор без побочных эффектов.
+
+    Returns:
+        Зарегистрированный оператор.
+
+    Raises:
+        ValueError: При некорректном или уже занятом символе.
+    """
+    return OPERATORS.register(symbol, arity, func, validate, pure)
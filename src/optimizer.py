@@ -0,0 +1,173 @@
+"""Модуль оптимизации скомпилированных RPN программ."""
+from collections.abc import Sequence
+
+from budget import estimate
+from evaluator import Subexpression
+from operators import Operator
+from constants import *
+
+
+class _Value:
+    """
+    Значение на стеке оптимизатора.
+
+    Константа хранит вычисленное число, вычисляемое при выполнении
+    значение хранит последовательность токенов, которая его вычисляет.
+    Чистое значение зависит только от констант и чистых операторов.
+    """
+
+    __slots__ = ('code', 'const', 'pure')
+
+    def __init__(self, code: list, const: bool, pure: bool | None = None):
+        self.code = code
+        self.const = const
+        self.pure = const if pure is None else pure
+
+    def sealed(self) -> list:
+        """
+        Возвращает код значения, заменяя чистое подвыражение одним токеном.
+
+        Returns:
+            Код, в котором вычисляемое чистое значение свёрнуто
+            в Subexpression.
+        """
+        code = self.code
+        if not self.pure or self.const or (len(code) == 1 and code[0].__class__ is Subexpression):
+            return code
+        return [Subexpression(tuple(code))]
+
+
+def optimize(tokens: Sequence) -> tuple[tuple, int]:
+    """
+    Сворачивает константы и упрощает программу.
+
+    Проход повторяет работу стековой машины над токенами программы:
+    1. Оператор, все аргументы которого являются константами,
+       вычисляется сразу и заменяется результатом.
+    2. Унарный плюс удаляется, а два унарных минуса подряд
+       сокращаются.
+    3. Скобки удаляются: после проверки, что каждая группа даёт
+       ровно одно значение, они не влияют на результат.
+    Операции над большими целыми (см. budget.estimate) не сворачиваются,
+    чтобы не повторять их при компиляции каждого выражения. Вместо этого такая
+    операция, содержащие её группы в скобках и наибольшее чистое
+    подвыражение заменяются токенами Subexpression, значения которых
+    при вычислении берутся из общей таблицы (см. program.SubexpressionMemo).
+    Свёрнутые операции и значения из таблицы бюджет не учитывает,
+    поэтому программы для вычислений с бюджетом не оптимизируются
+    (см. NumericBackend.programs).
+
+    Поведение при ошибках сохраняется. Если операция над константами
+    выбрасывает исключение (например, деление на ноль), она и всё,
+    что за ней следует, остаются в программе, и ошибка возникает
+    при вычислении. При структурной ошибке (нехватка операндов,
+    лишние операнды в скобках или в конце) программа возвращается
+    без изменений, чтобы вычислитель выдал ту же ошибку.
+
+    Args:
+        tokens: Токены программы: числа, объекты Operator, скобки и имена.
+
+    Returns:
+        Пара из оптимизированных токенов и числа удалённых операций.
+    """
+    stack: list = []
+    frames: list[int] = []
+    base = 0
+    removed = 0
+    folding = True
+
+    for token in tokens:
+        if token.__class__ is Operator:
+            if len(stack) - base < token.arity:
+                return tuple(tokens), 0
+            args = stack[-token.arity:]
+            del stack[-token.arity:]
+
+            pure = folding and token.pure and all(a.pure for a in args)
+            if pure and all(a.const for a in args):
+                if not _cheap(token, args):
+                    code = [a.code[0] for a in args]
+                    code.append(token)
+                    stack.append(_Value([Subexpression(tuple(code))], False, True))
+                    continue
+                try:
+                    value = token.call(*(a.code[0] for a in args))
+                except Exception:
+                    # Ошибка должна возникнуть при вычислении, а операции
+                    # после неё никогда не выполняются
+                    folding = pure = False
+                else:
+                    if not isinstance(value, str):
+                        stack.append(_Value([value], True))
+                        removed += 1
+                        continue
+
+            if folding and token.builtin and token.arity == 1:
+                arg = args[0]
+                if token.symbol == UNARY_PLUS_SYMBOL:
+                    stack.append(arg)
+                    removed += 1
+                    continue
+                last = arg.code[-1]
+                if (token.symbol == UNARY_MINUS_SYMBOL and last.__class__ is Operator
+                        and last.builtin and last.symbol == UNARY_MINUS_SYMBOL):
+                    arg.code.pop()
+                    stack.append(arg)
+                    removed += 2
+                    continue
+
+            if pure:
+                # Аргументы сняты со стека, поэтому код первого из них
+                # можно дополнить на месте
+                code = args[0].code
+                if token.arity == 2:
+                    code.extend(args[1].code)
+            else:
+                # Чистые аргументы нечистой операции становятся подвыражениями
+                code = args[0].sealed()
+                if token.arity == 2:
+                    code.extend(args[1].sealed())
+            code.append(token)
+            stack.append(_Value(code, False, pure))
+        elif token == OPENING_BRACKET:
+            frames.append(base)
+            base = len(stack)
+        elif token == CLOSING_BRACKET:
+            if not frames or len(stack) - base != 1:
+                return tuple(tokens), 0
+            base = frames.pop()
+            value = stack[-1]
+            if value.pure and not value.const:
+                # Чистая группа в скобках запоминается отдельно от
+                # содержащего её выражения
+                value.code = value.sealed()
+        elif isinstance(token, str):
+            stack.append(_Value([token], False))
+        else:
+            stack.append(_Value([token], True))
+
+    if frames or len(stack) != 1:
+        return tuple(tokens), 0
+
+    return tuple(stack[0].sealed()), removed
+
+
+def _cheap(op: Operator, args: list[_Value]) -> bool:
+    """
+    Проверяет, что операцию над константами можно выполнить при компиляции.
+
+    Операции над большими целыми выполняются при вычислении, где их
+    значения берутся из таблицы подвыражений, а не повторяются
+    при компиляции каждого выражения пакета.
+
+    Args:
+        op: Оператор.
+        args: Константные аргументы.
+
+    Returns:
+        True если оценка размера и стоимости в пределах свёртки.
+    """
+    if op.arity != 2:
+        return True
+    bits, cost = estimate(op.symbol, args[0].code[0], args[1].code[0])
+    return bits <= FOLD_MAX_RESULT_BITS and cost <= FOLD_MAX_COST
@@ -0,0 +1,113 @@
+"""Модуль параллельного вычисления файлов с выражениями."""
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from budget import Budget
+from buffers import evaluate_buffer
+from calculator import Calculator
+from constants import *
+
+
+def evaluate_file_parallel(path: str, workers: int | None = None,
+                           chunk_size: int = PARALLEL_CHUNK_SIZE) -> Iterator[float | Exception | None]:
+    """
+    Вычисляет файл с выражениями в пуле процессов.
+
+    Файл делится на блоки примерно по chunk_size байт с границами
+    на концах строк. Каждый процесс сам читает свой блок из файла
+    и возвращает результаты всего блока одним пакетом. Одновременно
+    в работе находится ограниченное число блоков, поэтому память
+    не зависит от размера файла. Рабочие процессы получают текущие
+    настройки калькулятора: числовой режим, бюджет, типизированный
+    стек и проверку структуры.
+
+    Args:
+        path: Путь к файлу, по одному выражению на строку.
+        workers: Число процессов, по умолчанию число ядер.
+        chunk_size: Размер блока в байтах.
+
+    Yields:
+        Результат для каждой строки в исходном порядке: число,
+        исключение при ошибке или None для пустой строки.
+
+    Raises:
+        ValueError: При некорректном числе процессов или размере блока.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(ERROR_INVALID_WORKERS.format(workers))
+    if chunk_size < 1:
+        raise ValueError(ERROR_INVALID_CHUNK_SIZE.format(chunk_size))
+
+    settings = (Calculator.get_backend().name, Calculator.get_budget(),
+                Calculator.get_float_stack(), Calculator.get_validation())
+    with ProcessPoolExecutor(max_workers=workers, initializer=_configure_worker,
+                             initargs=settings) as executor:
+        pending: deque[Future[list[float | Exception | None]]] = deque()
+        for start, end in _chunk_bounds(path, chunk_size):
+            pending.append(executor.submit(_evaluate_chunk, path, start, end))
+            if len(pending) >= workers * PARALLEL_CHUNKS_PER_WORKER:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _configure_worker(backend: str, budget: Budget | None, float_stack: bool,
+                      validate: bool) -> None:
+    """
+    Настраивает калькулятор в рабочем процессе.
+
+    Args:
+        backend: Имя числового режима.
+        budget: Бюджет вычислений или None.
+        float_stack: Вычислять float выражения на типизированном стеке.
+        validate: Проверять структуру строк до вычисления.
+    """
+    Calculator.configure_backend(backend)
+    Calculator.configure_budget(budget)
+    Calculator.configure_float_stack(float_stack)
+    Calculator.configure_validation(validate)
+
+
+def _chunk_bounds(path: str, chunk_size: int) -> Iterator[tuple[int, int]]:
+    """
+    Делит файл на блоки, выровненные по границам строк.
+
+    Args:
+        path: Путь к файлу.
+        chunk_size: Желаемый размер блока в байтах.
+
+    Yields:
+        Пары смещений (начало, конец) каждого блока.
+    """
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(start + chunk_size)
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def _evaluate_chunk(path: str, start: int, end: int) -> list[float | Exception | None]:
+    """
+    Вычисляет выражения одного блока файла в процессе пула.
+
+    Args:
+        path: Путь к файлу.
+        start: Смещение начала блока.
+        end: Смещение конца блока.
+
+    Returns:
+        Результаты для каждой строки блока.
+    """
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    return list(evaluate_buffer(data, return_exceptions=True))
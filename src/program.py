@@ -0,0 +1,403 @@
+"""Модуль скомпилированных RPN программ и их кэша."""
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Literal, NamedTuple
+
+from tokenizer import Tokenizer
+from budget import Budget
+from codegen import generate
+from evaluator import Evaluator, Subexpression
+from optimizer import optimize
+from constants import *
+
+
+class Program:
+    """
+    Скомпилированное RPN выражение.
+
+    Хранит уже разобранные токены, в которых числовые литералы
+    преобразованы в int или float, а операторы заменены объектами
+    Operator из реестра. Повторное вычисление программы
+    не требует ни токенизации, ни разбора чисел.
+    Объект неизменяем и может переиспользоваться сколько угодно раз.
+
+    Программа считает свои вычисления без бюджета. После порога
+    (см. configure_tiering) для неё генерируется Python функция
+    (см. codegen.generate), которая дальше вычисляет программу
+    без стека и разбора токенов с теми же результатами и ошибками.
+    Счётчик и функция — внутреннее состояние и на результат не влияют:
+    при вычислении из нескольких потоков счётчик может потерять
+    увеличение, а функция — сгенерироваться дважды.
+    """
+
+    __slots__ = ('_expression', '_tokens', '_removed', '_calls', '_code')
+
+    _expression: str
+    _tokens: tuple
+    _removed: int
+    _calls: int
+    _code: Callable | Literal[False] | None
+
+    # Число вычислений, после которого генерируется функция; 0 отключает генерацию
+    _tier_threshold = DEFAULT_TIER_THRESHOLD
+
+    def __init__(self, expression: str, tokens: tuple, removed: int = 0):
+        """
+        Инициализирует программу.
+
+        Args:
+            expression: Исходное выражение в RPN формате.
+            tokens: Кортеж токенов с уже преобразованными числами и операторами.
+            removed: Число операций, удалённых оптимизатором.
+        """
+        object.__setattr__(self, '_expression', expression)
+        object.__setattr__(self, '_tokens', tokens)
+        object.__setattr__(self, '_removed', removed)
+        object.__setattr__(self, '_calls', 0)
+        object.__setattr__(self, '_code', None)
+
+    def __setattr__(self, name: str, value) -> None:
+        raise AttributeError(ERROR_PROGRAM_IMMUTABLE)
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(ERROR_PROGRAM_IMMUTABLE)
+
+    def __repr__(self) -> str:
+        return f'Program({self._expression!r})'
+
+    @property
+    def expression(self) -> str:
+        """Исходное выражение."""
+        return self._expression
+
+    @property
+    def tokens(self) -> tuple:
+        """Токены программы с уже преобразованными числами и операторами."""
+        return self._tokens
+
+    @property
+    def removed_operations(self) -> int:
+        """Число операций, свёрнутых или удалённых при компиляции."""
+        return self._removed
+
+    @property
+    def tiered(self) -> bool:
+        """Программа вычисляется сгенерированной функцией."""
+        return bool(self._code)
+
+    @classmethod
+    def configure_tiering(cls, threshold: int) -> None:
+        """
+        Задаёт число вычислений, после которого генерируется функция.
+
+        Args:
+            threshold: Порог, 0 отключает сгенерированные функции.
+
+        Raises:
+            ValueError: Если порог не является неотрицательным целым.
+        """
+        if not isinstance(threshold, int) or threshold < 0:
+            raise ValueError(ERROR_INVALID_TIER_THRESHOLD.format(threshold))
+        cls._tier_threshold = threshold
+
+    def eval(self, evaluator: Evaluator | None = None, budget: Budget | None = None,
+             memo: 'SubexpressionMemo | None' = None) -> float:
+        """
+        Вычисляет значение программы.
+
+        Args:
+            evaluator: Переиспользуемый вычислитель. Если не задан,
+                создаётся новый.
+            budget: Бюджет для нового вычислителя; переиспользуемый
+                вычислитель использует свой бюджет.
+            memo: Таблица подвыражений для нового вычислителя.
+
+        Returns:
+            Числовой результат вычисления выражения.
+
+        Raises:
+            ValueError: При некорректном выражении.
+        """
+        if evaluator is None:
+            evaluator = Evaluator(self._tokens, budget=budget, memo=memo)
+        else:
+            evaluator.reset(self._tokens)
+
+        # Бюджет проверяется только вычислителем
+        if evaluator.budget is None and self._tier_threshold:
+            code = self._code
+            if code is None:
+                code = self._count()
+            if code:
+                return code(evaluator._subexpression)
+        return evaluator.evaluate()
+
+    def _count(self) -> Callable | Literal[False] | None:
+        """
+        Учитывает вычисление и генерирует функцию при достижении порога.
+
+        Returns:
+            Сгенерированная функция, False если программу нельзя
+            сгенерировать, или None до достижения порога.
+        """
+        calls = self._calls + 1
+        object.__setattr__(self, '_calls', calls)
+        if calls < self._tier_threshold:
+            return None
+        code: Callable | Literal[False] = generate(self._tokens) or False
+        object.__setattr__(self, '_code', code)
+        return code
+
+
+def compile_expression(expression: str, optimize_program: bool = True,
+                       backend=None) -> Program:
+    """
+    Компилирует RPN выражение в программу.
+
+    Args:
+        expression: Выражение в RPN формате.
+        optimize_program: Свернуть константы и удалить лишние
+            операции и скобки (см. optimizer.optimize).
+        backend: Числовой режим (см. numeric.NumericBackend),
+            по умолчанию обычная арифметика Python.
+
+    Returns:
+        Скомпилированная программа.
+
+    Raises:
+        ValueError: При ошибках токенизации.
+    """
+    if backend is None:
+        decoded = Tokenizer(expression).decode()
+    else:
+        decoded = Tokenizer(expression, operators=backend.operators()).decode(backend.to_number)
+
+    if optimize_program:
+        return Program(expression, *optimize(decoded))
+    return Program(expression, tuple(decoded))
+
+
+# Признак отсутствующего значения в LRU таблице
+_MISSING = object()
+
+
+class CacheInfo(NamedTuple):
+    """Статистика кэша программ или таблицы подвыражений."""
+
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Доля попаданий среди всех обращений, 0.0 без обращений."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _LRUTable:
+    """
+    Основа LRU кэшей: хранение, вытеснение и счётчики.
+
+    Размер 0 отключает хранение: каждое значение вычисляется заново.
+
+    Таблицу можно использовать из нескольких потоков. Добавление,
+    вытеснение и очистка выполняются под блокировкой, а значения
+    вычисляются вне её. Попадание блокировку не берёт: чтение
+    и перенос ключа в конец — отдельные атомарные операции OrderedDict,
+    и ключ, вытесненный другим потоком между ними, просто не переносится.
+    Счётчики попаданий и промахов при этом могут потерять увеличение.
+    """
+
+    def __init__(self, maxsize: int):
+        """
+        Инициализирует пустую таблицу.
+
+        Args:
+            maxsize: Максимальное число хранимых значений.
+
+        Raises:
+            ValueError: Если размер отрицательный.
+        """
+        self._entries: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = self._check_size(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _store(self, key, value) -> None:
+        """
+        Сохраняет значение, вытесняя самое давнее при переполнении.
+
+        Args:
+            key: Ключ.
+            value: Значение.
+        """
+        if self._maxsize:
+            with self._lock:
+                self._entries[key] = value
+                if len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+
+    def resize(self, maxsize: int) -> None:
+        """
+        Меняет максимальный размер, вытесняя лишние значения.
+
+        Args:
+            maxsize: Новый максимальный размер.
+
+        Raises:
+            ValueError: Если размер отрицательный.
+        """
+        maxsize = self._check_size(maxsize)
+        with self._lock:
+            self._maxsize = maxsize
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Очищает таблицу и сбрасывает счётчики."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def info(self) -> CacheInfo:
+        """
+        Возвращает статистику таблицы.
+
+        Returns:
+            Счётчики попаданий, промахов и вытеснений, а также размеры.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self._maxsize, len(self._entries))
+
+    @staticmethod
+    def _check_size(maxsize: int) -> int:
+        """
+        Проверяет корректность размера кэша.
+
+        Args:
+            maxsize: Размер для проверки.
+
+        Returns:
+            Проверенный размер.
+
+        Raises:
+            ValueError: Если размер не является неотрицательным целым.
+        """
+        if not isinstance(maxsize, int) or maxsize < 0:
+            raise ValueError(ERROR_INVALID_CACHE_SIZE.format(maxsize))
+        return maxsize
+
+
+class ProgramCache(_LRUTable):
+    """
+    LRU кэш скомпилированных программ.
+
+    Ключом служит исходная строка выражения. Размер 0 отключает кэш:
+    каждое выражение компилируется заново.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, backend=None,
+                 optimize_program: bool = True):
+        """
+        Инициализирует кэш.
+
+        Args:
+            maxsize: Максимальное число хранимых программ.
+            backend: Числовой режим, в котором компилируются программы.
+            optimize_program: Компилировать программы со свёрткой констант
+                (см. compile_expression).
+
+        Raises:
+            ValueError: Если размер отрицательный.
+        """
+        super().__init__(maxsize)
+        self._backend = backend
+        self._optimize = optimize_program
+
+    def get(self, expression: str) -> Program:
+        """
+        Возвращает программу для выражения, компилируя её при промахе.
+
+        Args:
+            expression: Выражение в RPN формате.
+
+        Returns:
+            Скомпилированная программа.
+
+        Raises:
+            ValueError: При ошибках токенизации.
+        """
+        entries = self._entries
+        program = entries.get(expression)
+        if program is not None:
+            self.hits += 1
+            try:
+                entries.move_to_end(expression)
+            except KeyError:
+                pass
+            return program
+
+        self.misses += 1
+        program = compile_expression(expression, self._optimize, self._backend)
+        self._store(expression, program)
+        return program
+
+
+class SubexpressionMemo(_LRUTable):
+    """
+    LRU таблица значений подвыражений.
+
+    Ключом служит подвыражение (см. evaluator.Subexpression), поэтому
+    одинаковые дорогие подвыражения в одном выражении и в разных
+    выражениях пакета вычисляются один раз. Ошибки вычисления
+    не запоминаются.
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_MEMO_SIZE):
+        """
+        Инициализирует таблицу.
+
+        Args:
+            maxsize: Максимальное число хранимых значений.
+
+        Raises:
+            ValueError: Если размер отрицательный.
+        """
+        super().__init__(maxsize)
+
+    def get(self, subexpression: Subexpression, compute: Callable[[Subexpression], object]):
+        """
+        Возвращает значение подвыражения, вычисляя его при промахе.
+
+        Args:
+            subexpression: Подвыражение.
+            compute: Функция, вычисляющая подвыражение.
+
+        Returns:
+            Значение подвыражения.
+        """
+        entries = self._entries
+        value = entries.get(subexpression, _MISSING)
+        if value is not _MISSING:
+            self.hits += 1
+            try:
+                entries.move_to_end(subexpression)
+            except KeyError:
+                pass
+            return value
+
+        self.misses += 1
+        value = compute(subexpression)
+        self._store(subexpression, value)
+        return value
@@ -0,0 +1,266 @@
+"""Модуль сервера вычислений с построчным протоколом."""
+import argparse
+import asyncio
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+
+from budget import Budget
+from calculator import Calculator
+from evaluator import Subexpression
+from oneshot import format_result
+from operators import OPERATORS, Operator
+from constants import *
+
+# Операторы, время которых растёт с размером целых аргументов
+_HEAVY_SYMBOLS = frozenset((OP_POWER, OP_MULTIPLY, OP_FLOOR_DIV, OP_MOD))
+
+
+def respond(expression: str) -> str:
+    """
+    Вычисляет выражение и форматирует строку ответа.
+
+    Args:
+        expression: Выражение в RPN формате.
+
+    Returns:
+        Строка ответа: OK с результатом или ERR с текстом ошибки.
+    """
+    try:
+        return SERVER_RESULT_FORMAT.format(format_result(Calculator(expression).eval()))
+    except Exception as e:
+        return SERVER_ERROR_FORMAT.format(e)
+
+
+def is_fast(expression: str) -> bool:
+    """
+    Проверяет, можно ли вычислить выражение прямо в цикле событий.
+
+    Выражение компилируется (с обращением к кэшу программ), и
+    оптимизатор заранее вычисляет дешёвые операции над константами.
+    Дорогие операции над константами (например, степень с большим
+    результатом) оптимизатор оставляет подвыражениями, а **, *, //
+    и % над вычисляемыми значениями — операторами; такие выражения
+    медленные. Пользовательские операторы также считаются медленными.
+    Выражения с ошибкой компиляции быстрые: ошибка выдаётся
+    без вычисления.
+
+    Args:
+        expression: Выражение в RPN формате.
+
+    Returns:
+        True, если вычисление не заблокирует цикл событий.
+    """
+    if len(expression) > SERVER_INLINE_LENGTH:
+        return False
+    try:
+        program = Calculator.compile(expression)
+    except Exception:
+        return True
+    custom = OPERATORS.custom_symbols
+    for t in program.tokens:
+        if t.__class__ is Subexpression:
+            return False
+        if t.__class__ is Operator and (t.symbol in _HEAVY_SYMBOLS or t.symbol in custom):
+            return False
+    return True
+
+
+async def handle_connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                            executor: Executor | None = None,
+                            pipeline_depth: int = SERVER_PIPELINE_DEPTH) -> None:
+    """
+    Обслуживает одно соединение.
+
+    Каждая строка запроса — одно выражение, на каждую строку
+    отправляется одна строка ответа в порядке запросов. Клиент может
+    отправлять запросы, не дожидаясь ответов. Быстрые выражения
+    вычисляются сразу, медленные передаются исполнителю, поэтому
+    цикл событий не блокируется. Не более pipeline_depth ответов
+    ожидают отправки: когда очередь заполнена, чтение соединения
+    приостанавливается, и клиент упирается в буферы сокета.
+
+    Args:
+        reader: Поток чтения соединения.
+        writer: Поток записи соединения.
+        executor: Исполнитель медленных выражений, по умолчанию
+            исполнитель цикла событий.
+        pipeline_depth: Предельное число ответов в очереди отправки.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue[str | asyncio.Future[str] | None] = asyncio.Queue(pipeline_depth)
+    sender = asyncio.create_task(_send_responses(queue, writer))
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Строка длиннее предела потока: дальнейший поток не разобрать
+                await queue.put(SERVER_ERROR_FORMAT.format(ERROR_LINE_TOO_LONG.format(SERVER_LINE_LIMIT)))
+                break
+            except ConnectionError:
+                break
+            if not line:
+                break
+
+            try:
+                expression = line.decode('utf-8')
+            except UnicodeDecodeError as e:
+                await queue.put(SERVER_ERROR_FORMAT.format(e))
+                continue
+
+            if is_fast(expression):
+                await queue.put(respond(expression))
+            else:
+                await queue.put(loop.run_in_executor(executor, respond, expression))
+    finally:
+        await queue.put(None)
+        await sender
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def _send_responses(queue: asyncio.Queue, writer: asyncio.StreamWriter) -> None:
+    """
+    Отправляет ответы в порядке запросов.
+
+    Запись ждёт, пока буфер сокета выше верхней границы, поэтому
+    клиент, не читающий ответы, останавливает и чтение запросов
+    (через заполненную очередь). Если клиент
+    отключился, оставшиеся ответы извлекаются из очереди без
+    отправки, чтобы чтение не ждало места в очереди.
+
+    Args:
+        queue: Очередь строк ответов и будущих результатов, None — конец.
+        writer: Поток записи соединения.
+    """
+    connected = True
+    while True:
+        response = await queue.get()
+        if response is None:
+            return
+        if not connected:
+            if not isinstance(response, str):
+                response.cancel()
+            continue
+
+        if not isinstance(response, str):
+            try:
+                response = await response
+            except Exception as e:
+                # Например, рабочий процесс исполнителя аварийно завершился
+                response = SERVER_ERROR_FORMAT.format(e)
+        try:
+            writer.write(response.encode('utf-8'))
+            await writer.drain()
+        except ConnectionError:
+            connected = False
+
+
+async def start_server(host: str = SERVER_HOST, port: int = SERVER_PORT,
+                       path: str | None = None,
+                       executor: Executor | None = None) -> asyncio.Server:
+    """
+    Запускает сервер на TCP порту или Unix сокете.
+
+    Пример: server = await start_server(port=0); server.sockets[0].getsockname().
+
+    Args:
+        host: Адрес TCP сервера.
+        port: Порт TCP сервера, 0 — любой свободный.
+        path: Путь Unix сокета; если задан, host и port не используются.
+        executor: Исполнитель медленных выражений, по умолчанию
+            исполнитель цикла событий.
+
+    Returns:
+        Запущенный сервер asyncio.
+    """
+    handler = partial(handle_connection, executor=executor)
+    if path is not None:
+        return await asyncio.start_unix_server(handler, path, limit=SERVER_LINE_LIMIT)
+    return await asyncio.start_server(handler, host, port, limit=SERVER_LINE_LIMIT)
+
+
+def _configure_worker(backend: str, budget: Budget | None) -> None:
+    """
+    Настраивает калькулятор в рабочем процессе.
+
+    Args:
+        backend: Имя числового режима.
+        budget: Бюджет вычислений или None.
+    """
+    Calculator.configure_backend(backend)
+    Calculator.configure_budget(budget)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """
+    Разбирает аргументы командной строки.
+
+    Args:
+        argv: Список аргументов, по умолчанию sys.argv[1:].
+
+    Returns:
+        Разобранные аргументы.
+    """
+    parser = argparse.ArgumentParser(description='Сервер вычислений RPN калькулятора')
+    parser.add_argument('--host', default=SERVER_HOST, help='адрес TCP сервера')
+    parser.add_argument('--port', type=int, default=SERVER_PORT, help='порт TCP сервера')
+    parser.add_argument('--unix', help='путь Unix сокета вместо TCP')
+    parser.add_argument('-j', '--workers', type=int,
+                        help='число процессов для медленных выражений, по умолчанию число ядер')
+    parser.add_argument('--backend', choices=BACKEND_NAMES, default=BACKEND_NATIVE,
+                        help='числовой режим')
+    parser.add_argument('--budget', action='store_true',
+                        help='ограничить размер и стоимость операций над большими целыми')
+    parser.add_argument('--timeout', type=float,
+                        help='предельное время вычисления выражения в секундах (включает --budget)')
+    return parser.parse_args(argv)
+
+
+async def _serve(args: argparse.Namespace) -> None:
+    """
+    Запускает сервер и обслуживает соединения до остановки.
+
+    Args:
+        args: Разобранные аргументы командной строки.
+    """
+    budget = None
+    if args.budget or args.timeout is not None:
+        budget = Budget(timeout=args.timeout)
+    _configure_worker(args.backend, budget)
+
+    with ProcessPoolExecutor(args.workers, initializer=_configure_worker,
+                             initargs=(args.backend, budget)) as executor:
+        # Рабочие процессы запускаются до открытия сокета, иначе при
+        # fork они унаследуют дескрипторы соединений, и клиенты
+        # не увидят их закрытия
+        await asyncio.get_running_loop().run_in_executor(executor, int)
+        server = await start_server(args.host, args.port, args.unix, executor)
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv: list[str] | None = None) -> int:
+    """
+    Запускает сервер вычислений.
+
+    Args:
+        argv: Список аргументов командной строки.
+
+    Returns:
+        Код завершения программы.
+    """
+    args = parse_args(argv)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
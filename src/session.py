@@ -0,0 +1,143 @@
+"""Модуль сеанса с сохраняемым между строками стеком."""
+from collections import deque
+
+from budget import Budget
+from calculator import Calculator
+from evaluator import Evaluator
+from numeric import NumericBackend
+from operators import Operator
+from constants import *
+
+
+def stack_need(tokens) -> int:
+    """
+    Вычисляет, сколько значений строка снимает с уже лежащего стека.
+
+    Считается по токенам без вычисления: операнд добавляет одно
+    значение, бинарный оператор снимает два и добавляет одно,
+    унарный снимает и добавляет одно, скобки высоту не меняют.
+
+    Args:
+        tokens: Токены скомпилированной строки.
+
+    Returns:
+        Число значений стека, которые могут понадобиться строке.
+    """
+    height = 0
+    lowest = 0
+    for t in tokens:
+        if t.__class__ is Operator:
+            height -= t.arity
+            if height < lowest:
+                lowest = height
+            height += 1
+        elif t.__class__ is not str or t not in BRACKETS:
+            height += 1
+    return -lowest
+
+
+class Session:
+    """
+    Сеанс пошаговых вычислений.
+
+    Стек операндов сохраняется между строками: каждая строка
+    выполняется над результатами предыдущих, поэтому длинное
+    вычисление можно набирать по частям. Строка выполняется
+    атомарно: при ошибке стек не меняется. Стоимость строки
+    пропорциональна её длине и числу снятых ею значений, а не
+    всей истории сеанса. Изменения стека запоминаются для отмены.
+    """
+
+    def __init__(self, backend: NumericBackend | None = None, budget: Budget | None = None,
+                 history: int = SESSION_UNDO_LIMIT):
+        """
+        Инициализирует пустой сеанс.
+
+        Args:
+            backend: Числовой режим, по умолчанию текущий режим калькулятора.
+            budget: Бюджет вычисления одной строки.
+            history: Число изменений стека, доступных для отмены.
+        """
+        self.backend = backend
+        self._stack: list = []
+        self._history: deque[tuple[int, list]] = deque(maxlen=history)
+        self._evaluator = Evaluator((), budget=budget, memo=Calculator.get_memo())
+
+    @property
+    def stack(self) -> tuple:
+        """Значения стека от дна к вершине."""
+        return tuple(self._stack)
+
+    def eval(self, expression: str) -> float:
+        """
+        Выполняет строку над стеком сеанса.
+
+        Пример: s.eval('3 4'); s.eval('+') возвращает 7.
+
+        Args:
+            expression: Часть RPN выражения.
+
+        Returns:
+            Значение на вершине стека после выполнения строки.
+
+        Raises:
+            ValueError: При некорректной строке или нехватке значений в стеке.
+        """
+        backend = self.backend or Calculator.get_backend()
+        tokens = backend.programs(self._evaluator.budget).get(expression).tokens
+        need = stack_need(tokens)
+        stack = self._stack
+        start = max(len(stack) - need, 0)
+        local = stack[start:]
+
+        self._evaluator.reset(tokens)
+        self._evaluator.run(local)
+        self._replace(start, local)
+        return local[-1]
+
+    def drop(self) -> float:
+        """
+        Снимает значение с вершины стека.
+
+        Returns:
+            Снятое значение.
+
+        Raises:
+            ValueError: Если стек пуст.
+        """
+        if not self._stack:
+            raise ValueError(ERROR_SESSION_EMPTY_STACK)
+        value = self._stack[-1]
+        self._replace(len(self._stack) - 1, [])
+        return value
+
+    def clear(self) -> None:
+        """Очищает стек; очистку можно отменить."""
+        if self._stack:
+            self._replace(0, [])
+
+    def undo(self) -> None:
+        """
+        Отменяет последнее изменение стека.
+
+        Raises:
+            ValueError: Если отменять нечего.
+        """
+        if not self._history:
+            raise ValueError(ERROR_NOTHING_TO_UNDO)
+        start, removed = self._history.pop()
+        del self._stack[start:]
+        self._stack.extend(removed)
+
+    def _replace(self, start: int, values: list) -> None:
+        """
+        Заменяет вершину стека начиная с позиции start и запоминает изменение.
+
+        Args:
+            start: Позиция первого заменяемого значения.
+            values: Новые значения вершины.
+        """
+        stack = self._stack
+        self._history.append((start, stack[start:]))
+        del stack[start:]
+        stack.extend(values)
@@ -1,6 +1,53 @@
 """Модуль токенизации выражений."""
+import re
+import string
+from collections.abc import Callable, Iterator
+from functools import partial
+from itertools import accumulate
+from typing import TextIO
+
+from operators import OPERATORS, OperatorRegistry
 from constants import *
 
+# Таблица классов символов: цифры заменяются на 0, буквы на a.
+# После замены различных «форм» токенов в выражении обычно единицы,
+# и проверять достаточно их, а не каждый токен.
+_SHAPE_TABLE = str.maketrans(string.digits + string.ascii_letters,
+                             '0' * len(string.digits) + 'a' * len(string.ascii_letters))
+_TOKEN_SHAPE_RE = re.compile(r'[-+]?(?:0+(?:\.0*)?|\.0+)|\*\*|//|[-+*/%~$()]')
+_NAME_SHAPE_RE = re.compile(r'[a_][a0_]*')
+
+# Таблица, оставляющая в ASCII строке только скобки
+_BRACKETS_ONLY_TABLE = {code: None for code in range(128) if chr(code) not in BRACKETS}
+_BRACKET_DELTA = {OPENING_BRACKET: 1, CLOSING_BRACKET: -1}
+
+# Таблица лексем для выражений, где токены не разделены пробелами:
+# число, число со знаком, двухсимвольный оператор, имя и любой другой символ.
+_TOKEN_RE = re.compile(r'\d+(?:\.\d*)?|[-+](?:\d+(?:\.\d*)?|\.\d*)|\.\d*|\*\*|//|[A-Za-z_]\w*|\S')
+
+# Символы, недопустимые в выражении без переменных и с переменными
+_INVALID_CHAR_RE = re.compile(r'[^\s\d.+\-*/%~$()]')
+_INVALID_CHAR_WITH_VARIABLES_RE = re.compile(r'[^\s\w.+\-*/%~$()]')
+
+# Знак перед числом является бинарным оператором, если предыдущий токен —
+# число, имя или закрывающая скобка, то есть предыдущий непробельный
+# символ входит в [\w.)]. Такой знак отделяется от числа пробелом.
+_BINARY_SIGN_RE = re.compile(r'([\w.)]\s*[-+])(?=[\d.])')
+
+_INVALID_NUMBER_TOKENS = frozenset({POINT, '+.', '-.'})
+
+# Выражение без пробелов между токенами разрезается по операторам и
+# скобкам, если ни один знак не стоит вплотную перед числом. Двойные
+# операторы после замены превращаются в символы через два пробела и
+# склеиваются обратно: разделённые во входе символы дают больше пробелов.
+# Цепочка replace заметно быстрее translate с многосимвольной заменой.
+_SIGNED_NUMBER_RE = re.compile(r'[-+][\d.]')
+_PADDED_CHARS = tuple((char, f' {char} ') for char in SINGLE_CHAR_BINARY_OPERATORS + '~$' + BRACKETS)
+_PADDED_DOUBLE_OPERATORS = tuple((f'{op[0]}  {op[1]}', op) for op in sorted(DOUBLE_CHAR_OPERATORS))
+
+# Символы, после которых поток можно разрезать, не разрезав токен
+_PIECE_BOUNDARIES = (' ', '\t', '\n', '\r', OPENING_BRACKET, CLOSING_BRACKET)
+
 
 class Tokenizer:
     """
@@ -9,14 +56,20 @@ class Tokenizer:
     Преобразует строку в список токенов.
     """
 
-    def __init__(self, expression: str):
+    def __init__(self, expression: str, allow_variables: bool = False,
+                 operators: OperatorRegistry | None = None):
         """
         Инициализирует токенизатор.
 
         Args:
             expression: Строка с выражением.
+            allow_variables: Разрешить именованные переменные
+                (идентификаторы вида x, price, row_1).
+            operators: Реестр операторов, по умолчанию общий реестр.
         """
         self.expr = expression
+        self.allow_variables = allow_variables
+        self.operators = OPERATORS if operators is None else operators
 
     def tokenize(self) -> list[str]:
         """
@@ -31,6 +84,186 @@ class Tokenizer:
         if not self.expr.strip():
             raise ValueError(ERROR_EMPTY_EXPRESSION)
 
+        if self.expr.isascii():
+            return self._lex()
+
+        return self._tokenize_exact()
+
+    def decode(self, to_number: Callable[[str], object] | None = None) -> list:
+        """
+        Разбивает выражение на типизированные токены.
+
+        В отличие от tokenize, числа сразу преобразуются в int или float,
+        а операторы заменяются объектами Operator из реестра. Скобки
+        и имена переменных остаются строками. Вычислитель выполняет
+        такие токены без повторного поиска операторов и разбора чисел.
+        Каждый различный токен преобразуется один раз, поэтому
+        повторяющиеся числа и операторы не создают новых объектов.
+
+        Args:
+            to_number: Преобразование числового токена, по умолчанию
+                в int или float (например, Fraction для точного режима).
+
+        Returns:
+            Список типизированных токенов.
+
+        Raises:
+            ValueError: При некорректном выражении.
+        """
+        tokens = self.tokenize()
+        table = {token: self._decode_token(token, to_number) for token in set(tokens)}
+        return list(map(table.__getitem__, tokens))
+
+    def _decode_token(self, token: str, to_number: Callable[[str], object] | None = None):
+        """
+        Преобразует один проверенный токен.
+
+        Args:
+            token: Токен, полученный от tokenize.
+            to_number: Преобразование числового токена или None.
+
+        Returns:
+            Оператор, число или исходная строка для скобок и имён.
+        """
+        op = self.operators.get(token)
+        if op is not None:
+            return op
+        if token in BRACKETS or self._is_variable_start(token[0]):
+            return token
+        # Число уже проверено при токенизации
+        if to_number is not None:
+            return to_number(token)
+        if POINT in token:
+            return float(token)
+        return int(token)
+
+    def _lex(self) -> list[str]:
+        """
+        Разбирает ASCII выражение на токены без посимвольного цикла.
+
+        Токены выделяются в _lex_tokens. При ошибке лексемы разбор
+        передаётся в _tokenize_exact, чтобы текст и порядок ошибок
+        совпадали в точности. Баланс скобок проверяется по строке,
+        оставшейся после удаления всех символов, кроме скобок.
+
+        Returns:
+            Список токенов.
+
+        Raises:
+            ValueError: При некорректных символах, числах или скобках.
+        """
+        tokens = self._lex_tokens()
+        if tokens is None:
+            return self._tokenize_exact()
+
+        brackets = self.expr.translate(_BRACKETS_ONLY_TABLE)
+        if brackets:
+            depths = list(accumulate(map(_BRACKET_DELTA.__getitem__, brackets)))
+            if depths[-1] != 0 or min(depths) < 0:
+                raise ValueError(ERROR_UNBALANCED_BRACKETS)
+
+        return tokens
+
+    def _lex_tokens(self) -> list[str] | None:
+        """
+        Выделяет токены ASCII выражения операциями над строкой целиком.
+
+        1. Если каждый фрагмент между пробелами является ровно одним
+           токеном (проверяются формы фрагментов по _SHAPE_TABLE),
+           токенами становится результат split(). Знаки, которые
+           являются бинарными операторами, предварительно отделяются
+           от чисел (см. _BINARY_SIGN_RE).
+        2. Если ни один знак не стоит вплотную перед числом, операторы
+           и скобки отделяются пробелами (см. _PADDED_CHARS), и фрагменты
+           проверяются так же, как в п. 1.
+        3. Иначе токены выделяются одним вызовом findall по _TOKEN_RE.
+           Этот путь, например для слитных чисел со знаком (1(-5 3+)+),
+           ускорен менее чем в 2 раза относительно посимвольного разбора.
+        Скобки не проверяются.
+
+        Returns:
+            Список токенов или None, если выражение содержит ошибку
+            лексемы или может содержать пользовательские операторы
+            и должно разбираться посимвольно.
+        """
+        expr = self.expr
+        if self.operators.custom_symbols and _INVALID_CHAR_RE.search(expr):
+            return None
+
+        shapes = set(expr.translate(_SHAPE_TABLE).split())
+        signed = self._classify_shapes(shapes)
+
+        if signed is not None:
+            return (_BINARY_SIGN_RE.sub(r'\1 ', expr) if signed else expr).split()
+
+        if not _SIGNED_NUMBER_RE.search(expr):
+            padded = expr
+            for char, spaced in _PADDED_CHARS:
+                if char in padded:
+                    padded = padded.replace(char, spaced)
+            for spaced, op in _PADDED_DOUBLE_OPERATORS:
+                padded = padded.replace(spaced, op)
+            if self._classify_shapes(set(padded.translate(_SHAPE_TABLE).split())) is not None:
+                return padded.split()
+
+        invalid_char = _INVALID_CHAR_WITH_VARIABLES_RE if self.allow_variables else _INVALID_CHAR_RE
+        if invalid_char.search(expr):
+            return None
+        tokens = _TOKEN_RE.findall(_BINARY_SIGN_RE.sub(r'\1 ', expr))
+        if not _INVALID_NUMBER_TOKENS.isdisjoint(tokens):
+            return None
+        return tokens
+
+    def _scan(self) -> list[str]:
+        """
+        Выделяет токены без проверки баланса скобок.
+
+        Используется для фрагментов потока (см. iter_tokens),
+        в которых скобки проверяются по мере чтения.
+
+        Returns:
+            Список токенов.
+
+        Raises:
+            ValueError: При некорректных символах или числах.
+        """
+        tokens = self._lex_tokens() if self.expr.isascii() else None
+        if tokens is None:
+            tokens = self._parse_tokens()
+        return tokens
+
+    def _classify_shapes(self, shapes: set[str]) -> bool | None:
+        """
+        Проверяет, что каждый фрагмент между пробелами — один токен.
+
+        Args:
+            shapes: Множество форм фрагментов выражения.
+
+        Returns:
+            None если какой-либо фрагмент не является одним токеном,
+            иначе признак наличия чисел со знаком.
+        """
+        signed = False
+        for shape in shapes:
+            if _TOKEN_SHAPE_RE.fullmatch(shape):
+                signed = signed or (len(shape) > 1 and shape[0] in PLUS_MINUS)
+            elif not (self.allow_variables and _NAME_SHAPE_RE.fullmatch(shape)):
+                return None
+        return signed
+
+    def _tokenize_exact(self) -> list[str]:
+        """
+        Разбирает выражение посимвольно в два прохода.
+
+        Используется для выражений с не-ASCII символами и для
+        формирования точного текста ошибки.
+
+        Returns:
+            Список токенов.
+
+        Raises:
+            ValueError: При некорректном выражении.
+        """
         if not self._check_brackets():
             raise ValueError(ERROR_UNBALANCED_BRACKETS)
 
@@ -149,7 +382,27 @@ class Tokenizer:
                     raise ValueError(ERROR_INVALID_NUMBER.format(number_str))
                 continue
 
-            # 8. Неизвестный символ
+            # 8. Обрабатываем пользовательские операторы-слова и переменные
+            if ((self.allow_variables or self.operators.custom_symbols) and
+                    self._is_variable_start(char)):
+                start = i
+                i += 1
+                while i < length and self._is_variable_char(self.expr[i]):
+                    i += 1
+                word = self.expr[start:i]
+                if word in self.operators or self.allow_variables:
+                    tokens.append(word)
+                    continue
+                raise ValueError(ERROR_UNKNOWN_SYMBOL.format(char))
+
+            # 9. Обрабатываем пользовательские операторы из знаков
+            symbol = self._match_custom_symbol(i)
+            if symbol:
+                tokens.append(symbol)
+                i += len(symbol)
+                continue
+
+            # 10. Неизвестный символ
             raise ValueError(ERROR_UNKNOWN_SYMBOL.format(char))
 
         if not tokens:
@@ -183,6 +436,48 @@ class Tokenizer:
         except ValueError:
             return False
 
+    def _match_custom_symbol(self, i: int) -> str | None:
+        """
+        Ищет самый длинный пользовательский оператор из знаков в позиции i.
+
+        Args:
+            i: Позиция в выражении.
+
+        Returns:
+            Символ оператора или None.
+        """
+        match = None
+        for symbol in self.operators.custom_symbols:
+            if self.expr.startswith(symbol, i) and (match is None or len(symbol) > len(match)):
+                match = symbol
+        return match
+
+    @staticmethod
+    def _is_variable_start(char: str) -> bool:
+        """
+        Проверяет, может ли символ начинать имя переменной.
+
+        Args:
+            char: Символ для проверки.
+
+        Returns:
+            True если символ является буквой или подчёркиванием.
+        """
+        return char.isalpha() or char == VARIABLE_UNDERSCORE
+
+    @staticmethod
+    def _is_variable_char(char: str) -> bool:
+        """
+        Проверяет, может ли символ продолжать имя переменной.
+
+        Args:
+            char: Символ для проверки.
+
+        Returns:
+            True если символ является буквой, цифрой или подчёркиванием.
+        """
+        return char.isalnum() or char == VARIABLE_UNDERSCORE
+
     def _is_start_of_number_context(self, tokens: list[str]) -> bool:
         """
         Определяет, может ли +/- быть началом числа в данном контексте.
@@ -204,9 +499,93 @@ class Tokenizer:
         last_token = tokens[-1]
 
         # После скобки, бинарного или унарного оператора
-        if (last_token == OPENING_BRACKET or
-            last_token in BINARY_OPERATORS or
-            last_token in UNARY_OPERATORS):
+        if last_token == OPENING_BRACKET or last_token in self.operators:
             return True
 
         return False
+
+
+def iter_tokens(source: str | TextIO, allow_variables: bool = False,
+                operators: OperatorRegistry | None = None,
+                chunk_size: int = STREAM_CHUNK_SIZE,
+                to_number: Callable[[str], object] | None = None) -> Iterator:
+    """
+    Лениво разбирает выражение на типизированные токены.
+
+    Выражение читается блоками по chunk_size символов и режется на
+    фрагменты по пробелам и скобкам, которые не могут находиться внутри
+    токена. Каждый фрагмент разбирается отдельно, а последний токен
+    предыдущего фрагмента задаёт контекст знаков. Токены выдаются сразу,
+    поэтому память не зависит от длины выражения. Баланс скобок
+    проверяется по мере чтения: лишняя закрывающая скобка обнаруживается
+    во фрагменте, где она встретилась, а незакрытые — в конце потока.
+
+    Args:
+        source: Строка или текстовый поток с выражением.
+        allow_variables: Разрешить именованные переменные.
+        operators: Реестр операторов, по умолчанию общий реестр.
+        chunk_size: Размер блока чтения в символах.
+        to_number: Преобразование числовых токенов, как в Tokenizer.decode.
+
+    Yields:
+        Токены в том же виде, что и Tokenizer.decode.
+
+    Raises:
+        ValueError: При некорректном выражении.
+    """
+    chunks: Iterator[str]
+    if isinstance(source, str):
+        chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    else:
+        chunks = iter(partial(source.read, chunk_size), '')
+
+    previous = None
+    depth = 0
+    for piece in _split_pieces(chunks):
+        if not piece or piece.isspace():
+            continue
+
+        # Последний токен предыдущего фрагмента определяет, является ли
+        # знак в начале фрагмента знаком числа или оператором
+        text = piece if previous is None else previous + ' ' + piece
+        tokenizer = Tokenizer(text, allow_variables, operators)
+        tokens = tokenizer._scan()
+        if previous is not None:
+            del tokens[0]
+        previous = tokens[-1]
+
+        for t in tokens:
+            if t in BRACKETS:
+                depth += _BRACKET_DELTA[t]
+                if depth < 0:
+                    raise ValueError(ERROR_UNBALANCED_BRACKETS)
+
+        table = {token: tokenizer._decode_token(token, to_number) for token in set(tokens)}
+        yield from map(table.__getitem__, tokens)
+
+    if previous is None:
+        raise ValueError(ERROR_EMPTY_EXPRESSION)
+    if depth:
+        raise ValueError(ERROR_UNBALANCED_BRACKETS)
+
+
+def _split_pieces(chunks: Iterator[str]) -> Iterator[str]:
+    """
+    Режет блоки текста на фрагменты по границам токенов.
+
+    Граница — последний пробельный символ или скобка в блоке.
+    Остаток после неё переносится в начало следующего блока.
+
+    Args:
+        chunks: Блоки текста.
+
+    Yields:
+        Фрагменты, не разрезающие ни один токен.
+    """
+    carry = ''
+    for chunk in chunks:
+        text = carry + chunk
+        cut = max(map(text.rfind, _PIECE_BOUNDARIES)) + 1
+        carry = text[cut:]
+        yield text[:cut]
+    yield carry
@@ -0,0 +1,77 @@
+"""Модуль статической проверки структуры RPN программ."""
+from collections.abc import Iterable
+
+from operators import Operator
+from constants import *
+
+
+def validate(tokens: Iterable) -> int:
+    """
+    Проверяет структуру программы без вычисления.
+
+    Проход повторяет работу вычислителя (см. Evaluator._execute
+    и Evaluator._parse), но вместо значений считает только высоту
+    стека операндов и кадры скобок. Поэтому некорректное выражение
+    отклоняется с той же ошибкой, которую выдал бы вычислитель,
+    но без арифметики: дорогие операции над большими целыми перед
+    ошибкой не выполняются. Если вычислитель раньше структурной
+    ошибки встретил бы ошибку операции (например, деление на ноль),
+    выдаётся структурная ошибка.
+
+    Args:
+        tokens: Токены скомпилированной программы: числа, объекты
+            Operator, подвыражения, скобки и имена переменных.
+
+    Returns:
+        Наибольшая высота стека операндов при вычислении.
+
+    Raises:
+        ValueError: При нехватке аргументов оператора, пустых или
+            некорректных скобках и лишних значениях в стеке.
+    """
+    height = 0
+    depth = 0
+    frames = []
+    base = 0
+    tokens = iter(tokens)
+
+    for t in tokens:
+        if t.__class__ is Operator:
+            if height - base < t.arity:
+                if t.arity == 1:
+                    raise ValueError(ERROR_NOT_ENOUGH_UNARY_ARGS)
+                raise ValueError(ERROR_NOT_ENOUGH_BINARY_ARGS)
+            height -= t.arity - 1
+
+        elif t.__class__ is str and t == OPENING_BRACKET:
+            frames.append(base)
+            base = height
+
+        elif t.__class__ is str and t == CLOSING_BRACKET:
+            size = height - base
+            if size != 1:
+                if size == 0:
+                    raise ValueError(ERROR_EMPTY_BRACKETS)
+                raise ValueError(ERROR_INVALID_BRACKET_EXPRESSION.format(size))
+            if not frames:
+                # Закрывающая скобка без пары завершает разбор
+                if next(tokens, None) is not None:
+                    raise ValueError(ERROR_UNPROCESSED_TOKENS)
+                return depth
+            base = frames.pop()
+
+        else:
+            height += 1
+            if height > depth:
+                depth = height
+
+    # Незакрытые скобки: содержимое каждой должно свестись к одному значению
+    while frames:
+        size = height - base
+        if size != 1:
+            raise ValueError(ERROR_INVALID_EXPRESSION.format(size))
+        base = frames.pop()
+
+    if height != 1:
+        raise ValueError(ERROR_INVALID_EXPRESSION.format(height))
+    return depth
@@ -0,0 +1,302 @@
+"""Модуль векторного вычисления RPN выражений над массивами NumPy."""
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any
+
+from tokenizer import Tokenizer
+from evaluator import Evaluator
+from operators import OPERATORS, Operator, OperatorRegistry, is_integer_value
+from constants import *
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+
+class VectorEvaluator(Evaluator):
+    """
+    Вычислитель RPN выражений над столбцами данных.
+
+    Каждая переменная связывается с массивом NumPy, и стековая машина
+    проходит по токенам один раз: каждая ячейка стека хранит целый
+    вектор значений. Встроенные бинарные операторы заменены векторными
+    (см. vector_operators), операции над двумя скалярами (литералами)
+    выполняются обычными скалярными операторами.
+    """
+
+    def __init__(self, tokens: list[str], variables: Mapping[str, Any] | None = None,
+                 operators: OperatorRegistry | None = None):
+        """
+        Инициализирует векторный вычислитель.
+
+        Args:
+            tokens: Список токенов для вычисления.
+            variables: Массивы значений именованных переменных.
+            operators: Реестр операторов, по умолчанию vector_operators().
+        """
+        if operators is None:
+            operators = vector_operators()
+        super().__init__(tokens, variables, operators)
+
+
+def vector_operators() -> OperatorRegistry:
+    """
+    Создаёт реестр операторов для векторного вычисления.
+
+    Копирует общий реестр, включая пользовательские операторы,
+    и заменяет встроенные бинарные операторы векторными.
+    Унарные операторы работают с массивами без изменений.
+
+    Returns:
+        Реестр векторных операторов.
+    """
+    registry = OPERATORS.copy()
+    for symbol, vector_func in (
+        (OP_PLUS, np.add),
+        (OP_MINUS, np.subtract),
+        (OP_MULTIPLY, np.multiply),
+        (OP_DIVIDE, _divide),
+        (OP_POWER, _power),
+        (OP_FLOOR_DIV, _floor_divide),
+        (OP_MOD, _mod),
+    ):
+        registry._add_builtin(Operator(symbol, 2, _lift(symbol, vector_func)))
+    return registry
+
+
+def _lift(symbol: str, vector_func):
+    """
+    Объединяет векторную и скалярную реализации оператора.
+
+    Args:
+        symbol: Символ встроенного оператора.
+        vector_func: Реализация для массивов.
+
+    Returns:
+        Функция, выбирающая реализацию по типам аргументов.
+
+    Raises:
+        ValueError: Если оператора нет в общем реестре.
+    """
+    scalar = OPERATORS.get(symbol)
+    if scalar is None:
+        raise ValueError(ERROR_UNKNOWN_OPERATOR.format(symbol))
+    scalar_func = scalar.call
+
+    def call(a, b):
+        if _is_vector(a) or _is_vector(b):
+            return vector_func(a, b)
+        return scalar_func(a, b)
+    return call
+
+
+def _divide(a, b):
+    """
+    Выполняет поэлементное деление.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Массив частных.
+
+    Raises:
+        ZeroDivisionError: С номерами строк, где делитель равен нулю.
+    """
+    _check_zero(b)
+    return np.true_divide(a, b)
+
+
+def _floor_divide(a, b):
+    """
+    Выполняет поэлементное целочисленное деление.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Массив целых частей частных.
+
+    Raises:
+        ZeroDivisionError: С номерами строк, где делитель равен нулю.
+        TypeError: Если значения не целые.
+    """
+    _check_zero(b)
+    if not _is_integer_array(a) or not _is_integer_array(b):
+        raise TypeError(ERROR_INTEGER_ONLY_FLOOR_DIV)
+    return np.floor_divide(a, b)
+
+
+def _mod(a, b):
+    """
+    Вычисляет поэлементный остаток от деления.
+
+    Args:
+        a: Делимое.
+        b: Делитель.
+
+    Returns:
+        Массив остатков.
+
+    Raises:
+        ZeroDivisionError: С номерами строк, где делитель равен нулю.
+        TypeError: Если значения не целые.
+    """
+    _check_zero(b)
+    if not _is_integer_array(a) or not _is_integer_array(b):
+        raise TypeError(ERROR_INTEGER_ONLY_MOD)
+    return np.mod(a, b)
+
+
+def _power(a, b):
+    """
+    Возводит в степень с учётом правил Python.
+
+    Целое в отрицательной целой степени даёт дробное число,
+    а ноль в отрицательной степени считается делением на ноль.
+
+    Args:
+        a: Основание.
+        b: Показатель степени.
+
+    Returns:
+        Результат возведения в степень.
+
+    Raises:
+        ZeroDivisionError: Если ноль возводится в отрицательную степень.
+    """
+    negative = np.less(b, 0)
+    if np.any(negative):
+        _check_zero(np.where(negative, a, 1))
+        if _is_int_dtype(a) and _is_int_dtype(b):
+            a = np.asarray(a, dtype=np.float64)
+    with np.errstate(over='ignore', invalid='ignore'):
+        return np.power(a, b)
+
+
+def _check_zero(b) -> None:
+    """
+    Проверяет делитель на ноль в каждой строке.
+
+    Args:
+        b: Делитель (скаляр или массив).
+
+    Raises:
+        ZeroDivisionError: С номерами строк, где делитель равен нулю.
+    """
+    if not _is_vector(b):
+        if b == 0:
+            raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO)
+        return
+    rows = np.flatnonzero(b == 0)
+    if rows.size:
+        shown = ', '.join(str(r) for r in rows[:MAX_REPORTED_ROWS])
+        if rows.size > MAX_REPORTED_ROWS:
+            shown += ', ...'
+        raise ZeroDivisionError(ERROR_DIVISION_BY_ZERO_ROWS.format(shown))
+
+
+def _is_integer_array(x) -> bool:
+    """
+    Проверяет, что все значения являются целыми по значению.
+
+    Args:
+        x: Скаляр или массив.
+
+    Returns:
+        True если каждое значение целое.
+    """
+    if not _is_vector(x):
+        return is_integer_value(x)
+    if _is_int_dtype(x):
+        return True
+    return bool(np.all(np.isfinite(x) & (np.floor(x) == x)))
+
+
+def _is_vector(x) -> bool:
+    """
+    Проверяет, является ли значение массивом или скаляром NumPy.
+
+    Args:
+        x: Значение для проверки.
+
+    Returns:
+        True для значений NumPy.
+    """
+    return isinstance(x, (np.ndarray, np.generic))
+
+
+def _is_int_dtype(x) -> bool:
+    """
+    Проверяет, имеет ли значение целочисленный тип.
+
+    Args:
+        x: Скаляр или массив.
+
+    Returns:
+        True для целых скаляров и массивов целого типа.
+    """
+    if _is_vector(x):
+        return x.dtype.kind == 'i'
+    return isinstance(x, int)
+
+
+def evaluate_columns(expression: str, variables: Mapping[str, object]):
+    """
+    Вычисляет одно RPN выражение над столбцами данных.
+
+    Пример: evaluate_columns('price qty *', {'price': prices, 'qty': counts}).
+
+    Целочисленные столбцы вычисляются в int64, поэтому, в отличие от
+    скалярного режима, целые числа ограничены 64 битами.
+
+    Args:
+        expression: Выражение в RPN формате с именованными переменными.
+        variables: Значения переменных: массивы одинаковой длины или скаляры.
+
+    Returns:
+        Массив NumPy с результатом для каждой строки.
+
+    Raises:
+        ImportError: Если numpy не установлен.
+        ValueError: При некорректном выражении или значениях переменных.
+        ZeroDivisionError: При делении на ноль с номерами строк.
+        TypeError: При использовании // или % с нецелыми числами.
+    """
+    if np is None:
+        raise ImportError(ERROR_NUMPY_REQUIRED)
+
+    columns = {name: _to_column(name, values) for name, values in variables.items()}
+    operators = vector_operators()
+    tokens = Tokenizer(expression, allow_variables=True, operators=operators).decode()
+    result = VectorEvaluator(tokens, columns, operators).evaluate()
+
+    shape = np.broadcast_shapes(*(c.shape for c in columns.values()))
+    return np.broadcast_to(result, shape).copy()
+
+
+def _to_column(name: str, values):
+    """
+    Преобразует значения переменной в числовой массив.
+
+    Args:
+        name: Имя переменной.
+        values: Массив, последовательность или скаляр.
+
+    Returns:
+        Массив NumPy целого или вещественного типа.
+
+    Raises:
+        ValueError: Если значения не являются числами.
+    """
+    column = np.asarray(values)
+    if column.dtype.kind in 'bu':
+        return column.astype(np.int64)
+    if column.dtype.kind not in 'if':
+        raise ValueError(ERROR_INVALID_VARIABLE_VALUES.format(name))
+    return column
@@ -0,0 +1,201 @@
+"""Модуль записи результатов пакетного вычисления в текстовом, JSON Lines и CSV форматах."""
+import csv
+import io
+import math
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from itertools import islice
+from json.encoder import encode_basestring
+from typing import TextIO
+
+from oneshot import format_result
+from constants import *
+
+# Шаблоны строк JSON Lines с уже закодированными именами полей
+_JSON_FIELDS = tuple(encode_basestring(name) for name in OUTPUT_FIELDS)
+_JSONL_NUMBER = '{%s: %%d, %s: %%s, %s: %%r, %s: null}\n' % _JSON_FIELDS
+_JSONL_RESULT = '{%s: %%d, %s: %%s, %s: %%s, %s: null}\n' % _JSON_FIELDS
+_JSONL_ERROR = '{%s: %%d, %s: %%s, %s: null, %s: %%s}\n' % _JSON_FIELDS
+
+
+class ResultWriter(ABC):
+    """
+    Основа записи результатов.
+
+    Записи (номер строки, выражение, результат или исключение)
+    читаются пакетами по BATCH_WRITE_LINES. Каждый пакет форматируется
+    целиком и записывается в выходной поток одним вызовом write,
+    поэтому число обращений к потоку не зависит от числа записей.
+    В конце в поток ошибок выводится сводка.
+    """
+
+    # Формату нужен текст выражения каждой записи
+    needs_input = True
+
+    def __init__(self, out: TextIO, err: TextIO):
+        """
+        Инициализирует запись.
+
+        Args:
+            out: Поток для результатов.
+            err: Поток для ошибок и сводки.
+        """
+        self.out = out
+        self.err = err
+
+    def write(self, records: Iterable[tuple[int, str | None, float | Exception]]) -> int:
+        """
+        Записывает все записи и сводку.
+
+        Args:
+            records: Тройки (номер строки, выражение, результат или исключение).
+
+        Returns:
+            Код завершения: 0 без ошибок, 1 если были ошибки.
+        """
+        total = 0
+        errors = 0
+        records = iter(records)
+        self.begin()
+        while batch := list(islice(records, BATCH_WRITE_LINES)):
+            total += len(batch)
+            errors += self.write_batch(batch)
+        self.out.flush()
+        self.err.write(BATCH_SUMMARY_FORMAT.format(total, errors))
+        return 1 if errors else 0
+
+    def begin(self) -> None:
+        """Записывает заголовок перед первой записью."""
+
+    @abstractmethod
+    def write_batch(self, batch: list) -> int:
+        """
+        Форматирует и записывает пакет записей.
+
+        Args:
+            batch: Тройки (номер строки, выражение, результат или исключение).
+
+        Returns:
+            Число ошибок в пакете.
+        """
+
+
+class TextWriter(ResultWriter):
+    """
+    Текстовый вывод: результат на строку, ошибки с номерами строк
+    в потоке ошибок (см. oneshot.format_result).
+
+    Каждой непустой строке входа соответствует одна строка вывода:
+    на месте результата с ошибкой, в том числе результата, который
+    нельзя преобразовать в строку (целое длиннее предела
+    sys.get_int_max_str_digits), выводится BATCH_ERROR_RESULT,
+    поэтому вывод можно построчно сопоставить с входом.
+    """
+
+    needs_input = False
+
+    def write_batch(self, batch: list) -> int:
+        output = []
+        errors = 0
+        for line_number, _, result in batch:
+            if not isinstance(result, Exception):
+                try:
+                    output.append(format_result(result))
+                    continue
+                except ValueError as e:
+                    # Целое длиннее предела преобразования в строку
+                    result = e
+            errors += 1
+            self.err.write(BATCH_ERROR_FORMAT.format(line_number, result))
+            output.append(BATCH_ERROR_RESULT)
+        if output:
+            output.append('')
+            self.out.write('\n'.join(output))
+        return errors
+
+
+class JsonLinesWriter(ResultWriter):
+    """
+    JSON Lines: объект с полями line, input, result и error на строку.
+
+    Целые и конечные float записываются числами JSON (float — в
+    кратчайшем точном виде), остальные значения (бесконечность, NaN,
+    Fraction, Decimal) — строками. У ошибки result равен null,
+    а error содержит сообщение; так же записывается результат,
+    который нельзя преобразовать в строку (целое длиннее предела
+    sys.get_int_max_str_digits).
+    """
+
+    def write_batch(self, batch: list) -> int:
+        output: list[str] = []
+        append = output.append
+        encode = encode_basestring
+        isfinite = math.isfinite
+        errors = 0
+        for line_number, expression, value in batch:
+            cls = value.__class__
+            try:
+                if cls is int or cls is float and isfinite(value):
+                    append(_JSONL_NUMBER % (line_number, encode(expression), value))
+                    continue
+                if not isinstance(value, Exception):
+                    append(_JSONL_RESULT % (line_number, encode(expression), encode(str(value))))
+                    continue
+            except ValueError as e:
+                # Целое длиннее предела преобразования в строку
+                value = e
+            errors += 1
+            append(_JSONL_ERROR % (line_number, encode(expression), encode(str(value))))
+        self.out.write(''.join(output))
+        return errors
+
+
+class CsvWriter(ResultWriter):
+    """
+    CSV с заголовком line,input,result,error.
+
+    Результат записывается через str (float — в кратчайшем точном
+    виде, Fraction — как 1/3); у ошибки, в том числе у результата,
+    который нельзя преобразовать в строку, поле result пустое.
+    """
+
+    def __init__(self, out: TextIO, err: TextIO):
+        super().__init__(out, err)
+        self._buffer = io.StringIO()
+        self._csv = csv.writer(self._buffer, lineterminator='\n')
+
+    def begin(self) -> None:
+        self.out.write(','.join(OUTPUT_FIELDS) + '\n')
+
+    def write_batch(self, batch: list) -> int:
+        rows: list[tuple] = []
+        append = rows.append
+        errors = 0
+        for line_number, expression, value in batch:
+            if not isinstance(value, Exception):
+                # Результат преобразуется здесь, а не в csv, чтобы ошибка
+                # преобразования относилась к своей записи; str для float —
+                # точный repr
+                try:
+                    append((line_number, expression, str(value), ''))
+                    continue
+                except ValueError as e:
+                    value = e
+            errors += 1
+            append((line_number, expression, '', str(value)))
+        # Пакет форматируется в памяти и записывается одним вызовом
+        buffer = self._buffer
+        self._csv.writerows(rows)
+        self.out.write(buffer.getvalue())
+        buffer.seek(0)
+        buffer.truncate()
+        return errors
+
+
+# Запись результатов по имени формата
+WRITERS: dict[str, type[ResultWriter]] = {
+    OUTPUT_TEXT: TextWriter,
+    OUTPUT_JSONL: JsonLinesWriter,
+    OUTPUT_CSV: CsvWriter,
+}
+
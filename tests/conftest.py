@@ -5,3 +5,18 @@ from pathlib import Path
 # Добавляем папку src в sys.path
 src_path = Path(__file__).parent.parent / 'src'
 sys.path.insert(0, str(src_path))
+
+
+def normalize(result):
+    """Заменяет исключение его типом и текстом, остальные значения не меняет."""
+    if isinstance(result, Exception):
+        return type(result), str(result)
+    return result
+
+
+def outcome(function, *args):
+    """Возвращает результат вызова или тип и сообщение исключения."""
+    try:
+        return function(*args)
+    except Exception as e:
+        return normalize(e)
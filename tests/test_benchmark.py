@@ -0,0 +1,82 @@
+"""Тесты для нагрузочных тестов."""
+import json
+import random
+
+import pytest
+
+from benchmark import WORKLOADS, compare, main, run_benchmarks
+from budget import Budget
+from calculator import Calculator
+from numeric import FRACTION, NATIVE
+
+
+@pytest.mark.parametrize('name', list(WORKLOADS))
+def test_workloads_are_reproducible(name):
+    """Тестирует воспроизводимость генераторов выражений."""
+    generator = WORKLOADS[name]
+    first = generator(5, random.Random(7))
+    assert first == generator(5, random.Random(7))
+    assert len(first) == 5
+
+
+def test_workloads_are_valid():
+    """Тестирует, что ошибки возникают только в нагрузке с ошибками."""
+    for name, generator in WORKLOADS.items():
+        if name == 'mixed_errors':
+            continue
+        for expression in generator(3, random.Random(1)):
+            Calculator(expression).eval()
+
+
+def test_run_benchmarks_report():
+    """Тестирует структуру отчёта."""
+    report = run_benchmarks(size=5, repeat=1, workloads=['flat_chain', 'mixed_errors'])
+    assert set(report['results']) == {'flat_chain', 'mixed_errors'}
+    stats = report['results']['flat_chain']['calculator']
+    assert stats['ops_per_sec'] > 0 and stats['peak_memory'] > 0
+    assert report['results']['flat_chain']['tokenize']['errors'] == 0
+    json.dumps(report)
+
+
+def test_run_benchmarks_restores_calculator():
+    """Тестирует, что замеры не меняют настройки и кэши калькулятора."""
+    budget = Budget()
+    program = Calculator.compile('7 8 *')
+    memo = Calculator.get_memo()
+    Calculator.configure_backend(FRACTION)
+    Calculator.configure_budget(budget)
+    Calculator.configure_float_stack(True)
+    try:
+        report = run_benchmarks(size=3, repeat=1, workloads=['float_division'])
+        assert Calculator.get_backend() is FRACTION
+        assert Calculator.get_budget() is budget
+        assert Calculator.get_float_stack()
+    finally:
+        Calculator.configure_backend(NATIVE)
+        Calculator.configure_budget(None)
+        Calculator.configure_float_stack(False)
+    assert Calculator.get_memo() is memo
+    assert Calculator.compile('7 8 *') is program
+    assert report['results']['float_division']['calculator']['errors'] == 0
+
+
+def test_compare_flags_regressions():
+    """Тестирует обнаружение регрессий относительно эталона."""
+    baseline = {'results': {'w': {'tokenize': {'ops_per_sec': 1000}, 'evaluate': {'ops_per_sec': 1000}}}}
+    current = {'results': {'w': {'tokenize': {'ops_per_sec': 950}, 'evaluate': {'ops_per_sec': 800}},
+                           'new': {'tokenize': {'ops_per_sec': 1}}}}
+    assert compare(current, baseline, threshold=0.1) == [('w', 'evaluate', 1000, 800)]
+
+
+def test_main_saves_and_compares(tmp_path, capsys):
+    """Тестирует сохранение результатов и сравнение с эталоном."""
+    output = tmp_path / 'bench.json'
+    assert main(['-n', '3', '-r', '1', '-w', 'unary_heavy', '-o', str(output)]) == 0
+    report = json.loads(output.read_text(encoding='utf-8'))
+    assert 'unary_heavy' in report['results']
+
+    for stats in report['results']['unary_heavy'].values():
+        stats['ops_per_sec'] *= 1000
+    output.write_text(json.dumps(report), encoding='utf-8')
+    assert main(['-n', '3', '-r', '1', '-w', 'unary_heavy', '--baseline', str(output)]) == 1
+    assert 'Регрессия: unary_heavy' in capsys.readouterr().out
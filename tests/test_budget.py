@@ -0,0 +1,104 @@
+"""Тесты для бюджета вычислений."""
+import time
+
+import pytest
+
+from budget import Budget, estimate
+from calculator import Calculator
+from evaluator import Evaluator
+from operators import OPERATORS
+from program import compile_expression
+from tokenizer import Tokenizer
+
+
+@pytest.fixture
+def budget():
+    """Задаёт бюджет калькулятора на время теста."""
+    budget = Budget(max_result_bits=10_000, max_operations=50)
+    Calculator.configure_budget(budget)
+    yield budget
+    Calculator.configure_budget(None)
+
+
+def test_estimate():
+    """Тестирует оценку размера и стоимости операций над целыми."""
+    assert estimate('**', 2, 100) == (101, 0)
+    assert estimate('**', 1, 10 ** 9) == (0, 0)
+    assert estimate('**', 2.0, 1000) == (0, 0)
+    assert estimate('*', 2 ** 100, 2 ** 50) == (152, 101 * 51)
+    assert estimate('//', 2 ** 100, 3) == (101, 202)
+    assert estimate('+', 2 ** 100, 3) == (0, 0)
+
+
+def test_runaway_power_fails_fast(budget):
+    """Тестирует быстрый отказ при огромной степени."""
+    start = time.monotonic()
+    with pytest.raises(OverflowError, match="Превышен бюджет: результат \\*\\*"):
+        Calculator('9 9 9 ** **').eval()
+    assert time.monotonic() - start < 1
+    assert Calculator('2 100 **').eval() == 2 ** 100
+
+
+def test_cost_limit():
+    """Тестирует предел стоимости умножения и деления."""
+    tokens = Tokenizer(f'{2 ** 2000} {2 ** 2000} //').decode()
+    with pytest.raises(OverflowError, match="стоимость //"):
+        Evaluator(tokens, budget=Budget(max_cost=1000)).evaluate()
+
+
+def test_operation_limit(budget):
+    """Тестирует предел числа операций для каждого выражения."""
+    chain = '1 ' + '1 + ' * 50
+    assert Calculator(chain).eval() == 51
+    with pytest.raises(ValueError, match="больше 50 операций"):
+        Calculator.eval_stream(chain + '1 +')
+    assert list(Calculator.eval_many([chain, chain])) == [51, 51]
+
+
+def test_constants_within_budget():
+    """Тестирует, что свёртка констант и таблица подвыражений не обходят бюджет."""
+    expensive = '( 3 2000 ** 7 % ) 1 +'
+    assert Calculator(expensive).eval() == pow(3, 2000, 7) + 1
+    Calculator.configure_budget(Budget(max_result_bits=1000, max_operations=2))
+    try:
+        with pytest.raises(OverflowError, match="результат \\*\\*"):
+            Calculator('2 3000 **').eval()
+        with pytest.raises(OverflowError, match="результат \\*\\*"):
+            Calculator(expensive).eval()
+        with pytest.raises(ValueError, match="больше 2 операций"):
+            Calculator('1 1 + 1 + 1 +').eval()
+        results = list(Calculator.eval_many(['1 1 + 1 +', '1 1 + 1 + 1 +'], return_exceptions=True))
+        assert results[0] == 3 and isinstance(results[1], ValueError)
+        assert Calculator.engine().eval('2 10 **') == 1024
+        with pytest.raises(OverflowError):
+            Calculator.engine().eval('2 3000 **')
+    finally:
+        Calculator.configure_budget(None)
+    assert Calculator('2 3000 **').eval() == 2 ** 3000
+
+
+def test_timeout():
+    """Тестирует предел времени вычисления."""
+    def slow(a):
+        time.sleep(0.02)
+        return a
+
+    Calculator.register_operator('slow', 1, slow, pure=False)
+    try:
+        tokens = Tokenizer('1 slow slow slow slow').decode()
+        with pytest.raises(TimeoutError, match="Превышен бюджет"):
+            Evaluator(tokens, budget=Budget(timeout=0.03)).evaluate()
+    finally:
+        OPERATORS.unregister('slow')
+        Calculator.clear_cache()
+
+
+def test_optimizer_skips_expensive_folding():
+    """Тестирует, что компиляция не вычисляет дорогие константы."""
+    start = time.monotonic()
+    program = compile_expression('9 9 9 ** **')
+    assert time.monotonic() - start < 1
+    subexpression, = program.tokens
+    assert subexpression.tokens[:2] == (9, 9 ** 9)
+    with pytest.raises(OverflowError):
+        program.eval(budget=Budget())
@@ -0,0 +1,60 @@
+"""Тесты для вычисления из байтовых буферов."""
+import mmap
+
+import pytest
+
+from buffers import evaluate_buffer, evaluate_file_mapped
+from calculator import Calculator
+
+from .conftest import normalize, outcome
+
+LINES = [
+    '3 4 +', '', '2 ( 3 -4 + ) *', '5 -3', '-3 4 +', '1.5 .5 +', '7 2 //',
+    '5 0 /', '( 1 2 +', '1 2 ) +', 'x 1 +', '(2 3+)4*', '٣ 4 +', '1 2', '  \r',
+]
+
+
+def _expected(line):
+    """Результат обычного вычисления строки."""
+    if not line.strip():
+        return None
+    return outcome(Calculator(line).eval)
+
+
+@pytest.mark.parametrize('block_size', [1, 7, 1 << 20])
+def test_buffer_matches_calculator(block_size):
+    """Тестирует совпадение результатов и ошибок с обычным вычислением."""
+    data = '\n'.join(LINES).encode('utf-8')
+    results = evaluate_buffer(memoryview(data), return_exceptions=True, block_size=block_size)
+    assert [normalize(r) for r in results] == [_expected(line) for line in LINES]
+
+
+def test_buffer_types():
+    """Тестирует разные объекты с буферным протоколом."""
+    data = b'1 2 +\n3 4 *\n'
+    assert list(evaluate_buffer(data)) == [3, 12]
+    assert list(evaluate_buffer(bytearray(data))) == [3, 12]
+    with mmap.mmap(-1, len(data)) as mapped:
+        mapped.write(data)
+        assert list(evaluate_buffer(mapped)) == [3, 12]
+
+
+def test_buffer_raises_without_return_exceptions():
+    """Тестирует выброс ошибки по умолчанию."""
+    with pytest.raises(ZeroDivisionError):
+        list(evaluate_buffer(b'1 1 +\n1 0 /\n'))
+
+
+def test_file_mapped(tmp_path):
+    """Тестирует вычисление отображённого файла."""
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'1 1 +\n\n5 0 /\n2 2 *')
+    results = list(evaluate_file_mapped(str(path), return_exceptions=True))
+    assert results[0] == 2
+    assert results[1] is None
+    assert isinstance(results[2], ZeroDivisionError)
+    assert results[3] == 4
+
+    empty = tmp_path / 'empty.txt'
+    empty.write_bytes(b'')
+    assert list(evaluate_file_mapped(str(empty))) == []
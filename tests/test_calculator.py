@@ -1,4 +1,7 @@
 """Тесты для калькулятора."""
+import io
+import itertools
+
 import pytest
 from calculator import Calculator
 
@@ -239,3 +242,148 @@ def test_expression_with_spaces():
     """Тестирует выражения с различным количеством пробелов."""
     assert Calculator('  3   4   +  ').eval() == 7
     assert Calculator('2    3    *').eval() == 6
+
+
+def test_compile_reusable_program():
+    """Тестирует повторное вычисление скомпилированной программы."""
+    program = Calculator.compile('2 ( 3 4 + ) *')
+    assert program.eval() == 14
+    assert program.eval() == 14
+    assert program.tokens == (14,)
+    assert program.removed_operations == 2
+
+    with pytest.raises(AttributeError):
+        program.expression = '1'
+
+
+def test_compile_errors():
+    """Тестирует ошибки компиляции и вычисления программы."""
+    with pytest.raises(ValueError, match="Несбалансированные скобки"):
+        Calculator.compile('( 2 3 +')
+
+    program = Calculator.compile('5 0 /')
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        program.eval()
+
+
+def test_program_cache_counters():
+    """Тестирует счётчики LRU кэша программ."""
+    Calculator.clear_cache()
+    Calculator.configure_cache(2)
+    try:
+        assert Calculator.compile('1 2 +') is Calculator.compile('1 2 +')
+        Calculator.compile('3 4 +')
+        Calculator.compile('5 6 +')
+        info = Calculator.cache_info()
+        assert (info.hits, info.misses, info.evictions) == (1, 3, 1)
+        assert info.currsize == 2
+    finally:
+        Calculator.configure_cache(4096)
+        Calculator.clear_cache()
+
+
+def test_program_cache_disabled():
+    """Тестирует работу калькулятора с отключенным кэшем."""
+    Calculator.clear_cache()
+    Calculator.configure_cache(0)
+    try:
+        assert Calculator('3 4 +').eval() == 7
+        assert Calculator('3 4 +').eval() == 7
+        info = Calculator.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (0, 2, 0)
+    finally:
+        Calculator.configure_cache(4096)
+        Calculator.clear_cache()
+
+    with pytest.raises(ValueError, match="Некорректный размер кэша"):
+        Calculator.configure_cache(-1)
+
+
+def test_eval_many():
+    """Тестирует пакетное вычисление потока выражений."""
+    results = Calculator.eval_many(['3 4 +', '2 3 **', '7 2 /'])
+    assert list(results) == [7, 8, 3.5]
+
+    stream = io.StringIO('1 1 +\n( 2 3 + ) ~\n')
+    assert list(Calculator.eval_many(stream)) == [2, -5]
+
+
+def test_eval_many_is_lazy():
+    """Тестирует ленивую обработку бесконечного потока."""
+    expressions = (f'{n} 1 +' for n in itertools.count())
+    assert list(itertools.islice(Calculator.eval_many(expressions), 3)) == [1, 2, 3]
+
+
+def test_eval_many_errors():
+    """Тестирует обработку ошибок в пакетном вычислении."""
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        list(Calculator.eval_many(['1 1 +', '5 0 /']))
+
+    results = list(Calculator.eval_many(['1 1 +', '5 0 /', '( )', '2'],
+                                        return_exceptions=True))
+    assert results[0] == 2
+    assert isinstance(results[1], ZeroDivisionError)
+    assert isinstance(results[2], ValueError)
+    assert results[3] == 2
+
+
+def test_variables():
+    """Тестирует именованные переменные в токенизаторе и вычислителе."""
+    from evaluator import Evaluator
+    from tokenizer import Tokenizer
+
+    tokens = Tokenizer('price qty_2 * -1 +', allow_variables=True).tokenize()
+    assert tokens == ['price', 'qty_2', '*', '-1', '+']
+    tokens = Tokenizer('price ( qty 1 ~ * ) +', allow_variables=True).tokenize()
+    assert Evaluator(tokens, {'price': 10, 'qty': 3}).evaluate() == 7
+
+    with pytest.raises(ValueError, match="Неизвестная переменная: qty"):
+        Evaluator(tokens, {'price': 10}).evaluate()
+
+    with pytest.raises(ValueError, match="Неизвестный символ: x"):
+        Calculator('x 1 +').eval()
+
+
+def test_deeply_nested_brackets():
+    """Тестирует вложенность скобок глубже предела рекурсии."""
+    depth = 100000
+    assert Calculator('( ' * depth + '1 ' + ') ' * depth).eval() == 1
+    assert Calculator('( ' * depth + '1 ' + '1 + ) ' * depth).eval() == depth + 1
+
+    with pytest.raises(ValueError, match="Пустые скобки"):
+        Calculator('( ' * depth + ') ' * depth).eval()
+
+    with pytest.raises(ValueError, match="Некорректное выражение в скобках: осталось 2"):
+        Calculator('( ' * depth + '1 2 ' + ') ' * depth).eval()
+
+
+def test_evaluator_unbalanced_tokens():
+    """Тестирует вычислитель на токенах с несбалансированными скобками."""
+    from evaluator import Evaluator
+
+    assert Evaluator(['3', ')']).evaluate() == 3
+    assert Evaluator(['(', '3']).evaluate() == 3
+    with pytest.raises(ValueError, match="Остались необработанные токены"):
+        Evaluator(['3', ')', '4']).evaluate()
+    with pytest.raises(ValueError, match="Некорректное выражение: осталось 2"):
+        Evaluator(['2', '(', '3']).evaluate()
+    with pytest.raises(ValueError, match="Недостаточно аргументов для бинарного оператора"):
+        Evaluator(['2', '(', '3', '+', ')']).evaluate()
+
+
+def test_eval_stream():
+    """Тестирует потоковое вычисление большого выражения."""
+    expression = '0 ' + '( 2 3 * ) + 1.5 - ' * 1000
+    assert Calculator.eval_stream(expression, chunk_size=7) == 4500.0
+    assert Calculator.eval_stream(io.StringIO(expression)) == 4500.0
+    assert Calculator.eval_stream('2 ' + '( ' * 10000 + '3' + ' )' * 10000 + ' *') == 6
+
+
+def test_eval_stream_errors():
+    """Тестирует ошибки потокового вычисления в порядке чтения."""
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        Calculator.eval_stream('1 0 / ( 2')
+    with pytest.raises(ValueError, match="Несбалансированные скобки"):
+        Calculator.eval_stream('1 ( 2')
+    with pytest.raises(ValueError, match="Недостаточно аргументов"):
+        Calculator.eval_stream('1 + 2')
@@ -0,0 +1,120 @@
+"""Тесты для генерации Python функций из программ."""
+import pytest
+
+from budget import Budget
+from calculator import Calculator
+from codegen import generate
+from evaluator import Evaluator
+from operators import OPERATORS
+from program import Program, SubexpressionMemo, compile_expression
+
+from .conftest import outcome
+
+
+@pytest.fixture
+def tiering():
+    """Включает генерацию функций со второго вычисления."""
+    Program.configure_tiering(2)
+    yield
+    Program.configure_tiering(1000)
+
+
+EXPRESSIONS = [
+    '1 2 + 3 4 * 5 // ~ * 2 ** 7 %',
+    '10 4 / 2.5 * $',
+    '2 0.5 + 3 //',
+    '1 2.5 //',
+    '1.5 2 %',
+    '7.0 2 %',
+    '5 0 /',
+    '0 0.0 //',
+    '( 1 2 + ) 3 0 / *',
+    '10.0 1000 ** 1 0 / +',
+    '2 -3 **',
+    '0 -1 **',
+    '99999999999999999999999 3 //',
+    '1 +',
+    '1 2',
+    '1 ( 2 3 + ) *',
+]
+
+
+@pytest.mark.parametrize('expression', EXPRESSIONS)
+def test_matches_interpreter(expression):
+    """Тестирует совпадение результатов и ошибок с вычислителем."""
+    for optimize_program in (False, True):
+        tokens = compile_expression(expression, optimize_program=optimize_program).tokens
+        function = generate(tokens)
+        expected = outcome(Evaluator(tokens).evaluate)
+        if function is None:
+            # Скобки и структурные ошибки остаются вычислителю
+            assert '(' in tokens or isinstance(expected, tuple)
+            continue
+        assert outcome(function, None) == expected
+
+
+def test_skips_known_checks():
+    """Тестирует, что проверки констант выполняются при генерации."""
+    tokens = compile_expression('3 4 + 2 // 5 %', optimize_program=False).tokens
+    names = generate(tokens).__code__.co_names
+    assert 'is_integer' in names
+    tokens = compile_expression('3 4 //', optimize_program=False).tokens
+    names = generate(tokens).__code__.co_names
+    assert 'is_integer' not in names and 'ZeroDivisionError' not in names
+
+
+def test_custom_operators_and_subexpressions():
+    """Тестирует вызов пользовательских операторов и таблицы подвыражений."""
+    calls = []
+    OPERATORS.register('note', 1, lambda a: calls.append(a) or a, pure=False)
+    try:
+        tokens = compile_expression('( 3 200000 ** 7 % ) note 2 +').tokens
+        function = generate(tokens)
+        memo = SubexpressionMemo()
+        evaluator = Evaluator(tokens, memo=memo)
+        assert function(evaluator._subexpression) == pow(3, 200000, 7) + 2
+        assert function(evaluator._subexpression) == pow(3, 200000, 7) + 2
+        assert calls == [pow(3, 200000, 7)] * 2
+        assert memo.info().hits == 1
+    finally:
+        OPERATORS.unregister('note')
+
+
+def test_program_tiers_after_threshold(tiering):
+    """Тестирует переход программы на сгенерированную функцию."""
+    program = compile_expression('1 2 + 3 *', optimize_program=False)
+    assert program.eval() == 9
+    assert not program.tiered
+    assert program.eval() == 9
+    assert program.tiered
+    assert program.eval(Calculator.evaluator()) == 9
+
+    invalid = compile_expression('1 2', optimize_program=False)
+    for _ in range(3):
+        with pytest.raises(ValueError, match="Некорректное выражение"):
+            invalid.eval()
+    assert not invalid.tiered
+
+
+def test_budget_uses_interpreter(tiering):
+    """Тестирует, что вычисление с бюджетом не использует функцию."""
+    program = compile_expression('2 1000 ** 1 +', optimize_program=False)
+    program.eval()
+    program.eval()
+    assert program.tiered
+    with pytest.raises(OverflowError, match="Превышен бюджет"):
+        program.eval(budget=Budget(max_result_bits=100))
+
+
+def test_configure_tiering():
+    """Тестирует отключение генерации и проверку порога."""
+    Calculator.configure_tiering(0)
+    try:
+        program = compile_expression('1 2 +', optimize_program=False)
+        for _ in range(5):
+            assert program.eval() == 3
+        assert not program.tiered
+    finally:
+        Calculator.configure_tiering(1000)
+    with pytest.raises(ValueError, match="Некорректный порог"):
+        Calculator.configure_tiering(-1)
@@ -0,0 +1,137 @@
+"""Тесты для потокобезопасного движка вычислений."""
+import threading
+from fractions import Fraction
+
+import pytest
+
+from budget import Budget
+from calculator import Calculator
+from engine import Engine
+from metrics import METRICS
+from program import Program, ProgramCache, SubexpressionMemo
+from constants import DEFAULT_TIER_THRESHOLD
+
+from .conftest import outcome
+
+EXPRESSIONS = ['3 4 +', '2 3 /', '1 0 /', '( 1 2 + ) 3 *', '2 100 **', '1.5 2 *']
+
+
+def test_same_as_calculator():
+    """Тестирует совпадение результатов и ошибок с калькулятором."""
+    engine = Engine()
+    for expression in EXPRESSIONS:
+        assert outcome(engine.eval, expression) == outcome(Calculator(expression).eval)
+
+
+def test_backend_by_name():
+    """Тестирует движок в точном числовом режиме."""
+    assert Engine('fraction').eval('1 3 /') == Fraction(1, 3)
+    with pytest.raises(ValueError, match="Неизвестный числовой режим"):
+        Engine('complex')
+
+
+def test_eval_parallel_order():
+    """Тестирует порядок результатов пула потоков."""
+    engine = Engine()
+    expressions = [f'{i} 2 *' for i in range(1000)]
+    results = list(engine.eval_parallel(expressions, workers=4, chunk_size=7))
+    assert results == [i * 2 for i in range(1000)]
+
+
+def test_eval_parallel_errors():
+    """Тестирует выдачу и выбрасывание ошибок пула потоков."""
+    engine = Engine()
+    results = list(engine.eval_parallel(EXPRESSIONS, workers=2, chunk_size=2, return_exceptions=True))
+    assert isinstance(results[2], ZeroDivisionError)
+    assert results[:2] == [7, 2 / 3]
+
+    seen = []
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        for result in engine.eval_parallel(EXPRESSIONS, workers=2, chunk_size=2):
+            seen.append(result)
+    assert seen == [7, 2 / 3]
+
+
+@pytest.mark.parametrize('workers, chunk_size, message', [
+    (0, 1, 'Некорректное число процессов'),
+    (1, 0, 'Некорректный размер блока'),
+])
+def test_eval_parallel_arguments(workers, chunk_size, message):
+    """Тестирует проверку числа потоков и размера блока."""
+    with pytest.raises(ValueError, match=message):
+        list(Engine().eval_parallel(['1'], workers, chunk_size))
+
+
+def test_evaluator_per_thread():
+    """Тестирует, что вычислитель создаётся один раз на поток."""
+    engine = Engine(budget=Budget(max_operations=3))
+    evaluators = []
+
+    def run():
+        engine.eval('1 2 +')
+        evaluators.append(engine._evaluator())
+        assert engine._evaluator() is evaluators[-1]
+
+    threads = [threading.Thread(target=run) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(e) for e in evaluators}) == 3
+    assert len({id(e.budget) for e in evaluators}) == 3
+    assert all(e.budget is not engine.budget for e in evaluators)
+
+
+def test_shared_tables_under_threads():
+    """Тестирует общие кэш и таблицу подвыражений при вытеснениях из разных потоков."""
+    backend = Calculator.get_backend()
+    cache = backend.cache
+    backend.cache = ProgramCache(8)
+    # Без сгенерированных функций подвыражения берутся из общей таблицы
+    Program.configure_tiering(0)
+    try:
+        engine = Engine(memo=SubexpressionMemo(4))
+        expressions = [f'{i % 50} 3 3000 ** +' for i in range(2000)]
+        expected = [i % 50 + 3 ** 3000 for i in range(2000)]
+        failures = []
+
+        def run():
+            if engine.eval_many(expressions) != expected:
+                failures.append(threading.current_thread().name)
+
+        threads = [threading.Thread(target=run) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not failures
+        assert backend.cache.info().currsize == 8
+    finally:
+        Program.configure_tiering(DEFAULT_TIER_THRESHOLD)
+        backend.cache = cache
+
+
+def test_metrics_from_threads():
+    """Тестирует подсчёт метрик из нескольких потоков."""
+    METRICS.reset()
+    METRICS.enable()
+    try:
+        list(Engine().eval_parallel(['1 2 +'] * 500 + ['1 0 /'], workers=4, chunk_size=10,
+                                    return_exceptions=True))
+        snapshot = METRICS.snapshot()
+    finally:
+        METRICS.disable()
+        METRICS.reset()
+    assert snapshot['expressions'] == 501
+    assert snapshot['errors'] == {'ERROR_DIVISION_BY_ZERO': 1}
+
+
+def test_calculator_engine():
+    """Тестирует создание движка с настройками калькулятора."""
+    Calculator.configure_backend('fraction')
+    try:
+        engine = Calculator.engine()
+    finally:
+        Calculator.configure_backend('native')
+    assert engine.eval('1 3 /') == Fraction(1, 3)
+    assert engine.memo is Calculator.get_memo()
@@ -0,0 +1,97 @@
+"""Тесты для вычисления float выражений на типизированном стеке."""
+import pytest
+
+from buffers import evaluate_buffer
+from calculator import Calculator
+from evaluator import Evaluator
+from floatstack import evaluate_floats, new_stack
+from tokenizer import Tokenizer
+from validator import validate
+
+from .conftest import outcome
+
+
+@pytest.fixture
+def float_stack():
+    """Включает типизированный стек для вычислителей пакетов."""
+    Calculator.configure_float_stack(True)
+    yield
+    Calculator.configure_float_stack(False)
+
+
+def evaluate(expression, float_stack):
+    """Вычисляет выражение и возвращает тип и значение результата."""
+    result = Evaluator(Tokenizer(expression).decode(), float_stack=float_stack).evaluate()
+    return type(result), result
+
+
+@pytest.mark.parametrize('expression', [
+    '1.5 2 +',
+    '10 4 / 2.5 * ~ $',
+    '( 1.5 ( 2 3 ** ) * ) 0.25 -',
+    '3 4 +',
+    '7.0 2 //',
+    '7.5 2 %',
+    '9007199254740993 1.0 *',
+    '134217729 134217727 * 9007199254740992 - 9007199254740992 - 0.5 +',
+    '0.5 134217729 134217727 * + 18014398509481983 -',
+    '94906267 94906267 * 0.5 +',
+    '8.0 ~ 0.5 **',
+    '10.0 400 **',
+    '0.0 1 ~ **',
+    '1.5 0 /',
+    '1.5 +',
+    '1.5 2',
+    '( ) 1.0',
+])
+def test_same_as_list_stack(expression):
+    """Тестирует совпадение результатов и ошибок с обычным вычислением."""
+    assert outcome(evaluate, expression, True) == outcome(evaluate, expression, False)
+
+
+def test_falls_back():
+    """Тестирует отказ от выражений, которым нужна обычная арифметика."""
+    stack = new_stack(4)
+    assert evaluate_floats([1.5, 2, Tokenizer('+').decode()[0]], stack) == 3.5
+    for expression in ('3 4 +', '7.0 2 //', '9007199254740993 1.0 *', '8.0 ~ 0.5 **', '1.5 0 /',
+                       '134217729 134217727 * 0.5 +'):
+        assert evaluate_floats(Tokenizer(expression).decode(), stack) is None
+    assert evaluate_floats([1.5, 'x', Tokenizer('*').decode()[0]], stack) is None
+    assert evaluate_floats(Tokenizer('2.0 1000.0 **').decode(), stack) == 2.0 ** 1000
+
+
+def test_stack_reused():
+    """Тестирует, что массив стека создаётся по глубине и переиспользуется."""
+    evaluator = Evaluator((), float_stack=True)
+    deep = Tokenizer('1.0 2 3 4 5 + + + +').decode()
+    evaluator.reset(deep, validate(deep))
+    assert evaluator.evaluate() == 15.0
+    stack = evaluator._floats
+    assert len(stack) == 5
+    evaluator.reset(Tokenizer('0.5 0.25 *').decode())
+    assert evaluator.evaluate() == 0.125
+    assert evaluator._floats is stack
+
+
+def test_validate_depth():
+    """Тестирует вычисление наибольшей высоты стека."""
+    assert validate(Tokenizer('1 2 3 * +').decode()) == 3
+    assert validate(Tokenizer('1 ( 2 3 + ) *').decode()) == 3
+    assert validate([7, ')']) == 1
+
+
+def test_buffer(float_stack):
+    """Тестирует байтовый разбор строк с типизированным стеком."""
+    lines = b'1.5 2 *\n3 4 +\n\n2.5 0 /\n0.5 x +\n1 2 3.0 / -\n'
+    results = list(evaluate_buffer(lines, return_exceptions=True))
+    Calculator.configure_float_stack(False)
+    expected = list(evaluate_buffer(lines, return_exceptions=True))
+    assert [type(r) for r in results] == [type(r) for r in expected]
+    assert results[:3] + results[5:] == [3.0, 7, None, 1 - 2 / 3]
+    assert [str(r) for r in results[3:5]] == [str(r) for r in expected[3:5]]
+
+
+def test_calculator_evaluator(float_stack):
+    """Тестирует, что вычислители калькулятора получают режим."""
+    assert Calculator.evaluator().float_stack
+    assert list(Calculator.eval_many(['1.5 2 *', '2 3 **'])) == [3.0, 8]
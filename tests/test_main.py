@@ -0,0 +1,123 @@
+"""Тесты для консольного интерфейса."""
+import io
+import subprocess
+import sys
+from pathlib import Path
+
+from calculator import Calculator
+from main import format_result, main, run_batch, run_file
+from oneshot import parse_expressions, run_expressions
+
+MAIN = Path(__file__).resolve().parent.parent / 'src' / 'main.py'
+
+
+def test_format_result():
+    """Тестирует форматирование результата."""
+    assert format_result(7) == '7'
+    assert format_result(5.0) == '5'
+    assert format_result(2 / 3) == '0.666667'
+
+
+def test_run_batch():
+    """Тестирует пакетный режим без ошибок."""
+    source = io.StringIO('3 4 +\n\n7 2 /\n2 ( 3 4 + ) *\n')
+    out, err = io.StringIO(), io.StringIO()
+    assert run_batch(source, out, err) == 0
+    assert out.getvalue() == '7\n3.5\n14\n'
+    assert err.getvalue() == 'Обработано выражений: 3, ошибок: 0\n'
+
+
+def test_run_batch_errors():
+    """Тестирует вывод ошибок с номерами строк."""
+    source = io.StringIO('1 1 +\n5 0 /\n( 2 3 +\n2 2 *')
+    out, err = io.StringIO(), io.StringIO()
+    assert run_batch(source, out, err) == 1
+    assert out.getvalue() == '2\nошибка\nошибка\n4\n'
+    assert err.getvalue().splitlines() == [
+        'Строка 2: Ошибка: Деление на ноль',
+        'Строка 3: Ошибка: Несбалансированные скобки',
+        'Обработано выражений: 4, ошибок: 2',
+    ]
+
+
+def test_run_batch_huge_result():
+    """Тестирует результат, который нельзя преобразовать в строку."""
+    source = io.StringIO('1 2 +\n10 5000 **\n3 4 *\n')
+    out, err = io.StringIO(), io.StringIO()
+    assert run_batch(source, out, err) == 1
+    assert out.getvalue() == '3\nошибка\n12\n'
+    lines = err.getvalue().splitlines()
+    assert lines[0].startswith('Строка 2: Ошибка: Exceeds the limit')
+    assert lines[1] == 'Обработано выражений: 3, ошибок: 1'
+
+
+def test_run_file(tmp_path):
+    """Тестирует вычисление файла с номерами строк ошибок."""
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'1 1 +\n\n5 0 /\n2 2 *\n')
+    out, err = io.StringIO(), io.StringIO()
+    assert run_file(str(path), out, err) == 1
+    assert out.getvalue() == '2\nошибка\n4\n'
+    assert err.getvalue().splitlines() == [
+        'Строка 3: Ошибка: Деление на ноль',
+        'Обработано выражений: 3, ошибок: 1',
+    ]
+
+
+def test_parse_expressions():
+    """Тестирует разбор аргументов однократного режима."""
+    assert parse_expressions(['-e', '3 4 +']) == ['3 4 +']
+    assert parse_expressions(['-e', '3 4 +', '-3', '--eval', '-2 ~']) == ['3 4 +', '-3', '-2 ~']
+    assert parse_expressions(['-e', '1 2 /', '--backend', 'fraction']) is None
+    assert parse_expressions(['-e']) is None
+    assert parse_expressions(['input.txt']) is None
+    assert parse_expressions([]) is None
+
+
+def test_run_expressions():
+    """Тестирует вывод результатов, ошибок и код завершения."""
+    out, err = io.StringIO(), io.StringIO()
+    assert run_expressions(['3 4 +', '2 3 /'], out, err) == 0
+    assert out.getvalue() == '7\n0.666667\n'
+    assert err.getvalue() == ''
+
+    out, err = io.StringIO(), io.StringIO()
+    assert run_expressions(['1 0 /', '2 2 *', '( 1'], out, err) == 1
+    assert out.getvalue() == '4\n'
+    assert err.getvalue().splitlines() == [
+        'Выражение 1: Ошибка: Деление на ноль',
+        'Выражение 3: Ошибка: Несбалансированные скобки',
+    ]
+
+
+def test_run_expressions_huge_result():
+    """Тестирует результат, который нельзя преобразовать в строку."""
+    out, err = io.StringIO(), io.StringIO()
+    assert run_expressions(['10 5000 **', '1 1 +'], out, err) == 1
+    assert out.getvalue() == '2\n'
+    assert err.getvalue().startswith('Выражение 1: Ошибка: Exceeds the limit')
+
+
+def test_main_eval_with_flags(capsys):
+    """Тестирует флаг -e вместе с другими флагами."""
+    try:
+        assert main(['-e', '1 3 /', '2 3 /', '+', '--backend', 'fraction']) == 1
+    finally:
+        Calculator.configure_backend('native')
+    captured = capsys.readouterr()
+    assert captured.out == '1/3\n2/3\n'
+    assert captured.err.startswith('Выражение 3: Ошибка:')
+
+
+def test_one_shot_process():
+    """Тестирует однократный режим в отдельном процессе без лишних импортов."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', str(MAIN), '-e', '3 4 +', '5 0 /'],
+                            capture_output=True, text=True)
+    assert result.returncode == 1
+    assert result.stdout == '7\n'
+    assert 'Выражение 2: Ошибка: Деление на ноль' in result.stderr
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()
+                if line.startswith('import time:')}
+    assert 'oneshot' in imported
+    assert not imported & {'argparse', 'calculator', 'program', 'optimizer', 'numeric', 'metrics',
+                           'fractions', 'decimal'}
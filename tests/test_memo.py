@@ -0,0 +1,107 @@
+"""Тесты для таблицы значений подвыражений."""
+import pytest
+
+from budget import Budget
+from calculator import Calculator
+from evaluator import Evaluator, Subexpression
+from numeric import FRACTION
+from operators import OPERATORS
+from program import SubexpressionMemo, compile_expression
+
+
+@pytest.fixture
+def memo():
+    """Очищает общую таблицу подвыражений до и после теста."""
+    Calculator.clear_cache()
+    yield Calculator.get_memo()
+    Calculator.configure_memo(256)
+    Calculator.clear_cache()
+
+
+def test_subexpression_key():
+    """Тестирует равенство подвыражений по токенам и типам чисел."""
+    power = OPERATORS.get('**')
+    assert Subexpression((3, 5000, power)) == Subexpression((3, 5000, power))
+    assert hash(Subexpression((3, 5000, power))) == hash(Subexpression((3, 5000, power)))
+    assert Subexpression((3, 5000, power)) != Subexpression((3.0, 5000, power))
+    assert Subexpression((3, 5000, power)) != Subexpression((3, 5000, OPERATORS.get('*')))
+
+
+def test_optimizer_emits_subexpressions():
+    """Тестирует, что дорогие группы в скобках становятся подвыражениями."""
+    program = compile_expression('( 3 200000 ** 7 % ) 1 +')
+    (whole,) = program.tokens
+    group, one, plus = whole.tokens
+    assert whole.__class__ is group.__class__ is Subexpression
+    assert one == 1
+    assert plus is OPERATORS.get('+')
+    assert group.tokens[0] == Subexpression((3, 200000, OPERATORS.get('**')))
+    assert compile_expression('( 2 10 ** 7 % ) 1 +').tokens == (3,)
+
+
+def test_shared_across_batch(memo):
+    """Тестирует, что одинаковые подвыражения пакета вычисляются один раз."""
+    expressions = [f'( 3 200000 ** 7 % ) ( 3 200000 ** {m} % ) +' for m in range(2, 12)]
+    results = list(Calculator.eval_many(expressions))
+    assert results == [pow(3, 200000, 7) + pow(3, 200000, m) for m in range(2, 12)]
+
+    info = Calculator.memo_info()
+    # Выражения целиком различны; первая группа и степень вычисляются
+    # один раз на весь пакет, вторая группа при m = 7 совпадает с первой
+    assert info.misses == 10 + 1 + 9 + 1
+    assert info.hits == 9 + 1 + 9
+    assert info.hit_rate == pytest.approx(19 / 40)
+
+
+def test_repeated_within_expression(memo):
+    """Тестирует повтор подвыражения внутри одного выражения."""
+    expression = ' '.join(['( 7 100000 ** 10 % )'] * 5) + ' + + + +'
+    assert Calculator(expression).eval() == 5 * pow(7, 100000, 10)
+    assert Calculator.memo_info().hits >= 4
+
+
+def test_errors_not_memoized(memo):
+    """Тестирует, что ошибки вычисления не запоминаются."""
+    expression = '( 3 200000 ** 0 // ) 1 +'
+    for _ in range(2):
+        with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+            Calculator(expression).eval()
+    assert Calculator.memo_info().currsize == 1
+
+
+def test_budget_applies_on_miss(memo):
+    """Тестирует проверку бюджета при вычислении подвыражения."""
+    Calculator.configure_budget(Budget(max_result_bits=10_000))
+    try:
+        with pytest.raises(OverflowError, match="Превышен бюджет"):
+            Calculator('( 3 200000 ** 7 % ) 1 +').eval()
+    finally:
+        Calculator.configure_budget(None)
+
+
+def test_memo_eviction():
+    """Тестирует вытеснение давних значений."""
+    memo = SubexpressionMemo(2)
+    for base in (3, 5, 7, 3):
+        program = compile_expression(f'{base} 100000 **')
+        Evaluator(program.tokens, memo=memo).evaluate()
+    info = memo.info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 4, 2, 2)
+    with pytest.raises(ValueError, match="Некорректный размер кэша"):
+        SubexpressionMemo(-1)
+
+
+def test_disabled_memo(memo):
+    """Тестирует вычисление без хранения при размере 0."""
+    Calculator.configure_memo(0)
+    assert Calculator('3 100000 ** 7 %').eval() == pow(3, 100000, 7)
+    assert Calculator('3 100000 ** 7 %').eval() == pow(3, 100000, 7)
+    assert Calculator.memo_info().currsize == 0
+
+
+def test_backends_do_not_share_values(memo):
+    """Тестирует, что режимы с разными операторами не делят значения."""
+    native = Calculator('1 3 / 5000 **').eval()
+    exact = Calculator('1 3 / 5000 **', FRACTION).eval()
+    assert native == 0.0
+    assert exact.denominator == 3 ** 5000
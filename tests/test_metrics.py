@@ -0,0 +1,113 @@
+"""Тесты для метрик вычислений."""
+import pytest
+
+from calculator import Calculator
+from metrics import METRICS, Histogram, error_type, stack_depth
+from main import main
+from program import compile_expression
+
+
+@pytest.fixture
+def metrics():
+    """Включает метрики на время теста."""
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.disable()
+    METRICS.reset()
+
+
+def test_disabled_by_default():
+    """Тестирует, что без включения метрики не собираются."""
+    METRICS.reset()
+    Calculator('1 2 +').eval()
+    assert METRICS.snapshot()['expressions'] == 0
+
+
+def test_counts_and_phases(metrics):
+    """Тестирует счётчики выражений, токенов и фаз."""
+    assert Calculator('2 1 +').eval() == 3
+    with pytest.raises(ZeroDivisionError):
+        Calculator('1 0 /').eval()
+    with pytest.raises(ValueError):
+        Calculator('( 1 2 +').eval()
+    list(Calculator.eval_many(['1 2 *', '1 @'], return_exceptions=True))
+
+    snapshot = metrics.snapshot()
+    assert snapshot['expressions'] == 5
+    assert snapshot['errors'] == {
+        'ERROR_DIVISION_BY_ZERO': 1,
+        'ERROR_UNBALANCED_BRACKETS': 1,
+        'ERROR_UNKNOWN_SYMBOL': 1,
+    }
+    assert snapshot['phases']['compile']['count'] == 2
+    assert snapshot['phases']['evaluate']['count'] == 2
+    assert snapshot['phases']['error']['count'] == 3
+
+    metrics.reset()
+    assert metrics.snapshot()['expressions'] == 0
+
+
+def test_eval_error_order(metrics):
+    """Тестирует, что с метриками Calculator.eval не получает режимы пакетов."""
+    Calculator.configure_validation(True)
+    Calculator.configure_float_stack(True)
+    try:
+        with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+            Calculator('1 0 / +').eval()
+    finally:
+        Calculator.configure_validation(False)
+        Calculator.configure_float_stack(False)
+    assert metrics.snapshot()['errors'] == {'ERROR_DIVISION_BY_ZERO': 1}
+
+
+def test_error_type():
+    """Тестирует сопоставление текста ошибки с константой."""
+    assert error_type(ValueError('Некорректное число: 1.2.3')) == 'ERROR_INVALID_NUMBER'
+    assert error_type(ValueError('Некорректное выражение: осталось 2 элементов в стеке')) == \
+        'ERROR_INVALID_EXPRESSION'
+    assert error_type(OverflowError('too large')) == 'OverflowError'
+
+
+def test_stack_depth():
+    """Тестирует вычисление глубины стека по токенам."""
+    program = compile_expression('1 2 3 4 + + ~ +', optimize_program=False)
+    assert stack_depth(program.tokens) == 4
+    assert stack_depth(compile_expression('( 1 ( 2 3 + ) * )', optimize_program=False).tokens) == 3
+
+
+def test_histogram():
+    """Тестирует накопленные значения корзин."""
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 5):
+        histogram.observe(value)
+    snapshot = histogram.snapshot()
+    assert snapshot['buckets'] == {0.1: 1, 1.0: 3, float('inf'): 4}
+    assert snapshot['count'] == 4
+
+
+def test_export_text(metrics):
+    """Тестирует текстовый формат экспорта."""
+    Calculator('1 2 +').eval()
+    with pytest.raises(ZeroDivisionError):
+        Calculator('1 0 //').eval()
+    text = metrics.export_text()
+    assert 'rpn_expressions_total 2\n' in text
+    assert 'rpn_errors_total{type="ERROR_DIVISION_BY_ZERO"} 1\n' in text
+    assert 'rpn_phase_seconds_bucket{phase="compile",le="+Inf"} 1\n' in text
+    assert 'rpn_phase_seconds_count{phase="error"} 1\n' in text
+
+
+def test_metrics_file(tmp_path):
+    """Тестирует запись метрик в файл при завершении."""
+    source = tmp_path / 'input.txt'
+    source.write_text('1 2 +\n1 0 /\n', encoding='utf-8')
+    output = tmp_path / 'metrics.txt'
+    try:
+        assert main([str(source), '--metrics-file', str(output)]) == 1
+    finally:
+        METRICS.disable()
+        METRICS.reset()
+    text = output.read_text(encoding='utf-8')
+    assert 'rpn_expressions_total 2\n' in text
+    assert 'rpn_errors_total{type="ERROR_DIVISION_BY_ZERO"} 1\n' in text
@@ -0,0 +1,129 @@
+"""Тесты для числовых режимов."""
+import decimal
+import io
+from fractions import Fraction
+
+import pytest
+
+from budget import Budget
+from buffers import evaluate_buffer
+from calculator import Calculator
+from main import format_result
+from numeric import DECIMAL, FRACTION, NATIVE, NumericBackend, backend_by_name, decimal_backend
+from operators import OPERATORS
+
+
+@pytest.fixture
+def fraction_mode():
+    """Включает рациональный режим на время теста."""
+    Calculator.configure_backend(FRACTION)
+    yield FRACTION
+    Calculator.configure_backend(NATIVE)
+
+
+def test_backend_by_name():
+    """Тестирует выбор режима по имени."""
+    assert backend_by_name('native') is NATIVE
+    assert backend_by_name('fraction') is FRACTION
+    assert backend_by_name('decimal') is DECIMAL
+    with pytest.raises(ValueError, match="Неизвестный числовой режим: exact"):
+        backend_by_name('exact')
+
+
+def test_fraction_exact():
+    """Тестирует точные дроби."""
+    assert Calculator('1 3 /', 'fraction').eval() == Fraction(1, 3)
+    assert Calculator('0.1 0.2 +', 'fraction').eval() == Fraction(3, 10)
+    assert Calculator('1 3 / 3 *', 'fraction').eval() == 1
+    assert Calculator('2 3 ~ **', 'fraction').eval() == Fraction(1, 8)
+    assert Calculator('0.5 2 **', 'fraction').eval() == Fraction(1, 4)
+
+
+def test_fraction_int_fast_path():
+    """Тестирует, что целые результаты остаются int."""
+    for expression in ('6 3 /', '7 2 //', '4 2 / 3 %', '1 2 / 1 2 / +', '2 100 **'):
+        assert type(Calculator(expression, 'fraction').eval()) is int
+    assert Calculator('2 100 **', 'fraction').eval() == 2 ** 100
+
+
+def test_fraction_errors():
+    """Тестирует ошибки рационального режима."""
+    with pytest.raises(ValueError, match="Дробная степень не представима точно"):
+        Calculator('2 0.5 **', 'fraction').eval()
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        Calculator('1 0 /', 'fraction').eval()
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        Calculator('0 1 ~ **', 'fraction').eval()
+    with pytest.raises(TypeError, match="Операция // только для целых чисел"):
+        Calculator('1 3 / 1 //', 'fraction').eval()
+
+
+def test_decimal():
+    """Тестирует десятичный режим."""
+    assert Calculator('0.1 0.2 +', 'decimal').eval() == decimal.Decimal('0.3')
+    assert Calculator('6 3 /', 'decimal').eval() == 2
+    assert type(Calculator('6 3 /', 'decimal').eval()) is int
+    assert Calculator('1.5 ~', 'decimal').eval() == decimal.Decimal('-1.5')
+    # Деление целых чисел, заданных как Decimal, округляет вниз, как у int
+    assert Calculator('7.0 2 ~ //', 'decimal').eval() == -4
+    assert Calculator('7.0 2 ~ %', 'decimal').eval() == -1
+
+
+def test_decimal_context():
+    """Тестирует точность и округление из контекста."""
+    backend = decimal_backend(decimal.Context(prec=5, rounding=decimal.ROUND_HALF_UP))
+    assert Calculator('2 3 /', backend).eval() == decimal.Decimal('0.66667')
+    assert Calculator('1.00001 1 +', backend).eval() == decimal.Decimal('2.0000')
+    # Контекст потока не влияет на режим
+    with decimal.localcontext(decimal.Context(prec=2)):
+        assert Calculator('2 3 /', backend).eval() == decimal.Decimal('0.66667')
+
+
+def test_backend_caches_separate():
+    """Тестирует, что режимы не делят скомпилированные программы."""
+    Calculator.clear_cache()
+    assert Calculator('1 3 /').eval() == pytest.approx(1 / 3)
+    assert Calculator('1 3 /', 'fraction').eval() == Fraction(1, 3)
+    assert Calculator('1 3 /').eval() == pytest.approx(1 / 3)
+
+
+def test_configure_backend(fraction_mode):
+    """Тестирует режим по умолчанию для всех путей вычисления."""
+    assert Calculator.get_backend() is FRACTION
+    assert Calculator('1 3 /').eval() == Fraction(1, 3)
+    assert Calculator('1 3 /', 'native').eval() == pytest.approx(1 / 3)
+    assert list(Calculator.eval_many(['0.1 0.2 +', '1 4 /'])) == [Fraction(3, 10), Fraction(1, 4)]
+    assert Calculator.eval_stream(io.StringIO('0.1 0.2 + 3 /'), chunk_size=4) == Fraction(1, 10)
+    assert list(evaluate_buffer(b'1 3 /\n0.1 0.2 +\n')) == [Fraction(1, 3), Fraction(3, 10)]
+
+
+def test_custom_operator_in_backend():
+    """Тестирует пользовательские операторы в точном режиме."""
+    OPERATORS.register('half', 1, lambda a: a / 2)
+    try:
+        assert Calculator('1 half', 'fraction').eval() == Fraction(1, 2)
+    finally:
+        OPERATORS.unregister('half')
+
+
+def test_unknown_replacement():
+    """Тестирует замену оператора, которого нет в общем реестре."""
+    backend = NumericBackend('broken', None, lambda: {'^': pow})
+    with pytest.raises(ValueError, match="Неизвестный оператор: \\^"):
+        backend.operators()
+
+
+def test_fraction_budget():
+    """Тестирует бюджет для степеней дробей."""
+    Calculator.configure_budget(Budget(max_result_bits=1000))
+    try:
+        with pytest.raises(OverflowError, match="Превышен бюджет"):
+            Calculator('1 3 / 1000000 **', 'fraction').eval()
+    finally:
+        Calculator.configure_budget(None)
+
+
+def test_format_exact_results():
+    """Тестирует вывод точных результатов."""
+    assert format_result(Fraction(1, 3)) == '1/3'
+    assert format_result(decimal.Decimal('0.3')) == '0.3'
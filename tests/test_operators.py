@@ -0,0 +1,64 @@
+"""Тесты для реестра операторов."""
+import math
+
+import pytest
+
+from calculator import Calculator
+from operators import OPERATORS
+
+
+@pytest.fixture
+def custom_operators():
+    """Регистрирует пользовательские операторы на время теста."""
+    def check_sqrt(a):
+        if a < 0:
+            raise ValueError('Корень из отрицательного числа')
+
+    Calculator.register_operator('max', 2, max)
+    Calculator.register_operator('sqrt', 1, math.sqrt, check_sqrt)
+    Calculator.register_operator('^', 2, pow)
+    yield
+    for symbol in ('max', 'sqrt', '^'):
+        OPERATORS.unregister(symbol)
+    Calculator.clear_cache()
+
+
+def test_builtin_operators():
+    """Тестирует описание встроенных операторов."""
+    assert OPERATORS.get('+').arity == 2
+    assert OPERATORS.get('~').arity == 1
+    assert OPERATORS.get('+').builtin
+    assert OPERATORS.get('max') is None
+
+
+def test_custom_operators(custom_operators):
+    """Тестирует вычисление с пользовательскими операторами."""
+    assert Calculator('3 4 max').eval() == 4
+    assert Calculator('16 sqrt 2 ^').eval() == 16
+    assert Calculator('( 3 7 max ) 2 ~ max').eval() == 7
+    assert Calculator('3 4 max -5 +').eval() == -1
+    assert Calculator.compile('2 3 ^').eval() == 8
+
+
+def test_custom_operator_errors(custom_operators):
+    """Тестирует ошибки пользовательских операторов."""
+    with pytest.raises(ValueError, match="Корень из отрицательного числа"):
+        Calculator('4 ~ sqrt').eval()
+
+    with pytest.raises(ValueError, match="Недостаточно аргументов для бинарного оператора"):
+        Calculator('3 max').eval()
+
+    with pytest.raises(ValueError, match="Неизвестный символ: m"):
+        Calculator('3 4 maxx').eval()
+
+
+def test_register_invalid():
+    """Тестирует проверку регистрируемых операторов."""
+    with pytest.raises(ValueError, match="Оператор уже зарегистрирован"):
+        Calculator.register_operator('+', 2, max)
+
+    with pytest.raises(ValueError, match="Некорректный символ оператора"):
+        Calculator.register_operator('2x', 2, max)
+
+    with pytest.raises(ValueError, match="Некорректная арность оператора"):
+        Calculator.register_operator('avg3', 3, max)
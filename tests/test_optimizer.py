@@ -0,0 +1,107 @@
+"""Тесты для оптимизатора программ."""
+import pytest
+from calculator import Calculator
+from evaluator import Evaluator
+from program import compile_expression
+from optimizer import optimize
+from operators import OPERATORS
+
+
+def _symbols(tokens):
+    """Заменяет объекты операторов их символами."""
+    return [getattr(t, 'symbol', t) for t in tokens]
+
+
+def _decode(expression):
+    """Возвращает неоптимизированные токены программы."""
+    return compile_expression(expression, optimize_program=False).tokens
+
+
+def test_folds_constant_subexpressions():
+    """Тестирует свёртку константных подвыражений."""
+    program = compile_expression('( 60 60 * ) 24 *')
+    assert program.tokens == (86400,)
+    assert program.removed_operations == 2
+    assert program.eval() == 86400
+
+
+def test_raw_program_keeps_tokens():
+    """Тестирует компиляцию без оптимизации."""
+    program = compile_expression('2 ( 3 4 + ) *', optimize_program=False)
+    assert _symbols(program.tokens) == [2, '(', 3, 4, '+', ')', '*']
+    assert program.removed_operations == 0
+    assert program.eval() == 14
+
+
+def test_removes_redundant_unary_operators():
+    """Тестирует удаление унарного плюса и пар унарных минусов."""
+    tokens, removed = optimize(['x', OPERATORS.get('$'), OPERATORS.get('$'),
+                                OPERATORS.get('~'), OPERATORS.get('~')])
+    assert tokens == ('x',)
+    assert removed == 4
+
+    tokens, removed = optimize(['x', OPERATORS.get('~'), OPERATORS.get('~'), OPERATORS.get('~')])
+    assert _symbols(tokens) == ['x', '~']
+    assert removed == 2
+
+
+def test_partial_folding_with_variables():
+    """Тестирует свёртку констант рядом с переменными."""
+    raw = ['x', '(', 60, 60, OPERATORS.get('*'), ')', OPERATORS.get('*'),
+           '(', 'y', ')', OPERATORS.get('+')]
+    tokens, removed = optimize(raw)
+    assert _symbols(tokens) == ['x', 3600, '*', 'y', '+']
+    assert removed == 1
+    assert Evaluator(list(tokens), {'x': 2, 'y': 1}).evaluate() == 7201
+
+
+@pytest.mark.parametrize('expression, error, message', [
+    ('1 0 /', ZeroDivisionError, 'Деление на ноль'),
+    ('( 2 3 + ) 1 0 / 9 9 9 ** ** +', ZeroDivisionError, 'Деление на ноль'),
+    ('2.5 2 //', TypeError, 'только для целых'),
+    ('1 +', ValueError, 'бинарного оператора'),
+    ('( 1 2 ) +', ValueError, 'в скобках'),
+    ('1 2', ValueError, 'осталось 2 элементов'),
+])
+def test_errors_are_preserved(expression, error, message):
+    """Тестирует, что ошибки возникают при вычислении, как без оптимизации."""
+    program = compile_expression(expression)
+    with pytest.raises(error, match=message):
+        program.eval()
+    with pytest.raises(error, match=message):
+        Evaluator(list(_decode(expression))).evaluate()
+
+
+def test_structural_error_returns_program_unchanged():
+    """Тестирует, что некорректная программа не изменяется."""
+    raw = _decode('( 2 3 ) 4 5 +')
+    assert optimize(raw) == (tuple(raw), 0)
+
+
+@pytest.mark.parametrize('expression', [
+    '3 4 + 2 *', '2 ~ 3 **', '7 2 // 3 %', '5 $', '4 ~ ~', '2 3 4 ** **',
+    '( ( 1 2 + ) ( 3 4 + ) * ) 2 /', '10 3 /', '-2 3 ~ *',
+])
+def test_results_match_unoptimized(expression):
+    """Тестирует совпадение результатов с неоптимизированной программой."""
+    assert compile_expression(expression).eval() == Evaluator(list(_decode(expression))).evaluate()
+
+
+def test_impure_operator_is_not_folded():
+    """Тестирует, что оператор с побочными эффектами не сворачивается."""
+    calls = []
+
+    def tick(a):
+        calls.append(a)
+        return a + 1
+
+    Calculator.register_operator('tick', 1, tick, pure=False)
+    try:
+        program = compile_expression('1 tick')
+        assert calls == []
+        assert program.eval() == 2
+        assert program.eval() == 2
+        assert calls == [1, 1]
+    finally:
+        OPERATORS.unregister('tick')
+        Calculator.clear_cache()
@@ -0,0 +1,63 @@
+"""Тесты для параллельного вычисления."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from fractions import Fraction
+from functools import partial
+
+import pytest
+
+import parallel
+from calculator import Calculator
+from parallel import evaluate_file_parallel
+
+
+def test_parallel_matches_serial(tmp_path):
+    """Тестирует совпадение результатов и порядка с последовательным режимом."""
+    lines = [f'{n} ( {n} 2 ** ) + 3 /' for n in range(200)]
+    path = tmp_path / 'input.txt'
+    path.write_text('\n'.join(lines) + '\n', encoding='utf-8')
+
+    results = list(evaluate_file_parallel(str(path), workers=2, chunk_size=64))
+    assert results == list(Calculator.eval_many(lines))
+
+
+def test_parallel_errors_and_blank_lines(tmp_path):
+    """Тестирует ошибки и пустые строки в параллельном режиме."""
+    path = tmp_path / 'input.txt'
+    path.write_text('1 1 +\n\n5 0 /\n2 2 *', encoding='utf-8')
+
+    results = list(evaluate_file_parallel(str(path), workers=2, chunk_size=4))
+    assert results[0] == 2
+    assert results[1] is None
+    assert isinstance(results[2], ZeroDivisionError)
+    assert results[3] == 4
+
+
+def test_parallel_invalid_arguments(tmp_path):
+    """Тестирует проверку параметров пула."""
+    path = tmp_path / 'input.txt'
+    path.write_text('1 1 +\n', encoding='utf-8')
+
+    with pytest.raises(ValueError, match="Некорректное число процессов"):
+        list(evaluate_file_parallel(str(path), workers=0))
+
+    with pytest.raises(ValueError, match="Некорректный размер блока"):
+        list(evaluate_file_parallel(str(path), chunk_size=0))
+
+
+def test_parallel_worker_settings(tmp_path, monkeypatch):
+    """Тестирует передачу настроек калькулятора процессам, запущенным без fork."""
+    spawn = partial(ProcessPoolExecutor, mp_context=multiprocessing.get_context('spawn'))
+    monkeypatch.setattr(parallel, 'ProcessPoolExecutor', spawn)
+    path = tmp_path / 'input.txt'
+    path.write_text('1 3 /\n1 0 / +\n', encoding='utf-8')
+
+    Calculator.configure_backend('fraction')
+    Calculator.configure_validation(True)
+    try:
+        results = list(evaluate_file_parallel(str(path), workers=1))
+    finally:
+        Calculator.configure_backend('native')
+        Calculator.configure_validation(False)
+    assert results[0] == Fraction(1, 3)
+    assert str(results[1]) == 'Недостаточно аргументов для бинарного оператора'
@@ -0,0 +1,116 @@
+"""Тесты для сервера вычислений."""
+import asyncio
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from server import is_fast, respond, start_server
+from constants import SERVER_LINE_LIMIT
+
+
+async def _exchange(lines: list[bytes], executor=None, path: str | None = None) -> list[str]:
+    """Отправляет запросы одним пакетом и читает ответы."""
+    server = await start_server(port=0, path=path, executor=executor)
+    async with server:
+        if path is None:
+            host, port = server.sockets[0].getsockname()[:2]
+            reader, writer = await asyncio.open_connection(host, port)
+        else:
+            reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b''.join(lines))
+        writer.write_eof()
+        data = await asyncio.wait_for(reader.read(), 10)
+        writer.close()
+        await writer.wait_closed()
+    return data.decode('utf-8').splitlines()
+
+
+def test_respond():
+    """Тестирует формат ответов."""
+    assert respond('3 4 +') == 'OK 7\n'
+    assert respond('1 2 /') == 'OK 0.5\n'
+    assert respond('1 0 /') == 'ERR Деление на ноль\n'
+    assert respond('') == 'ERR Пустое выражение\n'
+
+
+def test_is_fast():
+    """Тестирует выбор выражений для исполнителя."""
+    assert is_fast('3 4 + 2 *')
+    assert is_fast('1 0 /')
+    assert is_fast('3 +')
+    assert not is_fast('9 9 9 ** **')
+    assert not is_fast('3 2000000 ** 7 %')
+    assert not is_fast('1 ' * 5000)
+
+
+def test_pipelined_requests():
+    """Тестирует конвейер запросов в одном соединении с сохранением порядка."""
+    lines = [f'{i} {i} +\n'.encode() for i in range(1000)]
+    assert asyncio.run(_exchange(lines)) == [f'OK {2 * i}' for i in range(1000)]
+
+
+def test_errors_and_empty_lines():
+    """Тестирует ответ на каждую строку, включая ошибочные."""
+    lines = [b'1 2 +\n', b'\n', b'1 0 /\n', b'\xff\n', b'2 3 *']
+    responses = asyncio.run(_exchange(lines))
+    assert len(responses) == 5
+    assert responses[0] == 'OK 3'
+    assert responses[1] == 'ERR Пустое выражение'
+    assert responses[2] == 'ERR Деление на ноль'
+    assert responses[3].startswith('ERR ')
+    assert responses[4] == 'OK 6'
+
+
+def test_slow_expression_offloaded():
+    """Тестирует, что медленное выражение вычисляется исполнителем в порядке запросов."""
+    threads = []
+
+    def record(*args):
+        threads.append(threading.current_thread())
+
+    with ThreadPoolExecutor(1, initializer=record) as executor:
+        lines = [b'1 1 +\n', b'3 2000000 ** 7 %\n', b'2 2 +\n']
+        assert asyncio.run(_exchange(lines, executor)) == [
+            'OK 2', f'OK {pow(3, 2000000, 7)}', 'OK 4']
+    assert threads and threads[0] is not threading.main_thread()
+
+
+def test_event_loop_not_blocked():
+    """Тестирует, что другие соединения обслуживаются во время медленного вычисления."""
+    gate = threading.Event()
+
+    async def scenario():
+        with ThreadPoolExecutor(1) as executor:
+            executor.submit(gate.wait)
+            server = await start_server(port=0, executor=executor)
+            async with server:
+                host, port = server.sockets[0].getsockname()[:2]
+                _, slow_writer = await asyncio.open_connection(host, port)
+                slow_writer.write(b'3 2000000 ** 7 %\n')
+                await slow_writer.drain()
+
+                reader, writer = await asyncio.open_connection(host, port)
+                writer.write(b'2 3 +\n')
+                assert await asyncio.wait_for(reader.readline(), 5) == b'OK 5\n'
+                writer.close()
+                slow_writer.close()
+                gate.set()
+
+    asyncio.run(scenario())
+
+
+def test_line_too_long():
+    """Тестирует отказ на слишком длинную строку."""
+    responses = asyncio.run(_exchange([b'1' * (SERVER_LINE_LIMIT + 10) + b'\n', b'1 1 +\n']))
+    assert responses == [f'ERR Строка длиннее {SERVER_LINE_LIMIT} байт']
+
+
+@pytest.mark.skipif(not hasattr(asyncio, 'start_unix_server'), reason='нет Unix сокетов')
+def test_unix_socket():
+    """Тестирует сервер на Unix сокете."""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'rpn.sock')
+        assert asyncio.run(_exchange([b'2 3 **\n'], path=path)) == ['OK 8']
@@ -0,0 +1,103 @@
+"""Тесты для сеанса с сохраняемым стеком."""
+from fractions import Fraction
+
+import pytest
+
+from budget import Budget
+from calculator import Calculator
+from numeric import FRACTION
+from session import Session, stack_need
+from tokenizer import Tokenizer
+
+
+def test_stack_need():
+    """Тестирует число значений, снимаемых строкой со стека."""
+    assert stack_need(Tokenizer('3 4 +').decode()) == 0
+    assert stack_need(Tokenizer('+').decode()) == 2
+    assert stack_need(Tokenizer('2 *').decode()) == 1
+    assert stack_need(Tokenizer('~').decode()) == 1
+    assert stack_need(Tokenizer('+ +').decode()) == 3
+    assert stack_need(Tokenizer('( 1 2 + ) *').decode()) == 1
+
+
+def test_incremental_evaluation():
+    """Тестирует вычисление по частям."""
+    session = Session()
+    assert session.eval('3 4') == 4
+    assert session.stack == (3, 4)
+    assert session.eval('+') == 7
+    assert session.eval('2 *') == 14
+    assert session.eval('( 1 1 + ) **') == 196
+    assert session.stack == (196,)
+
+
+def test_error_keeps_stack():
+    """Тестирует, что строка с ошибкой не меняет стек."""
+    session = Session()
+    session.eval('1 2 3')
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        session.eval('+ 0 /')
+    assert session.stack == (1, 2, 3)
+    with pytest.raises(ValueError, match="Недостаточно аргументов для бинарного оператора"):
+        session.eval('+ + +')
+    assert session.stack == (1, 2, 3)
+
+
+def test_drop_clear_undo():
+    """Тестирует снятие, очистку и отмену."""
+    session = Session()
+    session.eval('1 2 3')
+    session.eval('+')
+    assert session.drop() == 5
+    assert session.stack == (1,)
+    session.clear()
+    assert session.stack == ()
+    session.undo()
+    assert session.stack == (1,)
+    session.undo()
+    assert session.stack == (1, 5)
+    session.undo()
+    assert session.stack == (1, 2, 3)
+    session.undo()
+    assert session.stack == ()
+    with pytest.raises(ValueError, match="Нечего отменять"):
+        session.undo()
+    with pytest.raises(ValueError, match="Стек пуст"):
+        session.drop()
+
+
+def test_history_limit():
+    """Тестирует ограничение истории отмены."""
+    session = Session(history=2)
+    for i in range(5):
+        session.eval(str(i))
+    session.undo()
+    session.undo()
+    with pytest.raises(ValueError, match="Нечего отменять"):
+        session.undo()
+    assert session.stack == (0, 1, 2)
+
+
+def test_line_cost_independent_of_stack():
+    """Тестирует, что строка не трогает значения, которые ей не нужны."""
+    session = Session()
+    for i in range(1000):
+        session.eval(str(i))
+    session.eval('+')
+    start, removed = session._history[-1]
+    assert (start, removed) == (998, [998, 999])
+    assert len(session.stack) == 999
+
+
+def test_backend_and_budget():
+    """Тестирует сеанс в точном режиме и с бюджетом."""
+    session = Session(backend=FRACTION)
+    session.eval('1 3')
+    assert session.eval('/') == Fraction(1, 3)
+
+    session = Session(budget=Budget(max_operations=2))
+    session.eval('1 1 + 1 +')
+    with pytest.raises(ValueError, match="Превышен бюджет"):
+        session.eval('1 + 1 + 1 +')
+    assert session.stack == (3,)
+    assert Calculator('1 1 +').eval() == 2
@@ -0,0 +1,111 @@
+"""Тесты для токенизатора."""
+import io
+
+import pytest
+
+from tokenizer import Tokenizer, iter_tokens
+from operators import OPERATORS, Operator
+
+EXPRESSIONS = [
+    '3 4 +', '5~', '(2 3+)4*', '1.2.3', '5 -3', '5-3', '-3 4 +', '3 -4 +',
+    '2 ( -1 ) *', '2 **3', '7//2', '+.5 1 +', '5. 2 /', '--5', '1 ~-2 +',
+    '.', '+.', '1 2 @', '( 1 2 @', '1 2 ) @', '( )', '( ( 1 )', 'x 1 +',
+    'abc', '\t1\n2\r+', '1 2 + )', ') 1 (', '1(5 3+)+', '2 3***', '8 2/ /2//',
+    '(x 1+)2*', '1.5(2.)+', '3(4 2-)%~',
+]
+
+
+def _exact(tokenizer: Tokenizer):
+    """Результат посимвольного двухпроходного разбора."""
+    try:
+        return tokenizer._tokenize_exact()
+    except ValueError as e:
+        return str(e)
+
+
+def _fast(tokenizer: Tokenizer):
+    """Результат основного разбора."""
+    try:
+        return tokenizer.tokenize()
+    except ValueError as e:
+        return str(e)
+
+
+@pytest.mark.parametrize('expr', EXPRESSIONS)
+@pytest.mark.parametrize('allow_variables', [False, True])
+def test_lexer_matches_exact_parser(expr, allow_variables):
+    """Тестирует совпадение токенов и ошибок с посимвольным разбором."""
+    tokenizer = Tokenizer(expr, allow_variables)
+    assert _fast(tokenizer) == _exact(tokenizer)
+
+
+def test_lexer_tokens():
+    """Тестирует токены для выражений с пробелами и без."""
+    assert Tokenizer('2 ( 3 -4 + ) *').tokenize() == ['2', '(', '3', '-', '4', '+', ')', '*']
+    assert Tokenizer('(2 -3)4**').tokenize() == ['(', '2', '-', '3', ')', '4', '**']
+    assert Tokenizer('1 -2 ~').tokenize() == ['1', '-', '2', '~']
+    assert Tokenizer('1 ~ -2 +').tokenize() == ['1', '~', '-2', '+']
+    assert Tokenizer('1(5 3+)+').tokenize() == ['1', '(', '5', '3', '+', ')', '+']
+    assert Tokenizer('2 3***').tokenize() == ['2', '3', '**', '*']
+    assert Tokenizer('8 2* *').tokenize() == ['8', '2', '*', '*']
+
+
+def test_non_ascii_expression():
+    """Тестирует разбор выражения с не-ASCII символами."""
+    assert Tokenizer('٣ 4 +').tokenize() == ['٣', '4', '+']
+    with pytest.raises(ValueError, match="Неизвестный символ: ж"):
+        Tokenizer('1 ж').tokenize()
+
+
+def test_decode_typed_tokens():
+    """Тестирует преобразование токенов в числа и операторы."""
+    tokens = Tokenizer('2 ( -3 4.5 + ) * ~').decode()
+    assert tokens == [2, '(', -3, 4.5, OPERATORS.get('+'), ')', OPERATORS.get('*'), OPERATORS.get('~')]
+    assert type(tokens[0]) is int and type(tokens[3]) is float
+    assert Tokenizer('٣ .5 +').decode() == [3, 0.5, OPERATORS.get('+')]
+
+
+def test_decode_shares_repeated_tokens():
+    """Тестирует, что повторяющиеся токены преобразуются один раз."""
+    tokens = Tokenizer('x 100000 + 100000 +', allow_variables=True).decode()
+    assert tokens[0] == 'x'
+    assert tokens[1] is tokens[3]
+    assert isinstance(tokens[2], Operator) and tokens[2] is tokens[4]
+
+
+@pytest.mark.parametrize('expr', [e for e in EXPRESSIONS if '(' not in e and ')' not in e])
+@pytest.mark.parametrize('chunk_size', [1, 3])
+def test_stream_matches_decode(expr, chunk_size):
+    """Тестирует совпадение потокового разбора с обычным при любом размере блока."""
+    def run(f):
+        try:
+            return f()
+        except ValueError as e:
+            return str(e)
+
+    assert (run(lambda: list(iter_tokens(expr, chunk_size=chunk_size))) ==
+            run(lambda: Tokenizer(expr).decode()))
+
+
+def test_stream_sign_context_across_chunks():
+    """Тестирует контекст знака на границе блоков."""
+    assert list(iter_tokens('3 -4 + (-5)', chunk_size=2)) == Tokenizer('3 -4 + (-5)').decode()
+
+
+def test_stream_reads_file_lazily():
+    """Тестирует чтение текстового потока блоками."""
+    stream = io.StringIO('1 ' + '2 + ' * 1000)
+    tokens = iter_tokens(stream, chunk_size=16)
+    assert next(tokens) == 1
+    assert stream.tell() == 16
+
+
+def test_stream_bracket_errors():
+    """Тестирует обнаружение несбалансированных скобок при чтении."""
+    tokens = iter_tokens('1 ) ' + '2 + ' * 1000, chunk_size=4)
+    with pytest.raises(ValueError, match="Несбалансированные скобки"):
+        list(tokens)
+    with pytest.raises(ValueError, match="Несбалансированные скобки"):
+        list(iter_tokens('( 1 2 +'))
+    with pytest.raises(ValueError, match="Пустое выражение"):
+        list(iter_tokens('   '))
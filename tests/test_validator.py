@@ -0,0 +1,96 @@
+"""Тесты для статической проверки структуры программ."""
+import pytest
+
+from buffers import evaluate_buffer
+from calculator import Calculator
+from evaluator import Evaluator
+from operators import OPERATORS
+from tokenizer import Tokenizer
+from validator import validate
+
+
+@pytest.mark.parametrize('expression', [
+    '3 4 +',
+    '5 ~',
+    '( 1 2 + ) 3 *',
+    '1 ( 2 ( 3 4 + ) * ) -',
+    '( 7 )',
+    '1 0 /',
+])
+def test_valid(expression):
+    """Тестирует, что корректная структура не вызывает ошибок."""
+    validate(Tokenizer(expression).decode())
+
+
+@pytest.mark.parametrize('expression, message', [
+    ('1 +', 'Недостаточно аргументов для бинарного оператора'),
+    ('~', 'Недостаточно аргументов для унарного оператора'),
+    ('1 ( ~ )', 'Недостаточно аргументов для унарного оператора'),
+    ('1 2', 'осталось 2 элементов в стеке'),
+    ('( )', 'Пустые скобки'),
+    ('( 1 2 ) +', 'осталось 2 элементов вместо 1'),
+    ('1 ( 2 + )', 'Недостаточно аргументов для бинарного оператора'),
+])
+def test_same_error_as_evaluator(expression, message):
+    """Тестирует, что ошибка совпадает с ошибкой вычислителя."""
+    tokens = Tokenizer(expression).decode()
+    with pytest.raises(ValueError, match=message):
+        validate(tokens)
+    with pytest.raises(ValueError, match=message):
+        Evaluator(tokens).evaluate()
+
+
+def test_unpaired_closing_bracket():
+    """Тестирует закрывающую скобку без пары, переданную в токенах."""
+    validate([3, ')'])
+    with pytest.raises(ValueError, match="Остались необработанные токены"):
+        validate([3, ')', 4])
+
+
+def test_default_error_order():
+    """Тестирует, что без режима проверки ошибки выдаются в порядке вычисления."""
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        Calculator('1 0 / +').eval()
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        list(Calculator.eval_many(['1 0 / +']))
+    with pytest.raises(ValueError, match="бинарного оператора"):
+        Evaluator(Tokenizer('1 0 / +').decode(), validate=True).evaluate()
+
+
+def test_calculator_validate():
+    """Тестирует проверку выражения без вычисления."""
+    Calculator.validate('9 9 9 ** ** 1 +')
+    with pytest.raises(ValueError, match="бинарного оператора"):
+        Calculator.validate('9 9 9 ** ** +')
+    with pytest.raises(ValueError, match="Неизвестный символ"):
+        Calculator.validate('1 x +')
+
+
+@pytest.fixture
+def recorded():
+    """Регистрирует оператор rec, записывающий свои вызовы, и включает проверку структуры."""
+    calls = []
+    Calculator.register_operator('rec', 2, lambda a, b: calls.append((a, b)) or a + b, pure=False)
+    Calculator.configure_validation(True)
+    yield calls
+    Calculator.configure_validation(False)
+    OPERATORS.unregister('rec')
+    Calculator.clear_cache()
+
+
+def test_malformed_lines_skip_arithmetic(recorded):
+    """Тестирует, что строки с ошибкой структуры отклоняются без вычисления операций."""
+    lines = b'\n'.join(b'%d 1 2 rec' % i for i in range(100)) + b'\n'
+    results = list(evaluate_buffer(lines, return_exceptions=True))
+    assert all(isinstance(r, ValueError) and 'осталось 2 элементов' in str(r) for r in results)
+    assert recorded == []
+    assert list(evaluate_buffer(b'1 2 rec\n')) == [3]
+    assert recorded == [(1, 2)]
+
+
+def test_validation_is_opt_in(recorded):
+    """Тестирует, что без режима проверки операции выполняются до ошибки структуры."""
+    Calculator.configure_validation(False)
+    with pytest.raises(ValueError, match="осталось 2 элементов"):
+        list(evaluate_buffer(b'5 1 2 rec\n'))
+    assert recorded == [(1, 2)]
@@ -0,0 +1,71 @@
+"""Тесты для векторного вычисления."""
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from vectorized import evaluate_columns
+
+
+def test_columns_arithmetic():
+    """Тестирует вычисление выражения над столбцами."""
+    x = np.array([1, 2, 3])
+    y = np.array([0.5, 1.5, 2.5])
+    result = evaluate_columns('x y * ( x 1 + ) +', {'x': x, 'y': y})
+    assert result.tolist() == [2.5, 6.0, 11.5]
+
+
+def test_columns_literal_only():
+    """Тестирует выражение без переменных над столбцами."""
+    result = evaluate_columns('2 3 +', {'x': [1, 2]})
+    assert result.tolist() == [5, 5]
+
+
+def test_columns_matches_scalar():
+    """Тестирует совпадение с построчным вычислением."""
+    from evaluator import Evaluator
+    from tokenizer import Tokenizer
+
+    x = np.arange(1, 50)
+    y = np.arange(50, 99) * 1.0
+    expr = 'x y + x // ( y 3 % ) ~ -'
+    result = evaluate_columns(expr, {'x': x, 'y': y})
+    tokens = Tokenizer(expr, allow_variables=True).tokenize()
+    expected = [Evaluator(tokens, {'x': a, 'y': b}).evaluate()
+                for a, b in zip(x.tolist(), y.tolist())]
+    assert result.tolist() == expected
+
+
+def test_columns_power():
+    """Тестирует возведение в отрицательную степень."""
+    assert evaluate_columns('x 1 ~ **', {'x': [2, 4]}).tolist() == [0.5, 0.25]
+    with pytest.raises(ZeroDivisionError, match="строках: 1"):
+        evaluate_columns('x 1 ~ **', {'x': [2, 0]})
+
+
+def test_columns_division_by_zero_rows():
+    """Тестирует отчёт о строках с делением на ноль."""
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль в строках: 1, 3"):
+        evaluate_columns('1 x /', {'x': [1, 0, 3, 0]})
+
+    with pytest.raises(ZeroDivisionError, match="Деление на ноль"):
+        evaluate_columns('x 0 %', {'x': [1, 2]})
+
+
+def test_columns_integer_only():
+    """Тестирует проверку целых чисел для // и %."""
+    assert evaluate_columns('x 2 %', {'x': [4.0, 5.0]}).tolist() == [0.0, 1.0]
+
+    with pytest.raises(TypeError, match="Операция // только для целых чисел"):
+        evaluate_columns('x 2 //', {'x': [4.0, 1.5]})
+
+    with pytest.raises(TypeError, match="Операция % только для целых чисел"):
+        evaluate_columns('x y %', {'x': [4, 5], 'y': [2.5, 2.0]})
+
+
+def test_columns_errors():
+    """Тестирует ошибки переменных."""
+    with pytest.raises(ValueError, match="Неизвестная переменная: z"):
+        evaluate_columns('x z +', {'x': [1]})
+
+    with pytest.raises(ValueError, match="Некорректные значения переменной: x"):
+        evaluate_columns('x 1 +', {'x': ['a']})
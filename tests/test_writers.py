@@ -0,0 +1,111 @@
+"""Тесты для записи результатов в форматах text, jsonl и csv."""
+import csv
+import io
+import json
+from fractions import Fraction
+
+from main import run_batch, run_file, run_parallel
+from writers import WRITERS, CsvWriter, JsonLinesWriter, TextWriter
+
+RECORDS = [
+    (1, '3 4 +', 7),
+    (2, '2 3 /', 2 / 3),
+    (4, '1 0 /', ZeroDivisionError('Деление на ноль')),
+    (5, '"x"', ValueError('Неизвестный символ: "')),
+    (6, '1e308 10 *', float('inf')),
+    (7, '1 3 /', Fraction(1, 3)),
+]
+
+
+def write(writer, records=RECORDS):
+    """Записывает записи и возвращает код, вывод и поток ошибок."""
+    out, err = io.StringIO(), io.StringIO()
+    code = writer(out, err).write(records)
+    return code, out.getvalue(), err.getvalue()
+
+
+def test_text_writer():
+    """Тестирует текстовый вывод."""
+    code, out, err = write(TextWriter)
+    assert code == 1
+    assert out == '7\n0.666667\nошибка\nошибка\ninf\n1/3\n'
+    assert err.splitlines() == [
+        'Строка 4: Ошибка: Деление на ноль',
+        'Строка 5: Ошибка: Неизвестный символ: "',
+        'Обработано выражений: 6, ошибок: 2',
+    ]
+
+
+def test_json_lines_writer():
+    """Тестирует JSON Lines: точные числа, строки и ошибки."""
+    code, out, err = write(JsonLinesWriter)
+    assert code == 1
+    records = [json.loads(line) for line in out.splitlines()]
+    assert records[0] == {'line': 1, 'input': '3 4 +', 'result': 7, 'error': None}
+    assert records[1]['result'] == 2 / 3
+    assert records[2] == {'line': 4, 'input': '1 0 /', 'result': None, 'error': 'Деление на ноль'}
+    assert records[3]['input'] == '"x"'
+    assert records[4]['result'] == 'inf'
+    assert records[5]['result'] == '1/3'
+    assert err == 'Обработано выражений: 6, ошибок: 2\n'
+
+
+def test_csv_writer():
+    """Тестирует CSV с заголовком и экранированием."""
+    code, out, _ = write(CsvWriter)
+    assert code == 1
+    rows = list(csv.reader(io.StringIO(out)))
+    assert rows[0] == ['line', 'input', 'result', 'error']
+    assert rows[1] == ['1', '3 4 +', '7', '']
+    assert float(rows[2][2]) == 2 / 3
+    assert rows[3] == ['4', '1 0 /', '', 'Деление на ноль']
+    assert rows[4] == ['5', '"x"', '', 'Неизвестный символ: "']
+    assert rows[6][2] == '1/3'
+
+
+def test_huge_results():
+    """Тестирует результат, который нельзя преобразовать в строку."""
+    records = [(1, '10 5000 **', 10 ** 5000), (2, '1 3 /', Fraction(10 ** 5000, 3)), (3, '1', 1)]
+    code, out, err = write(JsonLinesWriter, records)
+    assert code == 1
+    rows = [json.loads(line) for line in out.splitlines()]
+    assert [row['result'] for row in rows] == [None, None, 1]
+    assert all(row['error'].startswith('Exceeds the limit') for row in rows[:2])
+    assert err == 'Обработано выражений: 3, ошибок: 2\n'
+
+    code, out, err = write(CsvWriter, records)
+    assert code == 1
+    rows = list(csv.DictReader(io.StringIO(out)))
+    assert [row['result'] for row in rows] == ['', '', '1']
+    assert rows[0]['error'].startswith('Exceeds the limit')
+
+
+def test_batches():
+    """Тестирует запись нескольких пакетов."""
+    records = [(i, f'{i} 1 +', i + 1) for i in range(1, 20001)]
+    for writer in WRITERS.values():
+        code, out, err = write(writer, records)
+        assert code == 0
+        assert err == 'Обработано выражений: 20000, ошибок: 0\n'
+    assert out.count('\n') == 20001
+
+
+def test_run_batch_formats():
+    """Тестирует пакетный режим с форматом jsonl."""
+    out, err = io.StringIO(), io.StringIO()
+    assert run_batch(io.StringIO('3 4 +\n\n5 0 /\n'), out, err, 'jsonl') == 1
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [
+        {'line': 1, 'input': '3 4 +', 'result': 7, 'error': None},
+        {'line': 3, 'input': '5 0 /', 'result': None, 'error': 'Деление на ноль'},
+    ]
+
+
+def test_file_formats(tmp_path):
+    """Тестирует сопоставление строк файла и результатов."""
+    path = tmp_path / 'input.txt'
+    path.write_bytes(b'1 1 +\n\n5 0 /\n2 2 *\n')
+    expected = [['1', '1 1 +', '2', ''], ['3', '5 0 /', '', 'Деление на ноль'], ['4', '2 2 *', '4', '']]
+    for run in (run_file, lambda *args: run_parallel(*args[:3], 2, 4, *args[3:])):
+        out, err = io.StringIO(), io.StringIO()
+        assert run(str(path), out, err, 'csv') == 1
+        assert list(csv.reader(io.StringIO(out.getvalue())))[1:] == expected